@@ -23,10 +23,34 @@ if development_environment != "strict":
 
 # Remove FastAPI if not selected.
 if not with_fastapi_api:
+    os.remove(f"src/{project_name}/admission.py")
     os.remove(f"src/{project_name}/api.py")
+    os.remove(f"src/{project_name}/compression.py")
+    os.remove(f"src/{project_name}/gunicorn_conf.py")
+    os.remove(f"src/{project_name}/health.py")
+    os.remove(f"src/{project_name}/logs.py")
+    os.remove(f"src/{project_name}/metrics.py")
     os.remove(f"src/{project_name}/models.py")
+    os.remove(f"src/{project_name}/persistence.py")
+    os.remove(f"src/{project_name}/probe.py")
+    os.remove(f"src/{project_name}/search.py")
     os.remove(f"src/{project_name}/services.py")
+    os.remove(f"src/{project_name}/shared_cache.py")
+    os.remove(f"src/{project_name}/storage.py")
+    os.remove("tests/test_admission.py")
     os.remove("tests/test_api.py")
+    os.remove("tests/test_compression.py")
+    os.remove("tests/test_gunicorn_conf.py")
+    os.remove("tests/test_health.py")
+    os.remove("tests/test_logs.py")
+    os.remove("tests/test_metrics.py")
+    os.remove("tests/test_persistence.py")
+    os.remove("tests/test_probe.py")
+    os.remove("tests/test_search.py")
+    os.remove("tests/test_services.py")
+    os.remove("tests/test_shared_cache.py")
+    os.remove("tests/test_storage.py")
+    shutil.rmtree("tests/benchmarks")
     if with_pytest_bdd:
         os.remove("tests/features/api.feature")
 
@@ -34,6 +58,7 @@ if not with_fastapi_api:
 if not with_typer_cli:
     os.remove(f"src/{project_name}/cli.py")
     os.remove("tests/test_cli.py")
+    os.remove("tests/test_cli_startup.py")
     if with_pytest_bdd:
         os.remove("tests/features/cli.feature")
 
@@ -179,14 +179,82 @@ class TestFastapiToggle:
         assert (project / "src" / "test_project" / "api.py").is_file()
         assert (project / "src" / "test_project" / "models.py").is_file()
         assert (project / "src" / "test_project" / "services.py").is_file()
+        assert (project / "src" / "test_project" / "storage.py").is_file()
+        assert (project / "src" / "test_project" / "metrics.py").is_file()
+        assert (project / "src" / "test_project" / "compression.py").is_file()
+        assert (project / "src" / "test_project" / "logs.py").is_file()
+        assert (project / "src" / "test_project" / "health.py").is_file()
+        assert (project / "src" / "test_project" / "probe.py").is_file()
+        assert (project / "src" / "test_project" / "gunicorn_conf.py").is_file()
+        assert (project / "src" / "test_project" / "admission.py").is_file()
+        assert (project / "src" / "test_project" / "persistence.py").is_file()
+        assert (project / "src" / "test_project" / "search.py").is_file()
+        assert (project / "src" / "test_project" / "shared_cache.py").is_file()
         assert (project / "tests" / "test_api.py").is_file()
+        assert (project / "tests" / "test_services.py").is_file()
+        assert (project / "tests" / "test_storage.py").is_file()
+        assert (project / "tests" / "test_metrics.py").is_file()
+        assert (project / "tests" / "test_compression.py").is_file()
+        assert (project / "tests" / "test_logs.py").is_file()
+        assert (project / "tests" / "test_health.py").is_file()
+        assert (project / "tests" / "test_probe.py").is_file()
+        assert (project / "tests" / "test_gunicorn_conf.py").is_file()
+        assert (project / "tests" / "test_admission.py").is_file()
+        assert (project / "tests" / "test_persistence.py").is_file()
+        assert (project / "tests" / "test_search.py").is_file()
+        assert (project / "tests" / "test_shared_cache.py").is_file()
 
     def test_fastapi_off(self, output_dir: Path) -> None:
         """FastAPI files are absent when disabled."""
         project = bake(output_dir, with_fastapi_api="0")
         assert not (project / "src" / "test_project" / "api.py").exists()
         assert not (project / "src" / "test_project" / "models.py").exists()
+        assert not (project / "src" / "test_project" / "storage.py").exists()
+        assert not (project / "src" / "test_project" / "metrics.py").exists()
+        assert not (project / "src" / "test_project" / "compression.py").exists()
+        assert not (project / "src" / "test_project" / "logs.py").exists()
+        assert not (project / "src" / "test_project" / "health.py").exists()
+        assert not (project / "src" / "test_project" / "probe.py").exists()
+        assert not (project / "src" / "test_project" / "gunicorn_conf.py").exists()
+        assert not (project / "src" / "test_project" / "admission.py").exists()
+        assert not (project / "src" / "test_project" / "persistence.py").exists()
+        assert not (project / "src" / "test_project" / "search.py").exists()
+        assert not (project / "src" / "test_project" / "shared_cache.py").exists()
         assert not (project / "tests" / "test_api.py").exists()
+        assert not (project / "tests" / "test_services.py").exists()
+        assert not (project / "tests" / "test_storage.py").exists()
+        assert not (project / "tests" / "test_metrics.py").exists()
+        assert not (project / "tests" / "test_compression.py").exists()
+        assert not (project / "tests" / "test_logs.py").exists()
+        assert not (project / "tests" / "test_health.py").exists()
+        assert not (project / "tests" / "test_probe.py").exists()
+        assert not (project / "tests" / "test_gunicorn_conf.py").exists()
+        assert not (project / "tests" / "test_admission.py").exists()
+        assert not (project / "tests" / "test_persistence.py").exists()
+        assert not (project / "tests" / "test_search.py").exists()
+        assert not (project / "tests" / "test_shared_cache.py").exists()
+        assert not (project / "tests" / "benchmarks").exists()
+
+    def test_fastapi_benchmarks(self, output_dir: Path) -> None:
+        """API benchmarks are generated and deselected from the default test run."""
+        project = bake(output_dir, with_fastapi_api="1")
+        assert (project / "tests" / "benchmarks" / "test_middleware.py").is_file()
+        content = (project / "pyproject.toml").read_text()
+        assert "-m 'not benchmark'" in content
+        assert "benchmark: performance benchmarks" in content
+
+    def test_fastapi_bench_task(self, output_dir: Path) -> None:
+        """A `poe bench` task runs the benchmarks and the API load test."""
+        project = bake(output_dir, with_fastapi_api="1")
+        assert (project / "tests" / "benchmarks" / "loadtest.py").is_file()
+        content = (project / "pyproject.toml").read_text()
+        assert "[tool.poe.tasks.bench]" in content
+        assert "python -m tests.benchmarks.loadtest" in content
+
+    def test_fastapi_off_no_bench_task(self, output_dir: Path) -> None:
+        """No `poe bench` task when FastAPI is disabled."""
+        project = bake(output_dir, with_fastapi_api="0")
+        assert "[tool.poe.tasks.bench]" not in (project / "pyproject.toml").read_text()
 
     def test_fastapi_deps(self, output_dir: Path) -> None:
         """FastAPI dependency is in pyproject.toml when enabled."""
@@ -205,12 +273,14 @@ class TestTyperToggle:
         project = bake(output_dir, with_typer_cli="1")
         assert (project / "src" / "test_project" / "cli.py").is_file()
         assert (project / "tests" / "test_cli.py").is_file()
+        assert (project / "tests" / "test_cli_startup.py").is_file()
 
     def test_typer_off(self, output_dir: Path) -> None:
         """Typer CLI files are absent when disabled."""
         project = bake(output_dir, with_typer_cli="0")
         assert not (project / "src" / "test_project" / "cli.py").exists()
         assert not (project / "tests" / "test_cli.py").exists()
+        assert not (project / "tests" / "test_cli_startup.py").exists()
 
 
 # ---------------------------------------------------------------------------
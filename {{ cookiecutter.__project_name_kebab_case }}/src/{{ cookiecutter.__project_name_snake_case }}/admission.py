@@ -0,0 +1,202 @@
+"""{{ cookiecutter.project_name }} admission control.
+
+Under overload, a server that accepts every request makes all of them slow: they pile up in the
+workers until the gunicorn timeout kills them. Admission control keeps the work in progress
+bounded instead, and rejects the excess right away so that the clients can back off or retry on
+another instance.
+
+Each route group has a `ConcurrencyLimiter`, which runs a bounded number of requests at a time
+and queues a bounded number of others for a short time, and a `TokenBucket`, which caps the rate
+at which requests are accepted. Requests over the rate are rejected with 429, and requests that
+find the queue full or wait too long in it with 503, both with a `Retry-After` header.
+
+The limits apply to each worker process: with several workers, the server as a whole runs and
+accepts that many times more requests.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from {{ cookiecutter.__project_name_snake_case }}.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+)
+
+
+class TokenBucket:
+    """A rate limiter that lets through `rate` requests per second, in bursts of up to `burst`.
+
+    A rate of 0 or less disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Start with a full bucket of `burst` tokens, refilled at `rate` tokens per second."""
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, or else the seconds until the next one is available.
+        """
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class ConcurrencyLimiter:
+    """Run up to `limit` requests at a time, and queue up to `queue_size` others in FIFO order.
+
+    A limit of 0 or less disables the limit. The limiter belongs to one event loop, and reports
+    its requests in flight and its queue depth to the admission metrics under its `name`.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float) -> None:
+        """Initialize the limiter, where queued requests wait up to `queue_timeout` seconds."""
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._report()
+
+    @property
+    def waiting(self) -> int:
+        """The number of requests in the queue."""
+        return len(self._waiters)
+
+    def _has_room(self) -> bool:
+        return self.limit <= 0 or self.active < self.limit
+
+    def full(self) -> bool:
+        """Return whether a request would be rejected right away, with no slot or queue room."""
+        queued = len(self._waiters)
+        return (queued > 0 or not self._has_room()) and queued >= self.queue_size
+
+    def _report(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.active, group=self.name)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), group=self.name)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue for one if needed.
+
+        Returns:
+            Whether a slot was taken; False when the queue is full or the wait timed out.
+        """
+        if self._has_room() and not self._waiters:
+            self.active += 1
+            self._report()
+            return True
+        if self.full():
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except TimeoutError:
+            # The slot may have been handed over just as the wait timed out.
+            return waiter.done() and not waiter.cancelled()
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._report()
+        return True
+
+    def release(self) -> None:
+        """Give a slot back, handing it over to the next request in the queue if any."""
+        self.active -= 1
+        self.wake()
+
+    def wake(self) -> None:
+        """Hand the free slots over to the requests in the queue, such as after the limit rose."""
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+        self._report()
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """The limits of a route group, where 0 disables the concurrency or the rate limit."""
+
+    concurrency: int
+    queue_size: int
+    queue_timeout: float
+    rate: float
+    burst: int
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """Why a request was not admitted, and the response that tells the client."""
+
+    status: int
+    reason: str
+    retry_after: int
+
+
+class AdmissionGroup:
+    """The concurrency and rate limits shared by the requests of a route group."""
+
+    def __init__(self, name: str, limits: AdmissionLimits) -> None:
+        """Initialize the limiters of the group from its limits."""
+        self.name = name
+        self.limits = limits
+        self.limiter = ConcurrencyLimiter(
+            name, limits.concurrency, limits.queue_size, limits.queue_timeout
+        )
+        self.bucket = TokenBucket(limits.rate, limits.burst)
+
+    def configure(self, limits: AdmissionLimits) -> None:
+        """Apply new limits, keeping the requests in flight and in the queue."""
+        self.limits = limits
+        self.limiter.limit = limits.concurrency
+        self.limiter.queue_size = limits.queue_size
+        self.limiter.queue_timeout = limits.queue_timeout
+        self.limiter.wake()
+        self.bucket.rate = limits.rate
+        self.bucket.burst = max(limits.burst, 1)
+
+    async def admit(self) -> Rejection | None:
+        """Admit a request, or tell why it is rejected; an admitted request must be released.
+
+        Returns:
+            None if the request is admitted, or else the rejection to send back.
+        """
+        if wait := self.bucket.take():
+            rejection = Rejection(429, "rate_limited", math.ceil(wait))
+        elif self.limiter.full():
+            rejection = Rejection(503, "queue_full", 1)
+        elif not await self.limiter.acquire():
+            # The queue drains too slowly: retrying sooner than a queue wait would not help.
+            rejection = Rejection(503, "timeout", max(1, math.ceil(self.limiter.queue_timeout)))
+        else:
+            return None
+        ADMISSION_REJECTED.inc(group=self.name, reason=rejection.reason)
+        return rejection
+
+    def release(self) -> None:
+        """Release the slot of an admitted request."""
+        self.limiter.release()
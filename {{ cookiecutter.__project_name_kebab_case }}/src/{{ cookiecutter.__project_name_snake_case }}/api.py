@@ -1,27 +1,70 @@
 """{{ cookiecutter.project_name }} REST API."""
 
+import asyncio
+import cProfile
+import os
+import random
+import secrets
+import signal
 import sys
+import threading
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Annotated
-
-from fastapi import Depends, FastAPI, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from http import HTTPStatus
+from pathlib import Path
+from typing import Annotated, Any
+from uuid import uuid4
+
+import anyio.to_thread
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from loguru import logger
+from pydantic import ValidationError
+from pydantic_core import from_json
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-
-from {{ cookiecutter.__project_name_snake_case }}.models import HealthResponse, Item, ItemCreate
-from {{ cookiecutter.__project_name_snake_case }}.services import ItemService
-from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from {{ cookiecutter.__project_name_snake_case }}.admission import AdmissionGroup, AdmissionLimits
+from {{ cookiecutter.__project_name_snake_case }}.compression import ENCODERS, Encoder, negotiate
+from {{ cookiecutter.__project_name_snake_case }}.health import HealthChecks
+from {{ cookiecutter.__project_name_snake_case }}.logs import BatchingSink, configure_logging
+from {{ cookiecutter.__project_name_snake_case }}.metrics import (
+    CONTENT_TYPE,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    registry,
+)
+from {{ cookiecutter.__project_name_snake_case }}.models import (
+    BatchRowError,
+    HealthResponse,
+    Item,
+    ItemBatchResult,
+    ItemCreate,
+    ItemCreateBatch,
+    ReadinessResponse,
+    SettingsReloadResponse,
+)
+from {{ cookiecutter.__project_name_snake_case }}.services import (
+    AsyncItemService,
+    IdempotencyCache,
+    IdempotencyKeyConflictError,
+    ItemService,
+)
+from {{ cookiecutter.__project_name_snake_case }}.settings import SettingsChanges, settings
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache
+from {{ cookiecutter.__project_name_snake_case }}.storage import create_item_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:  # noqa: ARG001
     """Handle FastAPI startup and shutdown events."""
-    logger.remove()
-    logger.add(sys.stderr, level=settings.log_level)
+    log_sink = BatchingSink(sys.stderr)
+    log_handler_id = configure_logging(settings, log_sink)
+    health_checks.register("log_writer", log_sink.check_alive)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.api_threads
 {%- if cookiecutter.with_sentry|int %}
 
     if settings.sentry_dsn:
@@ -35,7 +78,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:  # noqa: ARG001
         logger.info("Sentry initialized for environment '{}'", settings.sentry_environment)
 {%- endif %}
 
-    yield
+    # Signal handlers can only be installed from the main thread, which runs the event loop when
+    # the app is served, but not when it is driven by a test client.
+    loop = asyncio.get_running_loop()
+    main_thread = threading.current_thread() is threading.main_thread()
+    reload_on_sighup = hasattr(signal, "SIGHUP") and main_thread
+    if reload_on_sighup:
+        loop.add_signal_handler(signal.SIGHUP, _reload_settings_on_signal)
+    try:
+        yield
+    finally:
+        if reload_on_sighup:
+            loop.remove_signal_handler(signal.SIGHUP)
+        health_checks.unregister("log_writer")
+        _item_service.close()
+        # Removing the handler writes the pending log records and stops the writer thread.
+        logger.remove(log_handler_id)
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
@@ -44,38 +102,511 @@ app = FastAPI(title=settings.app_name, lifespan=lifespan)
 # --- Dependency injection --------------------------------------------------------
 
 
-def get_item_service() -> ItemService:
-    """Provide the shared ItemService instance."""
+def get_item_service() -> AsyncItemService:
+    """Provide the shared AsyncItemService instance."""
     return _item_service
 
 
-_item_service = ItemService()
+# The serialized items are only cached when `api_fast_json` is set at startup.
+_item_service = AsyncItemService(
+    ItemService(
+        create_item_store(settings),
+        json_cache_size=settings.items_json_cache_size if settings.api_fast_json else 0,
+        idempotency=IdempotencyCache(settings.idempotency_cache_size, settings.idempotency_ttl),
+        shared_cache=SharedItemCache(
+            settings.items_shared_cache_path,
+            settings.items_shared_cache_slots,
+            settings.items_shared_cache_slot_size,
+        )
+        if settings.api_fast_json and settings.items_shared_cache_path
+        else None,
+    ),
+    max_threads=settings.storage_threads,
+    batch_window=settings.items_write_batch_window,
+    batch_size=settings.items_write_batch_size,
+)
+
+
+def _update_write_batching(changes: SettingsChanges) -> None:
+    """Apply the new window and size of the batches of creates to the next batches."""
+    if {"items_write_batch_window", "items_write_batch_size"} & changes.keys():
+        _item_service.batcher.window = settings.items_write_batch_window
+        _item_service.batcher.max_size = settings.items_write_batch_size
+
+
+settings.subscribe(_update_write_batching)
+
+ItemServiceDep = Annotated[AsyncItemService, Depends(get_item_service)]
+
+# Readiness checks: a query against the storage backend here, and the log writer thread once
+# it is started.
+health_checks = HealthChecks(ttl=settings.health_check_ttl, timeout=settings.health_check_timeout)
+health_checks.register("storage", _item_service.service.version)
+
+
+def _update_health_checks(changes: SettingsChanges) -> None:
+    """Apply the new TTL and timeout of the readiness checks."""
+    if {"health_check_ttl", "health_check_timeout"} & changes.keys():
+        health_checks.ttl = settings.health_check_ttl
+        health_checks.timeout = settings.health_check_timeout
+
+
+settings.subscribe(_update_health_checks)
+
+
+def _admission_limits(group: str) -> AdmissionLimits:
+    """Return the admission limits of a route group from the settings."""
+    return AdmissionLimits(
+        concurrency=getattr(settings, f"admission_{group}_concurrency"),
+        queue_size=getattr(settings, f"admission_{group}_queue"),
+        queue_timeout=settings.admission_queue_timeout,
+        rate=getattr(settings, f"admission_{group}_rate"),
+        burst=getattr(settings, f"admission_{group}_burst"),
+    )
+
+
+# Admission control: reads and writes of items have their own limits, so that a burst of writes
+# cannot hold up the reads, and the other way around.
+admission_groups = {
+    group: AdmissionGroup(group, _admission_limits(group)) for group in ("read", "write")
+}
+
+
+def _update_admission_limits(changes: SettingsChanges) -> None:
+    """Apply the new admission limits, keeping the requests in flight and in the queues."""
+    if any(name.startswith("admission_") for name in changes):
+        for group in admission_groups.values():
+            group.configure(_admission_limits(group.name))
+
+
+settings.subscribe(_update_admission_limits)
+{%- if cookiecutter.with_sentry|int %}
+
+
+def _update_sentry_sample_rate(changes: SettingsChanges) -> None:
+    """Apply the new traces sample rate to the Sentry client."""
+    if "sentry_traces_sample_rate" in changes and settings.sentry_dsn:
+        import sentry_sdk
+
+        rate = settings.sentry_traces_sample_rate
+        sentry_sdk.get_client().options["traces_sample_rate"] = rate
+
+
+settings.subscribe(_update_sentry_sample_rate)
+{%- endif %}
+
+
+# --- Settings reload -------------------------------------------------------------
+
+# Settings read once at startup, to build the app, the server or long-lived objects. A reload
+# updates them, but they only take effect when the workers are restarted.
+STARTUP_SETTINGS = frozenset({
+    "app_name",
+    "api_host",
+    "api_port",
+    "api_workers",
+    "api_worker_memory_mb",
+    "api_threads",
+    "api_timeout",
+    "api_graceful_timeout",
+    "api_keep_alive",
+    "api_max_requests",
+    "api_max_requests_jitter",
+    "api_backlog",
+    "log_json",
+    "api_fast_json",
+    "compression_enabled",
+    "compression_min_size",
+    "compression_level",
+    "items_max_page_size",
+    "items_json_cache_size",
+    "items_shared_cache_path",
+    "items_shared_cache_slots",
+    "items_shared_cache_slot_size",
+    "idempotency_cache_size",
+    "idempotency_ttl",
+    "storage_backend",
+    "sqlite_path",
+    "sqlite_pool_size",
+    "storage_threads",
+    "persistence_dir",
+    "persistence_fsync",
+    "persistence_snapshot_every",
+    "metrics_enabled",
+    "metrics_multiprocess_dir",
+    "profiling_enabled",
+    "profiling_dir",
+{%- if cookiecutter.with_sentry|int %}
+    "sentry_dsn",
+    "sentry_environment",
+{%- endif %}
+})
+
+
+def reload_settings() -> SettingsChanges:
+    """Reload the settings of this worker, and log the changed fields.
 
-ItemServiceDep = Annotated[ItemService, Depends(get_item_service)]
+    Returns:
+        The changed fields, with their old and new values.
+    """
+    changes = settings.reload()
+    logger.info("Settings reloaded, changed: {}", ", ".join(sorted(changes)) or "none")
+    if restart := sorted(STARTUP_SETTINGS & changes.keys()):
+        logger.warning("Settings changed that only apply after a restart: {}", ", ".join(restart))
+    if "log_level" in changes:
+        try:
+            logger.level(settings.log_level)
+        except ValueError:
+            logger.error("Unknown log level {!r}, the previous one is kept", settings.log_level)
+    return changes
+
+
+def _reload_settings_on_signal() -> None:
+    """Reload the settings on SIGHUP, logging invalid settings instead of raising."""
+    try:
+        reload_settings()
+    except Exception:  # noqa: BLE001
+        logger.exception("Settings reload failed; the current settings are kept")
 
 
 # --- Middleware ------------------------------------------------------------------
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log method, path, status code, and duration for every request."""
+class RequestLoggingMiddleware:
+    """Log method, route template, status code, and duration for every request.
+
+    Implemented as a pure ASGI middleware rather than a ``BaseHTTPMiddleware``: the response
+    messages are passed straight through to the server, so there is no extra task or memory
+    stream per request and streamed bodies are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the downstream ASGI application."""
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # noqa: PLR6301
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log timing information."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.perf_counter()
-        response: Response = await call_next(request)
-        duration_ms = (time.perf_counter() - start) * 1000
-        logger.info(
-            "{method} {path} {status} {duration:.1f}ms",
-            method=request.method,
-            path=request.url.path,
-            status=response.status_code,
-            duration=duration_ms,
-        )
-        return response
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            # The router stores the matched route in the scope; log its template (e.g.
+            # `/items/{item_id}`) so that log lines can be grouped per endpoint.
+            route = scope.get("route")
+            logger.info(
+                "{method} {path} {status} {duration:.1f}ms",
+                method=scope["method"],
+                path=getattr(route, "path", scope["path"]),
+                status=status_code,
+                duration=duration_ms,
+            )
+
+
+class MetricsMiddleware:
+    """Count requests and record their latency per route template.
+
+    Requests that match no route are recorded under the `<unmatched>` route, so that scanning
+    for random paths cannot create an unbounded number of label values.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the downstream ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request and record its metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+
+
+def _admission_group(scope: Scope) -> AdmissionGroup | None:
+    """Return the route group of a request, or None for the endpoints that are never limited.
+
+    Health checks, metrics and admin endpoints are not limited, so that the instance can still
+    be probed and operated while it sheds load.
+    """
+    path = scope["path"]
+    if path != "/items" and not path.startswith("/items/"):
+        return None
+    return admission_groups["read" if scope["method"] in {"GET", "HEAD"} else "write"]
+
+
+class AdmissionMiddleware:
+    """Admit requests within the concurrency and rate limits of their route group.
+
+    Requests over the rate of their group get a 429 response, and requests that find its queue
+    full or wait in it longer than `admission_queue_timeout` get a 503 response, both with a
+    `Retry-After` header. An admitted request holds its slot until its response is sent, streamed
+    bodies included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the downstream ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request if it is admitted, or reject it."""
+        group = _admission_group(scope) if scope["type"] == "http" else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+        rejection = await group.admit()
+        if rejection is not None:
+            response = JSONResponse(
+                {"detail": HTTPStatus(rejection.status).phrase},
+                status_code=rejection.status,
+                headers={"Retry-After": str(rejection.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
+
+
+def _profiling_selected(scope: Scope) -> bool:
+    """Return whether the request asks to be profiled, or is drawn for profiling."""
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            token = settings.admin_token
+            return not token or secrets.compare_digest(value, token.encode())
+    return random.random() < settings.profiling_sample_rate
+
+
+class ProfilingMiddleware:
+    """Profile selected requests with cProfile, and save every profile to a file.
+
+    A request is profiled when it sends the `X-Profile` header, whose value must be the admin
+    token when `ADMIN_TOKEN` is set, or at random with the probability `profiling_sample_rate`.
+    Its response gets an `X-Profile-File` header with the name of the profile in `directory`,
+    which `python -m pstats` or snakeviz can open.
+
+    The profiler records every function that runs on the thread, so the profile of a request
+    also holds the work of the requests served meanwhile on the same event loop. One request is
+    profiled at a time, since a second profiler cannot run alongside the first one. The app only
+    adds this middleware when `profiling_enabled` is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, directory: Path) -> None:
+        """Wrap the downstream ASGI application, and save the profiles in `directory`."""
+        self.app = app
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request, under the profiler if it is selected."""
+        if scope["type"] != "http" or self._profiling or not _profiling_selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid4().hex[:8]}.prof"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = name
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active, such as one attached by a debugger.
+            await self.app(scope, receive, send)
+            return
+        self._profiling = True
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            duration_ms = (time.perf_counter() - start) * 1000
+            await asyncio.to_thread(profiler.dump_stats, self.directory / name)
+            logger.info(
+                "Profiled {method} {path} in {duration:.1f}ms: {file}",
+                method=scope["method"],
+                path=scope["path"],
+                duration=duration_ms,
+                file=self.directory / name,
+            )
+
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson")
+
+
+class CompressionMiddleware:
+    """Compress response bodies with the best encoding accepted by the client.
+
+    The body is buffered until it reaches `minimum_size` bytes: smaller responses, such as the
+    ones of `/health`, are sent as is without spending CPU on them. Streamed bodies are then
+    compressed one chunk at a time and flushed after each chunk, so that they are never buffered
+    whole and NDJSON clients can decode every line as soon as it arrives.
+
+    A compressed response gets a weak `ETag`, since its bytes differ from the uncompressed ones;
+    conditional requests compare tags weakly, so the tag is still honored.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6) -> None:
+        """Wrap the downstream ASGI application."""
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request and compress its response if worthwhile."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), ENCODERS)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        compressing_send = _CompressingSender(send, encoding, self.minimum_size, self.level)
+        await self.app(scope, receive, compressing_send)
+
+
+class _CompressingSender:
+    """Send function compressing the body of one response on its way to the server."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int, level: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start_message: Message = {}
+        self.pending: list[bytes] = []
+        self.pending_size = 0
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        """Hold, compress, or forward a response message."""
+        if message["type"] == "http.response.start":
+            self.passthrough = not _is_compressible(message)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start_message = message
+        elif message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+        else:
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            if self.encoder is None:
+                await self._buffer(body, more_body=more_body)
+            else:
+                await self._compress(self.encoder, body, more_body=more_body)
+
+    async def _buffer(self, body: bytes, *, more_body: bool) -> None:
+        """Buffer the body until it reaches the minimum size, then start compressing it."""
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if self.pending_size < self.minimum_size and more_body:
+            return
+        body = b"".join(self.pending)
+        self.pending.clear()
+        if self.pending_size < self.minimum_size:
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        encoder = self.encoder = ENCODERS[self.encoding](self.level)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if (etag := headers.get("etag")) is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            await self._compress(encoder, body, more_body=True)
+        else:
+            compressed = encoder.compress(body) + encoder.finish()
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, encoder: Encoder, body: bytes, *, more_body: bool) -> None:
+        """Compress a chunk of a streamed body, flushing it so that the client can decode it."""
+        if more_body:
+            compressed = encoder.compress(body) + encoder.flush()
+        else:
+            compressed = encoder.compress(body) + encoder.finish()
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+def _is_compressible(start_message: Message) -> bool:
+    """Return whether a response may be compressed, from its status and headers."""
+    if start_message["status"] < 200 or start_message["status"] in {204, 304}:  # noqa: PLR2004
+        return False
+    headers = Headers(raw=start_message["headers"])
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and (
+        content_type.startswith(_COMPRESSIBLE_TYPES) or "+json" in content_type
+    )
 
 
+# Innermost, so that the queued and rejected requests are logged and measured like the others.
+app.add_middleware(AdmissionMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        level=settings.compression_level,
+    )
 app.add_middleware(RequestLoggingMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.profiling_enabled:
+    # Outermost, so that the profiles include the other middleware, such as compression.
+    app.add_middleware(ProfilingMiddleware, directory=Path(settings.profiling_dir))
+
+
+# --- Responses -------------------------------------------------------------------
+
+
+class SerializedJSONResponse(Response):
+    """A JSON response built from bytes serialized beforehand.
+
+    Returning a response instance bypasses FastAPI's validation and serialization of the route's
+    return value, which is redundant for items that come straight from the service.
+    """
+
+    media_type = "application/json"
 
 
 # --- Exception handlers ----------------------------------------------------------
@@ -105,29 +636,348 @@ def unhandled_exception_handler(request: Request, exc: Exception) -> JSONRespons
 
 
 @app.get("/health")
+@app.get("/health/live")
 async def health() -> HealthResponse:
-    """Health check endpoint."""
+    """Liveness check: the process answers requests. It checks no dependency."""
     return HealthResponse()
 
 
-@app.post("/items", status_code=201)
-async def create_item(data: ItemCreate, service: ItemServiceDep) -> Item:
-    """Create a new item."""
-    return service.create(data)
+@app.get("/health/ready", responses={503: {"model": ReadinessResponse}})
+async def ready(response: Response) -> ReadinessResponse:
+    """Readiness check: run the dependency checks, or reuse their results cached for a few seconds.
+
+    The status is 503 when any check failed, so that the load balancer stops routing requests to
+    this worker until it recovers.
+    """
+    results = await health_checks.run()
+    ok = all(result.ok for result in results.values())
+    if not ok:
+        response.status_code = 503
+    return ReadinessResponse(
+        status="ok" if ok else "unavailable",
+        checks={name: result.detail for name, result in results.items()},
+    )
+
+
+@app.post("/admin/settings/reload", include_in_schema=False)
+async def reload_settings_endpoint(
+    authorization: Annotated[str, Header()] = "",
+) -> SettingsReloadResponse:
+    """Reload the settings of the worker serving the request.
+
+    The endpoint only exists when `ADMIN_TOKEN` is set, and requires it as a bearer token. Values
+    are not returned, since some of them are secrets. With several workers, send SIGHUP to each of
+    them instead, such as with `pkill -HUP -P <gunicorn master pid>`.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    try:
+        changes = reload_settings()
+    except ValidationError as exc:
+        # Only name the invalid settings: their values may be secrets.
+        invalid = ", ".join(sorted({str(error["loc"][0]) for error in exc.errors()}))
+        raise HTTPException(status_code=422, detail=f"Invalid settings: {invalid}") from exc
+    return SettingsReloadResponse(
+        changed=sorted(changes), restart_required=sorted(STARTUP_SETTINGS & changes.keys())
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose the metrics of all workers in the Prometheus text format."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/items", status_code=201, response_model=Item)
+async def create_item(
+    data: ItemCreate,
+    response: Response,
+    service: ItemServiceDep,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=255)] = None,
+) -> Response | Item:
+    """Create a new item.
+
+    Clients that retry the request send the same `Idempotency-Key` header with each attempt, so
+    that only one item is created: the retries get the response of the first attempt, with an
+    `Idempotent-Replayed: true` header. Reusing a key with a different body is rejected with 422.
+    """
+    headers = {}
+    if idempotency_key is None:
+        item = await service.create(data)
+    else:
+        try:
+            item, replayed = await service.create_once(data, idempotency_key)
+        except IdempotencyKeyConflictError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        if replayed:
+            headers["Idempotent-Replayed"] = "true"
+    if settings.api_fast_json:
+        return SerializedJSONResponse(service.item_json(item), status_code=201, headers=headers)
+    response.headers.update(headers)
+    return item
 
 
-@app.get("/items")
-async def list_items(service: ItemServiceDep) -> list[Item]:
-    """List all items."""
-    return service.list_all()
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CHUNK_SIZE = 100
+
+
+async def _stream_ndjson(
+    chunks: AsyncIterator[list[Item]], service: AsyncItemService
+) -> AsyncIterator[bytes]:
+    """Serialize chunks of items as newline-delimited JSON, a chunk of lines at a time.
+
+    Yields:
+        UTF-8 encoded lines for the next chunk of items.
+    """
+    async for chunk in chunks:
+        yield b"".join(service.item_json(item) + b"\n" for item in chunk)
+        # Give other requests a turn between chunks when streaming a large store.
+        await asyncio.sleep(0)
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Return whether the `If-None-Match` request header matches the current entity tag."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+@app.get("/items", response_model=list[Item])
+async def list_items(  # noqa: PLR0913, PLR0917
+    request: Request,
+    response: Response,
+    service: ItemServiceDep,
+    after: Annotated[int, Query(ge=0, description="Only return items with a greater id")] = 0,
+    limit: Annotated[int | None, Query(ge=1, le=settings.items_max_page_size)] = None,
+    name: Annotated[str | None, Query(description="Only return items with this name")] = None,
+    min_price: Annotated[float | None, Query(description="Inclusive lower price bound")] = None,
+    max_price: Annotated[float | None, Query(description="Inclusive upper price bound")] = None,
+) -> Response | list[Item]:
+    """List items in id order, one page at a time, optionally filtered by name and price.
+
+    The `Link` response header points to the next page when there may be more items. Clients
+    that send `Accept: application/x-ndjson` instead receive every item after the cursor (up to
+    `limit`) as a stream of newline-delimited JSON, which keeps memory flat for large stores.
+
+    The `ETag` header is derived from the store epoch and version, so a client that sends it back
+    in `If-None-Match` gets an empty 304 response until an item is written or the store is
+    replaced, for example when an in-memory store is recreated by a restart.
+    """
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    # Read the version before the items: a concurrent write can then only make the tag stale,
+    # which costs the client a full response, never a missed update.
+    etag = f'"items-{service.epoch()}-{await service.version()}{"-ndjson" if ndjson else ""}"'
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if ndjson:
+        chunks = service.iter_chunks(
+            after,
+            limit,
+            name=name,
+            min_price=min_price,
+            max_price=max_price,
+            size=NDJSON_CHUNK_SIZE,
+        )
+        return StreamingResponse(
+            _stream_ndjson(chunks, service),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    limit = limit or settings.items_page_size
+    page = await service.list_page(
+        after, limit, name=name, min_price=min_price, max_price=max_price
+    )
+    if len(page) == limit:
+        next_url = request.url.include_query_params(after=page[-1].id, limit=limit)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    if settings.api_fast_json:
+        return SerializedJSONResponse(service.items_json(page), headers=headers)
+    response.headers.update(headers)
+    return page
+
+
+# Upper bound of the size of an encoded row, used to reject oversized bodies before reading them.
+BATCH_MAX_ROW_BYTES = 8192
+
+
+def _batch_too_large(detail: str) -> HTTPException:
+    """Return the error rejecting a batch that exceeds the configured maximum."""
+    return HTTPException(status_code=413, detail=detail)
+
+
+async def _read_batch_body(request: Request, *, ndjson: bool) -> bytes:
+    """Read a batch body, rejecting it with 413 as soon as it is known to be too large.
+
+    The declared Content-Length is checked before anything is read, and the bytes received are
+    counted for chunked bodies. NDJSON rows are counted as they arrive, so an oversized stream is
+    rejected without buffering more than one row past the maximum.
+    """
+    max_size = settings.items_batch_max_size
+    max_bytes = max_size * BATCH_MAX_ROW_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        detail = f"Batch body of {content_length} bytes exceeds the maximum of {max_bytes}"
+        raise _batch_too_large(detail)
+    chunks: list[bytes] = []
+    received = rows = 0
+    partial_line = b""
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            detail = f"Batch body exceeds the maximum of {max_bytes} bytes"
+            raise _batch_too_large(detail)
+        chunks.append(chunk)
+        if ndjson:
+            *lines, partial_line = (partial_line + chunk).split(b"\n")
+            rows += sum(1 for line in lines if line.strip())
+            if rows > max_size:
+                detail = f"Batch of more than {max_size} items exceeds the maximum of {max_size}"
+                raise _batch_too_large(detail)
+    return b"".join(chunks)
+
+
+def _read_batch_rows(body: bytes, content_type: str) -> tuple[dict[int, Any], list[BatchRowError]]:
+    """Decode a JSON array or an NDJSON body into rows keyed by their position in the batch.
+
+    A malformed NDJSON line only rejects that row, whereas a malformed JSON array rejects the
+    whole request since its rows cannot be told apart.
+    """
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        rows: dict[int, Any] = {}
+        errors: list[BatchRowError] = []
+        lines = (line for line in body.splitlines() if line.strip())
+        for index, line in enumerate(lines):
+            try:
+                rows[index] = from_json(line)
+            except ValueError as exc:
+                errors.append(BatchRowError(index=index, msg=str(exc), type="json_invalid"))
+        return rows, errors
+    try:
+        data = from_json(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON: {exc}") from exc
+    if not isinstance(data, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of items")
+    return dict(enumerate(data)), []
+
+
+def _validate_batch(rows: dict[int, Any]) -> tuple[list[ItemCreate], list[BatchRowError]]:
+    """Validate all rows in one pass, keeping the valid ones and reporting the others.
+
+    The rows are validated as a single list. Only when some of them fail are the remaining rows
+    validated a second time, without the rejected ones.
+    """
+    positions = list(rows)
+    try:
+        return ItemCreateBatch.validate_python(list(rows.values())), []
+    except ValidationError as exc:
+        errors = [
+            BatchRowError(
+                index=positions[int(error["loc"][0])],
+                loc=list(error["loc"][1:]),
+                msg=error["msg"],
+                type=error["type"],
+            )
+            for error in exc.errors(include_url=False)
+        ]
+    rejected = {error.index for error in errors}
+    valid_rows = [row for index, row in rows.items() if index not in rejected]
+    return ItemCreateBatch.validate_python(valid_rows), errors
+
+
+BATCH_BODY_SCHEMA = {"type": "array", "items": {"$ref": "#/components/schemas/ItemCreate"}}
+
+
+@app.post(
+    "/items/batch",
+    # The body is read and validated by hand, so describe it explicitly in the OpenAPI schema.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": BATCH_BODY_SCHEMA}
+                for media_type in ("application/json", NDJSON_MEDIA_TYPE)
+            },
+        }
+    },
+)
+async def create_items_batch(request: Request, service: ItemServiceDep) -> ItemBatchResult:
+    """Create many items from a JSON array or an NDJSON body.
+
+    Invalid rows are reported in `errors` without failing the rest of the batch. Batches larger
+    than the configured maximum are rejected with 413, before the whole body is read when their
+    size is known from Content-Length or from the NDJSON rows received so far.
+    """
+    content_type = request.headers.get("content-type", "")
+    ndjson = content_type.startswith(NDJSON_MEDIA_TYPE)
+    body = await _read_batch_body(request, ndjson=ndjson)
+    rows, errors = _read_batch_rows(body, content_type)
+    size = len(rows) + len(errors)
+    if size > settings.items_batch_max_size:
+        detail = f"Batch of {size} items exceeds the maximum of {settings.items_batch_max_size}"
+        raise _batch_too_large(detail)
+    valid_rows, validation_errors = _validate_batch(rows)
+    return ItemBatchResult(
+        created=await service.create_many(valid_rows),
+        errors=sorted(errors + validation_errors, key=lambda error: error.index),
+    )
 
 
-@app.get("/items/{item_id}")
-async def get_item(item_id: int, service: ItemServiceDep) -> Item:
-    """Get a single item by id."""
-    item = service.get(item_id)
+@app.get("/items/search", response_model=list[Item])
+async def search_items(
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Words to search for")],
+    service: ItemServiceDep,
+    limit: Annotated[int | None, Query(ge=1, le=settings.items_max_page_size)] = None,
+) -> Response | list[Item]:
+    """Search item names and descriptions for all the words of a query, the best matches first.
+
+    Words are matched whole and case-insensitively, except the last one, which also matches the
+    words it begins. Matches in names rank above matches in descriptions, and rare words above
+    common ones.
+    """
+    items = await service.search(q, limit or settings.items_page_size)
+    if settings.api_fast_json:
+        return SerializedJSONResponse(service.items_json(items))
+    return items
+
+
+@app.get("/items/{item_id}", response_model=Item)
+async def get_item(
+    item_id: int, request: Request, response: Response, service: ItemServiceDep
+) -> Response | Item:
+    """Get a single item by id.
+
+    The `ETag` header is derived from the store epoch and the item version, so a client that
+    sends it back in `If-None-Match` gets an empty 304 response until the item is written. With
+    a shared cache (`ITEMS_SHARED_CACHE_PATH`), an item read by any worker is served from it.
+    """
+    if settings.api_fast_json and service.shared_cache is not None:
+        found = await service.get_json(item_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+        cached_version, content = found
+        etag = f'"item-{service.epoch()}-{item_id}-{cached_version}"'
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return SerializedJSONResponse(content, headers={"ETag": etag})
+    version = await service.item_version(item_id)
+    etag = f'"item-{service.epoch()}-{item_id}-{version}"'
+    if version is not None and _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    item = await service.get(item_id)
     if item is None:
         raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    if settings.api_fast_json:
+        return SerializedJSONResponse(service.item_json(item), headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return item
 
 
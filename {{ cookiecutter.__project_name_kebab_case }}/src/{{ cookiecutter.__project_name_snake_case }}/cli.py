@@ -1,15 +1,32 @@
-"""{{ cookiecutter.project_name }} CLI."""
+"""{{ cookiecutter.project_name }} CLI.
+
+The CLI is run often from scripts, so its start-up time matters. Only Typer and a few standard
+library modules are imported when the module loads: each command imports the modules it needs
+(Rich, the settings, and so on) when it runs, so that `--help` and the lightest commands do not
+pay for the others.
+"""
+
+{%- if cookiecutter.with_fastapi_api|int %}
+
+import asyncio
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Annotated
+{%- else %}
 
-{% if cookiecutter.with_fastapi_api|int -%}
-import urllib.request
-{% endif -%}
 from typing import Annotated
+{%- endif %}
 
 import typer
-from rich import print  # noqa: A004
-from rich.table import Table
 
-from {{ cookiecutter.__project_name_snake_case }}.settings import Settings, settings
+{%- if cookiecutter.with_fastapi_api|int %}
+
+
+if TYPE_CHECKING:
+    import httpx
+{%- endif %}
 
 
 app = typer.Typer(help="{{ cookiecutter.project_name }} command-line interface.")
@@ -31,6 +48,11 @@ def main(
 @app.command()
 def info() -> None:
     """Display project metadata."""
+    from rich import print  # noqa: A004
+    from rich.table import Table
+
+    from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+
     table = Table(title="{{ cookiecutter.project_name }}")
     table.add_column("Key", style="cyan")
     table.add_column("Value", style="green")
@@ -45,28 +67,152 @@ def info() -> None:
 @app.command()
 def config() -> None:
     """Print current settings from environment and .env file."""
+    from rich import print  # noqa: A004
+    from rich.table import Table
+
+    from {{ cookiecutter.__project_name_snake_case }}.settings import Settings, settings
+
     table = Table(title="Settings")
     table.add_column("Key", style="cyan")
     table.add_column("Value", style="green")
     for field_name in Settings.model_fields:
         value = getattr(settings, field_name)
-        if _verbose or field_name != "sentry_dsn":
+        if _verbose or field_name not in {"sentry_dsn", "admin_token"}:
             table.add_row(field_name, str(value))
     print(table)
 {%- if cookiecutter.with_fastapi_api|int %}
 
 
+@dataclass
+class ProbeStats:
+    """The latencies of the successful probes of one target, in milliseconds, and its errors."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def probes(self) -> int:
+        """The number of probes sent."""
+        return len(self.latencies_ms) + self.errors
+
+    @property
+    def error_rate(self) -> float:
+        """The fraction of the probes that failed."""
+        return self.errors / self.probes if self.probes else 0.0
+
+    def summary(self) -> tuple[float, float, float, float] | None:
+        """Return the min, average, 95th percentile and max latency, or None without successes."""
+        if not self.latencies_ms:
+            return None
+        latencies = self.latencies_ms
+        p95 = latencies[0]
+        if len(latencies) > 1:
+            p95 = statistics.quantiles(latencies, n=100, method="inclusive")[94]
+        return min(latencies), statistics.fmean(latencies), p95, max(latencies)
+
+
+async def probe_targets(
+    urls: Sequence[str],
+    *,
+    count: int = 1,
+    interval: float = 0.0,
+    request_timeout: float = 5.0,
+    transport: "httpx.AsyncBaseTransport | None" = None,
+    report: Callable[[str, float | None], None] | None = None,
+) -> dict[str, ProbeStats]:
+    """Probe every URL `count` times, all URLs at once, with rounds `interval` seconds apart.
+
+    A probe succeeds when the URL answers with a 200 status within `request_timeout` seconds. The
+    client keeps a connection to every target open between rounds, so that only the first round
+    pays for connecting. `report` is called after every probe with its URL and latency, or None on
+    error.
+
+    Returns:
+        The latencies and errors of every URL.
+    """
+    import httpx
+
+    stats = {url: ProbeStats() for url in urls}
+    limits = httpx.Limits(max_connections=len(stats), max_keepalive_connections=len(stats))
+    async with httpx.AsyncClient(
+        timeout=request_timeout, limits=limits, transport=transport
+    ) as client:
+
+        async def probe(url: str) -> None:
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                ok = response.status_code == httpx.codes.OK
+            except httpx.HTTPError:
+                ok = False
+            latency_ms = (time.perf_counter() - start) * 1000
+            if ok:
+                stats[url].latencies_ms.append(latency_ms)
+            else:
+                stats[url].errors += 1
+            if report is not None:
+                report(url, latency_ms if ok else None)
+
+        for round_ in range(count):
+            start = time.perf_counter()
+            await asyncio.gather(*(probe(url) for url in stats))
+            if round_ < count - 1:
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    return stats
+
+
 @app.command()
-def health() -> None:
-    """Check the API health endpoint."""
-    url = f"http://{settings.api_host}:{settings.api_port}/health"
+def health(
+    targets: Annotated[
+        list[str] | None,
+        typer.Argument(help="Base URLs of the APIs to probe [default: the configured API]."),
+    ] = None,
+    count: Annotated[int, typer.Option("--count", "-c", min=1, help="Probes per target.")] = 1,
+    interval: Annotated[
+        float, typer.Option("--interval", "-i", min=0, help="Seconds between probe rounds.")
+    ] = 1.0,
+    timeout: Annotated[float, typer.Option(min=0, help="Seconds to wait for an answer.")] = 5.0,
+) -> None:
+    """Probe the API health endpoint of one or more targets, and report their latency."""
+    from rich import print  # noqa: A004
+    from rich.table import Table
+
+    from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+
+    bases = targets or [f"http://{settings.api_host}:{settings.api_port}"]
+    urls = [f"{base.rstrip('/')}/health" for base in bases]
+
+    def report(url: str, latency_ms: float | None) -> None:
+        if latency_ms is None:
+            print(f"[red]{url}: error[/red]")
+        else:
+            print(f"[dim]{url}: {latency_ms:.1f} ms[/dim]")
+
     if _verbose:
-        print(f"[dim]Checking {url}...[/dim]")
-    try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            data = response.read().decode()
-            print(f"[bold green]API is healthy:[/bold green] {data}")
-    except Exception as exc:
-        print(f"[bold red]API is unreachable:[/bold red] {exc}")
-        raise typer.Exit(code=1) from exc
+        print(f"[dim]Probing {', '.join(urls)} {count} time(s)...[/dim]")
+    stats = asyncio.run(
+        probe_targets(
+            urls,
+            count=count,
+            interval=interval,
+            request_timeout=timeout,
+            report=report if _verbose or count > 1 else None,
+        )
+    )
+
+    table = Table(title="Health")
+    table.add_column("Target", style="cyan")
+    table.add_column("Errors", justify="right")
+    for column in ("Min ms", "Avg ms", "p95 ms", "Max ms"):
+        table.add_column(column, justify="right", style="green")
+    for url, target in stats.items():
+        summary = target.summary()
+        latencies = [f"{ms:.1f}" for ms in summary] if summary else ["-"] * 4
+        errors = f"{target.errors}/{target.probes} ({target.error_rate:.0%})"
+        table.add_row(url, errors, *latencies)
+    print(table)
+    if any(target.errors for target in stats.values()):
+        print("[bold red]API is unhealthy:[/bold red] some probes failed")
+        raise typer.Exit(code=1)
+    print("[bold green]API is healthy[/bold green]")
 {%- endif %}
@@ -0,0 +1,153 @@
+"""{{ cookiecutter.project_name }} response compression.
+
+Encoders for the content codings the API can negotiate with its clients. gzip is always
+available through the standard library. zstd is available with Python 3.14's `compression.zstd`
+module or with the `zstandard` package, and brotli with the `brotli` package; when neither is
+installed, the encoding is simply not offered.
+
+Every encoder can be flushed, which emits all the data given so far in a form the client can
+decode. Streamed responses flush after each chunk, so that an NDJSON client decodes every line
+as soon as it is received.
+"""
+
+import importlib
+import zlib
+from collections.abc import Callable, Iterable
+from types import ModuleType
+from typing import Any, Protocol
+
+
+class Encoder(Protocol):
+    """A streaming compressor for one response body."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data, returning the output that is ready so far."""
+        ...
+
+    def flush(self) -> bytes:
+        """Return the pending output, so that all the data given so far can be decoded."""
+        ...
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        ...
+
+
+class GzipEncoder:
+    """gzip encoder from the standard library's zlib."""
+
+    def __init__(self, level: int) -> None:
+        """Initialize the encoder with a compression level from 1 to 9."""
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data, returning the output that is ready so far."""
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Return the pending output, so that all the data given so far can be decoded."""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdEncoder:
+    """zstd encoder from `compression.zstd` (Python 3.14+) or the `zstandard` package."""
+
+    def __init__(self, module: ModuleType, level: int) -> None:
+        """Initialize the encoder with one of the zstd modules and a compression level."""
+        self._stdlib = module.__name__ == "compression.zstd"
+        self._module = module
+        self._compressor: Any
+        if self._stdlib:
+            self._compressor = module.ZstdCompressor(level=level)
+        else:
+            self._compressor = module.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data, returning the output that is ready so far."""
+        return bytes(self._compressor.compress(data))
+
+    def flush(self) -> bytes:
+        """Return the pending output, so that all the data given so far can be decoded."""
+        if self._stdlib:
+            return bytes(self._compressor.flush(self._module.ZstdCompressor.FLUSH_BLOCK))
+        return bytes(self._compressor.flush(self._module.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        return bytes(self._compressor.flush())
+
+
+class BrotliEncoder:
+    """brotli encoder from the `brotli` package."""
+
+    def __init__(self, module: ModuleType, level: int) -> None:
+        """Initialize the encoder with the brotli module and a quality from 0 to 11."""
+        self._compressor = module.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data, returning the output that is ready so far."""
+        return bytes(self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        """Return the pending output, so that all the data given so far can be decoded."""
+        return bytes(self._compressor.flush())
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        return bytes(self._compressor.finish())
+
+
+def _import_first(*names: str) -> ModuleType | None:
+    """Return the first of the named modules that can be imported, or None."""
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def _available_encoders() -> dict[str, Callable[[int], Encoder]]:
+    """Return a factory for every supported encoding, from the most to the least preferred."""
+    encoders: dict[str, Callable[[int], Encoder]] = {}
+    zstd = _import_first("compression.zstd", "zstandard")
+    if zstd is not None:
+        encoders["zstd"] = lambda level: ZstdEncoder(zstd, level)
+    brotli = _import_first("brotli")
+    if brotli is not None:
+        encoders["br"] = lambda level: BrotliEncoder(brotli, level)
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+
+ENCODERS = _available_encoders()
+
+
+def negotiate(accept_encoding: str, encodings: Iterable[str]) -> str | None:
+    """Choose an encoding from an `Accept-Encoding` header, or None to send the body as is.
+
+    The encoding with the highest quality value wins. Ties go to the encoding that comes first in
+    `encodings`, and `*` stands for any encoding not listed in the header.
+    """
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        coding, _, parameters = entry.partition(";")
+        quality = 1.0
+        name, _, value = parameters.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
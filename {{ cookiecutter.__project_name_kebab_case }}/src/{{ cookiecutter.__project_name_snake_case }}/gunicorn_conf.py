@@ -0,0 +1,136 @@
+"""{{ cookiecutter.project_name }} gunicorn configuration.
+
+`poe api` loads this module into gunicorn with the `--config` option. The server parameters
+come from `Settings`, so that they are set with environment variables like the rest of the
+configuration: `API_WORKERS`, `API_TIMEOUT`, `API_MAX_REQUESTS`, and so on.
+
+With `API_WORKERS=auto`, the number of workers follows the resources of the container rather
+than the ones of the host: the CPU quota and the memory limit of the process's cgroup (v2 or v1),
+or else the CPUs the process may run on and the memory available on the host. Uvicorn workers
+serve requests on an event loop, so one worker per CPU keeps every CPU busy; the memory then
+caps the count at one worker per `API_WORKER_MEMORY_MB`.
+
+`API_THREADS` is not a gunicorn setting here, since Uvicorn workers do not use gunicorn's
+threads: the API applies it at startup to the thread pool that runs blocking code, such as
+synchronous dependencies.
+
+The workers create the item cache they share (`ITEMS_SHARED_CACHE_PATH`) when they start. The
+server removes it when it starts and stops, so that no item cached by an earlier run is served.
+"""
+
+import math
+import os
+from pathlib import Path
+
+from gunicorn.arbiter import Arbiter
+
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings, settings
+
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+MEMINFO = Path("/proc/meminfo")
+
+
+def _read(path: Path) -> str | None:
+    """Return the stripped content of a file, or None if it cannot be read."""
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> float:
+    """Return the number of CPUs the process may use, which may be fractional with a quota."""
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    cpus = float(available or os.cpu_count() or 1)
+    quota, period = None, None
+    if (cpu_max := _read(cgroup_root / "cpu.max")) is not None:
+        quota, _, period = cpu_max.partition(" ")
+    else:
+        quota = _read(cgroup_root / "cpu" / "cpu.cfs_quota_us")
+        period = _read(cgroup_root / "cpu" / "cpu.cfs_period_us")
+    # The quota is "max" in cgroup v2 and -1 in cgroup v1 when the CPU time is not limited.
+    if quota and period and quota.isdigit() and period.isdigit() and int(period) > 0:
+        cpus = min(cpus, int(quota) / int(period))
+    return cpus
+
+
+def memory_limit(cgroup_root: Path = CGROUP_ROOT, meminfo: Path = MEMINFO) -> int | None:
+    """Return the bytes of memory the process may use, or None if it cannot be told."""
+    limits = []
+    limit = _read(cgroup_root / "memory.max")
+    if limit is None:
+        limit = _read(cgroup_root / "memory" / "memory.limit_in_bytes")
+    # The limit is "max" in cgroup v2 and a huge number in cgroup v1 when memory is not limited,
+    # which the memory available on the host then caps.
+    if limit and limit.isdigit():
+        limits.append(int(limit))
+    for line in (_read(meminfo) or "").splitlines():
+        name, _, value = line.partition(":")
+        if name == "MemAvailable":
+            limits.append(int(value.split()[0]) * 1024)
+    return min(limits, default=None)
+
+
+def auto_workers(cpus: float, memory: int | None, worker_memory: int) -> int:
+    """Return one worker per CPU, rounded up, but no more than the memory holds, and at least 1."""
+    workers = math.ceil(cpus)
+    if memory is not None:
+        workers = min(workers, memory // worker_memory)
+    return max(1, workers)
+
+
+def resolve_workers(settings: Settings) -> int:
+    """Return the number of workers set in the settings, or the one that fits the resources."""
+    if settings.api_workers != "auto":
+        return settings.api_workers
+    return auto_workers(cpu_limit(), memory_limit(), settings.api_worker_memory_mb * 2**20)
+
+
+# Server settings read by gunicorn: https://docs.gunicorn.org/en/stable/settings.html
+workers = resolve_workers(settings)
+timeout = settings.api_timeout
+graceful_timeout = settings.api_graceful_timeout
+keepalive = settings.api_keep_alive
+max_requests = settings.api_max_requests
+max_requests_jitter = settings.api_max_requests_jitter
+backlog = settings.api_backlog
+worker_class = "uvicorn.workers.UvicornWorker"
+# Keep the worker heartbeat files in memory, where a slow disk cannot block the workers.
+worker_tmp_dir = "/dev/shm" if Path("/dev/shm").is_dir() else None  # noqa: S108
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server: Arbiter) -> None:  # noqa: ARG001
+    """Remove the shared item cache left by an earlier run, before the workers start."""
+    if settings.items_shared_cache_path:
+        Path(settings.items_shared_cache_path).unlink(missing_ok=True)
+
+
+def on_exit(server: Arbiter) -> None:  # noqa: ARG001
+    """Remove the shared item cache once the workers have stopped."""
+    if settings.items_shared_cache_path:
+        Path(settings.items_shared_cache_path).unlink(missing_ok=True)
+
+
+def when_ready(server: Arbiter) -> None:
+    """Log the effective configuration once the server is ready, before it starts the workers."""
+    cfg = server.cfg
+    mode = "auto" if settings.api_workers == "auto" else "fixed"
+    memory = memory_limit()
+    server.log.info(
+        "Configuration: workers=%d (%s: %g CPUs, %s MiB of memory) threads=%d timeout=%ds"
+        " graceful_timeout=%ds keepalive=%ds max_requests=%d max_requests_jitter=%d backlog=%d",
+        cfg.workers,
+        mode,
+        cpu_limit(),
+        "unknown" if memory is None else f"{memory // 2**20:,}",
+        settings.api_threads,
+        cfg.timeout,
+        cfg.graceful_timeout,
+        cfg.keepalive,
+        cfg.max_requests,
+        cfg.max_requests_jitter,
+        cfg.backlog,
+    )
@@ -0,0 +1,78 @@
+"""{{ cookiecutter.project_name }} health checks.
+
+Liveness only tells whether the process answers requests, so it checks nothing. Readiness runs
+the dependency checks registered with `HealthChecks`, such as a query against the storage
+backend. Their results are cached for a short time: the container runtime, the load balancer and
+the orchestrator can then probe every worker as often as they like, and the checks still run at
+most once per TTL. Probes that find the results stale while the checks run share that run.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """The outcome of one check: whether it passed, and why not when it failed."""
+
+    ok: bool
+    detail: str = "ok"
+
+
+class HealthChecks:
+    """A registry of readiness checks, run concurrently, with their results cached."""
+
+    def __init__(self, ttl: float = 5.0, timeout: float = 2.0) -> None:
+        """Cache results for `ttl` seconds and fail checks that run longer than `timeout`."""
+        self.ttl = ttl
+        self.timeout = timeout
+        self._checks: dict[str, Callable[[], object]] = {}
+        self._results: dict[str, CheckResult] | None = None
+        self._expires = 0.0
+        self._pending: asyncio.Task[dict[str, CheckResult]] | None = None
+
+    def register(self, name: str, check: Callable[[], object]) -> None:
+        """Register a check, which fails by raising an exception.
+
+        Checks are blocking functions, run in a worker thread so that a slow dependency cannot
+        stall the event loop. Registering a check discards the cached results.
+        """
+        self._checks[name] = check
+        self._results = None
+
+    def unregister(self, name: str) -> None:
+        """Remove a check if it is registered, and discard the cached results."""
+        self._checks.pop(name, None)
+        self._results = None
+
+    async def run(self) -> dict[str, CheckResult]:
+        """Return the result of every check, running them only when the cached ones expired.
+
+        Returns:
+            The result of every check, by name.
+        """
+        if self._results is not None and time.monotonic() < self._expires:
+            return self._results
+        loop = asyncio.get_running_loop()
+        if self._pending is None or self._pending.done() or self._pending.get_loop() is not loop:
+            self._pending = loop.create_task(self._run_all())
+        # A probe that gives up must not cancel the run shared with the other probes.
+        return await asyncio.shield(self._pending)
+
+    async def _run_all(self) -> dict[str, CheckResult]:
+        names = list(self._checks)
+        results = await asyncio.gather(*(self._run_check(self._checks[name]) for name in names))
+        self._results = dict(zip(names, results, strict=True))
+        self._expires = time.monotonic() + self.ttl
+        return self._results
+
+    async def _run_check(self, check: Callable[[], object]) -> CheckResult:
+        try:
+            await asyncio.wait_for(asyncio.to_thread(check), self.timeout)
+        except TimeoutError:
+            return CheckResult(ok=False, detail=f"timed out after {self.timeout:g} s")
+        except Exception as exc:  # noqa: BLE001
+            return CheckResult(ok=False, detail=f"{type(exc).__name__}: {exc}")
+        return CheckResult(ok=True)
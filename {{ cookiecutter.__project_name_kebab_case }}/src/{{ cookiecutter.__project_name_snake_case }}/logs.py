@@ -0,0 +1,143 @@
+"""{{ cookiecutter.project_name }} logging.
+
+Log records are formatted by the thread that emits them, but written to the output stream by a
+background thread. Request handlers therefore never wait on a write to stderr, and the writer
+thread writes the messages queued within a short interval with a single call.
+
+The queue is bounded: when the stream cannot keep up, new messages are dropped and counted
+rather than held in memory, and the number of dropped messages is reported in the log. Errors
+raised by the stream are reported on the standard error of the process and do not stop the
+writer thread.
+
+The minimum level follows the `log_level` setting when the settings are reloaded, without
+replacing the handler.
+"""
+
+import contextlib
+import sys
+import threading
+import time
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, TextIO
+
+from loguru import logger
+
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings
+
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+
+class BatchingSink:
+    """A loguru sink that writes messages to a stream from a background thread, in batches."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        max_batch_size: int = 1024,
+        flush_interval: float = 0.01,
+        max_queue_size: int = 100_000,
+    ) -> None:
+        """Start the writer thread for the given stream."""
+        self.stream = stream
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: SimpleQueue[str | None] = SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        """Queue a formatted message for writing, or count it as dropped if the queue is full."""
+        if self._queue.qsize() >= self.max_queue_size:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        self._queue.put(message)
+
+    def isatty(self) -> bool:
+        """Tell loguru whether the stream is a terminal, so that it colorizes messages."""
+        return self.stream.isatty()
+
+    def check_alive(self) -> None:
+        """Raise an exception when the writer thread is not running, for readiness checks.
+
+        Raises:
+            RuntimeError: The writer thread stopped.
+        """
+        if not self._thread.is_alive():
+            msg = "the log writer thread stopped"
+            raise RuntimeError(msg)
+
+    def stop(self) -> None:
+        """Write the queued messages and stop the writer thread.
+
+        Loguru calls this method when the sink is removed from the logger.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        backlogged = False
+        reported_dropped = 0
+        while not stopping:
+            batch = [self._queue.get()]
+            if batch[0] is not None and not backlogged:
+                # Wait a little so that the messages emitted meanwhile are written with this one.
+                time.sleep(self.flush_interval)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get())
+            backlogged = len(batch) == self.max_batch_size
+            stopping = batch[-1] is None
+            messages = [message for message in batch if message is not None]
+            if self.dropped > reported_dropped:
+                dropped, reported_dropped = self.dropped - reported_dropped, self.dropped
+                messages.append(f"{dropped} log messages dropped: the log queue was full\n")
+            if messages:
+                self._write("".join(messages))
+
+    def _write(self, text: str) -> None:
+        """Write to the stream, reporting errors on the process's standard error instead."""
+        try:
+            self.stream.write(text)
+            self.stream.flush()
+        except Exception as exc:  # noqa: BLE001
+            if sys.__stderr__ is not None and sys.__stderr__ is not self.stream:
+                sys.__stderr__.write(f"Log writer failed to write to {self.stream!r}: {exc!r}\n")
+
+
+class LevelFilter:
+    """A loguru filter that passes the records at or above the current `log_level` setting."""
+
+    def __init__(self, settings: Settings) -> None:
+        """Follow the log level of the settings, which must be a valid level to begin with."""
+        self._settings = settings
+        self._name = settings.log_level
+        self._no = logger.level(self._name).no
+
+    def __call__(self, record: "Record") -> bool:
+        """Return whether the record is at or above the log level."""
+        if self._settings.log_level != self._name:
+            self._name = self._settings.log_level
+            # Keep the previous level when the new one is unknown: logging from a filter could
+            # deadlock, so the error is left to `reload_settings` to report.
+            with contextlib.suppress(ValueError):
+                self._no = logger.level(self._name).no
+        return record["level"].no >= self._no
+
+
+def configure_logging(settings: Settings, stream: TextIO | BatchingSink = sys.stderr) -> int:
+    """Replace the default loguru handler with a batching one, and return its id.
+
+    `stream` is either the stream to write to, or a `BatchingSink` built beforehand, for example
+    to check that its writer thread is alive. Records are written as JSON objects, one per line,
+    when `settings.log_json` is set. Remove the handler with `logger.remove` to write the pending
+    records before exiting.
+    """
+    sink = stream if isinstance(stream, BatchingSink) else BatchingSink(stream)
+    logger.remove()
+    return logger.add(sink, level=0, filter=LevelFilter(settings), serialize=settings.log_json)
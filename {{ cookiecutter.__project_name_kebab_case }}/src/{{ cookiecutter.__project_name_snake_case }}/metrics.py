@@ -0,0 +1,471 @@
+"""{{ cookiecutter.project_name }} metrics.
+
+A small metrics registry with counters, gauges, and histograms, rendered in the Prometheus text
+exposition format.
+
+By default the values live in the memory of the current process. When a multiprocess directory
+is configured (as it should be when gunicorn runs several workers), every process writes its
+values to its own memory-mapped file in that directory instead, and rendering merges the files
+of all processes. This way a scrape returns the same totals whichever worker answers it. The
+files are named `metrics-<pid>.db`; those left by an earlier run should be deleted before the
+server starts. Other files in the directory are ignored.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Generator, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ClassVar, Protocol
+
+from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# A sample is identified by the JSON encoding of [metric name, sample name, label values].
+# Histograms use the sample names "sum" and the upper bound of each bucket.
+_Sample = tuple[str, str, tuple[str, ...]]
+
+
+class _Values(Protocol):
+    """The sample values written by the current process."""
+
+    def add(self, key: str, amount: float) -> None:
+        """Add an amount to a sample, starting from zero."""
+        ...
+
+    def set(self, key: str, value: float) -> None:
+        """Set the value of a sample."""
+        ...
+
+    def collect(self) -> dict[str, float]:
+        """Return a snapshot of all samples."""
+        ...
+
+
+class _MemoryValues:
+    """Sample values kept in a dict, visible to the current process only."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, amount: float) -> None:
+        """Add an amount to a sample, starting from zero."""
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, key: str, value: float) -> None:
+        """Set the value of a sample."""
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> dict[str, float]:
+        """Return a snapshot of all samples."""
+        with self._lock:
+            return dict(self._values)
+
+
+# File layout: the number of bytes in use, then one entry per sample made of the length of its
+# key, the key, padding to an 8-byte boundary, and the value as a double.
+_USED = struct.Struct("<Q")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_FILE_SIZE = 64 * 1024
+_FILE_PREFIX = "metrics-"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _read_entries(data: bytes | mmap.mmap) -> Iterator[tuple[str, int]]:
+    """Yield the key and value offset of every entry of a metrics file.
+
+    Yields:
+        The key of an entry and the offset of its value.
+    """
+    (used,) = _USED.unpack_from(data, 0)
+    position = _USED.size
+    while position < used:
+        (length,) = _KEY_LENGTH.unpack_from(data, position)
+        key_start = position + _KEY_LENGTH.size
+        value_offset = _align(key_start + length)
+        yield data[key_start : key_start + length].decode(), value_offset
+        position = value_offset + _VALUE.size
+
+
+class _FileValues:
+    """Sample values kept in a memory-mapped file that other processes can read.
+
+    Only the owning process writes to the file. A new entry is fully written before the number of
+    bytes in use is updated, so readers never see a partial entry.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        path.touch()
+        self._file = path.open("r+b")
+        if os.fstat(self._file.fileno()).st_size < _INITIAL_FILE_SIZE:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if _USED.unpack_from(self._map, 0)[0] == 0:
+            _USED.pack_into(self._map, 0, _USED.size)
+        # A file left by an earlier process with the same pid is continued, not overwritten.
+        self._offsets = dict(_read_entries(self._map))
+        (self._used,) = _USED.unpack_from(self._map, 0)
+
+    def _offset(self, key: str) -> int:
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return offset
+        encoded = key.encode()
+        value_offset = _align(self._used + _KEY_LENGTH.size + len(encoded))
+        end = value_offset + _VALUE.size
+        if end > len(self._map):
+            size = len(self._map)
+            while size < end:
+                size *= 2
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        key_start = self._used + _KEY_LENGTH.size
+        _KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[key_start : key_start + len(encoded)] = encoded
+        _VALUE.pack_into(self._map, value_offset, 0.0)
+        _USED.pack_into(self._map, 0, end)
+        self._used = end
+        self._offsets[key] = value_offset
+        return value_offset
+
+    def add(self, key: str, amount: float) -> None:
+        """Add an amount to a sample, starting from zero."""
+        with self._lock:
+            offset = self._offset(key)
+            _VALUE.pack_into(self._map, offset, _VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def set(self, key: str, value: float) -> None:
+        """Set the value of a sample."""
+        with self._lock:
+            _VALUE.pack_into(self._map, self._offset(key), value)
+
+    def collect(self) -> dict[str, float]:
+        """Return a snapshot of all samples."""
+        with self._lock:
+            return {
+                key: _VALUE.unpack_from(self._map, offset)[0]
+                for key, offset in self._offsets.items()
+            }
+
+
+def _read_file(path: Path) -> dict[str, float]:
+    """Read the samples of a metrics file written by any process."""
+    data = path.read_bytes()
+    return {key: _VALUE.unpack_from(data, offset)[0] for key, offset in _read_entries(data)}
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+class _Metric:
+    """A named metric with a fixed set of label names."""
+
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._keys: dict[tuple[str, tuple[str, ...]], str] = {}
+
+    def _key(self, sample: str, labels: dict[str, str]) -> str:
+        values = tuple(str(labels[name]) for name in self.labelnames)
+        key = self._keys.get((sample, values))
+        if key is None:
+            key = self._keys[sample, values] = json.dumps([self.name, sample, values])
+        return key
+
+    def render(self, samples: dict[tuple[str, ...], dict[str, float]]) -> Iterator[str]:
+        """Yield the exposition lines of the metric from its samples grouped by label values.
+
+        Yields:
+            One line of the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, sample in sorted(samples.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {sample['']!r}"
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as a number of requests."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter for the given label values."""
+        self._registry.values.add(self._key("", labels), amount)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, such as a number of requests in flight.
+
+    In multiprocess mode, the values of processes that have exited are left out.
+    """
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the gauge for the given label values."""
+        self._registry.values.add(self._key("", labels), amount)
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrement the gauge for the given label values."""
+        self._registry.values.add(self._key("", labels), -amount)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for the given label values."""
+        self._registry.values.set(self._key("", labels), value)
+
+
+class Histogram(_Metric):
+    """A distribution of observed values, such as request latencies, counted in buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the histogram with the upper bounds of its buckets."""
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._bounds = tuple(_format_bound(bound) for bound in self.buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation for the given label values."""
+        # Each observation only counts in its own bucket; buckets are made cumulative on render.
+        values = self._registry.values
+        values.add(self._key(self._bounds[bisect_left(self.buckets, value)], labels), 1.0)
+        values.add(self._key("sum", labels), value)
+
+    @contextmanager
+    def time(self, **labels: str) -> Generator[None]:
+        """Observe the duration of the block, in seconds.
+
+        Yields:
+            Nothing; the block is timed until it exits.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self, samples: dict[tuple[str, ...], dict[str, float]]) -> Iterator[str]:
+        """Yield the exposition lines of the histogram from its samples grouped by label values.
+
+        Yields:
+            One line of the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, sample in sorted(samples.items()):
+            labels = _format_labels(self.labelnames, values)
+            count = 0.0
+            for bound in self._bounds:
+                count += sample.get(bound, 0.0)
+                bucket_labels = _format_labels((*self.labelnames, "le"), (*values, bound))
+                yield f"{self.name}_bucket{bucket_labels} {count!r}"
+            yield f"{self.name}_sum{labels} {sample.get('sum', 0.0)!r}"
+            yield f"{self.name}_count{labels} {count!r}"
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together, optionally shared by several processes."""
+
+    def __init__(self, multiprocess_dir: str | Path | None = None) -> None:
+        """Initialize the registry, in multiprocess mode if a directory is given."""
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self._metrics: dict[str, _Metric] = {}
+        self._values: _Values | None = None
+        self._lock = threading.Lock()
+        # A forked worker must write to its own values, not to those inherited from its parent.
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._values = None
+        self._lock = threading.Lock()
+
+    @property
+    def values(self) -> _Values:
+        """The sample values written by the current process, created on first use."""
+        if self._values is None:
+            with self._lock:
+                if self._values is None:
+                    if self.multiprocess_dir is None:
+                        self._values = _MemoryValues()
+                    else:
+                        self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+                        path = self.multiprocess_dir / f"{_FILE_PREFIX}{os.getpid()}.db"
+                        self._values = _FileValues(path)
+        return self._values
+
+    def _register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            message = f"Metric {metric.name!r} is already registered"
+            raise ValueError(message)
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register a new counter."""
+        metric = Counter(self, name, documentation, labelnames)
+        self._register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register a new gauge."""
+        metric = Gauge(self, name, documentation, labelnames)
+        self._register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register a new histogram."""
+        metric = Histogram(self, name, documentation, labelnames, buckets)
+        self._register(metric)
+        return metric
+
+    def _collect(self) -> dict[_Sample, float]:
+        """Return the samples of this process, or the merged samples of all processes."""
+        if self.multiprocess_dir is None:
+            snapshots = [(True, self.values.collect())]
+        else:
+            snapshots = [
+                (_is_alive(int(pid)), _read_file(path))
+                for path in self.multiprocess_dir.glob(f"{_FILE_PREFIX}*.db")
+                if (pid := path.stem.removeprefix(_FILE_PREFIX)).isdigit()
+            ]
+        samples: dict[_Sample, float] = {}
+        for alive, snapshot in snapshots:
+            for key, value in snapshot.items():
+                name, sample, values = json.loads(key)
+                metric = self._metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                sample_key = (name, sample, tuple(values))
+                samples[sample_key] = samples.get(sample_key, 0.0) + value
+        return samples
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        grouped: dict[str, dict[tuple[str, ...], dict[str, float]]] = {
+            name: {} for name in self._metrics
+        }
+        for (name, sample, values), value in self._collect().items():
+            grouped[name].setdefault(values, {})[sample] = value
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.extend(metric.render(grouped[name]))
+        return "\n".join(lines) + "\n"
+
+
+SERVICE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+registry = MetricsRegistry(settings.metrics_multiprocess_dir or None)
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds, by route template.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+ITEM_SERVICE_DURATION = registry.histogram(
+    "item_service_operation_duration_seconds",
+    "ItemService operation latency in seconds, by operation.",
+    ("operation",),
+    SERVICE_BUCKETS,
+)
+ITEM_WRITE_BATCH_SIZE = registry.histogram(
+    "item_write_batch_size",
+    "Items created together by the write batcher, per batch.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+ITEM_SHARED_CACHE_REQUESTS = registry.counter(
+    "item_shared_cache_requests_total",
+    "Reads of the item cache shared by the workers, by result (hit or miss).",
+    ("result",),
+)
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "admission_requests_in_flight",
+    "Requests admitted and not yet finished, by route group.",
+    ("group",),
+)
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "admission_queue_depth",
+    "Requests waiting for admission, by route group.",
+    ("group",),
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total",
+    "Requests rejected by admission control, by route group and reason.",
+    ("group", "reason"),
+)
@@ -1,6 +1,6 @@
 """{{ cookiecutter.project_name }} data models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class HealthResponse(BaseModel):
@@ -9,6 +9,22 @@ class HealthResponse(BaseModel):
     status: str = "ok"
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness check response, with the outcome of every dependency check."""
+
+    status: str = Field(description='"ok" when every check passed, "unavailable" otherwise')
+    checks: dict[str, str] = Field(description='"ok" or the reason of the failure, by check')
+
+
+class SettingsReloadResponse(BaseModel):
+    """Settings reload response: the names of the changed settings, without their values."""
+
+    changed: list[str] = Field(description="Settings whose value changed")
+    restart_required: list[str] = Field(
+        description="Changed settings that only apply once the workers are restarted"
+    )
+
+
 class ItemCreate(BaseModel):
     """Schema for creating a new item."""
 
@@ -21,3 +37,22 @@ class Item(ItemCreate):
     """Schema for a stored item."""
 
     id: int = Field(description="Unique item identifier")
+
+
+ItemCreateBatch = TypeAdapter(list[ItemCreate])
+
+
+class BatchRowError(BaseModel):
+    """Why one row of a batch was rejected."""
+
+    index: int = Field(description="Zero-based position of the row in the batch")
+    loc: list[str | int] = Field(default=[], description="Location of the error within the row")
+    msg: str = Field(description="Error message")
+    type: str = Field(description="Error type")
+
+
+class ItemBatchResult(BaseModel):
+    """Outcome of a batch create: the items created and the rows that were rejected."""
+
+    created: list[Item] = Field(description="Created items, in the order of their rows")
+    errors: list[BatchRowError] = Field(description="Rejected rows, ordered by index")
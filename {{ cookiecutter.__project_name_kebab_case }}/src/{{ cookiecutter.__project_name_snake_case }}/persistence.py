@@ -0,0 +1,484 @@
+"""{{ cookiecutter.project_name }} persistence of the in-memory stores.
+
+`DurableItemStore` lets the memory and columnar stores survive restarts without a database round
+trip per write. Every write is appended to a write-ahead log before it is acknowledged, and the
+whole store is saved to a compact snapshot every `snapshot_every` writes, after which the log
+segments that the snapshot covers are deleted. On startup, the store loads the snapshot and
+replays the log written after it.
+
+A write is acknowledged once its log record is on disk. Writers that arrive while the log is
+being flushed wait for the next flush, which then writes all their records with one fsync: under
+concurrent writes, a single fsync commits many of them (group commit).
+
+The snapshot is read through `mmap`: its columns are decoded straight from the page cache,
+without reading the file into memory first.
+
+Only one process may use a directory, which it locks: with several workers, each worker has its
+own in-memory store, so persistence requires a single worker.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import accumulate, pairwise
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from loguru import logger
+
+from {{ cookiecutter.__project_name_snake_case }}.models import Item, ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.storage import ItemStore, StoreSnapshot
+
+
+class SnapshotItemStore(ItemStore, Protocol):
+    """An in-memory store whose content can be saved to a snapshot and restored from it."""
+
+    def snapshot(self) -> StoreSnapshot:
+        """Return the content of the store, as of the last write."""
+        ...
+
+    def restore(self, snapshot: StoreSnapshot) -> None:
+        """Load the content of a snapshot into the empty store."""
+        ...
+
+
+# Log record: the length and CRC-32 of the body, then the body made of the store version written
+# by the record, the id of its first item and its number of items, and for each item its price,
+# the lengths of its UTF-8 name and description in bytes, and these two strings.
+_RECORD_HEADER = struct.Struct("<II")
+_RECORD_BODY = struct.Struct("<qqI")
+_RECORD_ROW = struct.Struct("<dII")
+
+# Snapshot: a magic number and the CRC-32 of the rest of the file, then the store epoch, version
+# and number of items, and the sizes of the name and description columns in bytes; then the item
+# versions, the prices, the lengths of the names and descriptions in characters, and the names
+# and descriptions concatenated and encoded in UTF-8.
+_SNAPSHOT_MAGIC = b"ITEMSNP1"
+_SNAPSHOT_CHECKSUM = struct.Struct("<8sI")
+_SNAPSHOT_HEADER = struct.Struct("<32sqqqq")
+
+SNAPSHOT_FILE = "snapshot.bin"
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+
+
+def _encode_record(version: int, items: Sequence[Item]) -> bytes:
+    """Encode the items written at a store version as a log record."""
+    parts = [_RECORD_BODY.pack(version, items[0].id, len(items))]
+    for item in items:
+        name, description = item.name.encode(), item.description.encode()
+        parts += (_RECORD_ROW.pack(item.price, len(name), len(description)), name, description)
+    body = b"".join(parts)
+    return _RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode_rows(body: bytes, offset: int, count: int) -> list[ItemCreate]:
+    """Decode the rows of a log record body, starting at an offset.
+
+    Returns:
+        The rows of the record.
+    """
+    rows = []
+    for _ in range(count):
+        price, name_length, description_length = _RECORD_ROW.unpack_from(body, offset)
+        offset += _RECORD_ROW.size
+        name = body[offset : offset + name_length].decode()
+        offset += name_length
+        description = body[offset : offset + description_length].decode()
+        offset += description_length
+        rows.append(ItemCreate(name=name, description=description, price=price))
+    return rows
+
+
+def _read_records(data: bytes) -> Iterator[tuple[int, int, list[ItemCreate], int]]:
+    """Yield the records of a log segment, up to the end or to the first incomplete record.
+
+    Yields:
+        The store version of a record, its first item id, its rows, and the offset of its end.
+    """
+    position = 0
+    while position + _RECORD_HEADER.size <= len(data):
+        length, crc = _RECORD_HEADER.unpack_from(data, position)
+        start = position + _RECORD_HEADER.size
+        body = data[start : start + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            # A record torn by a crash while it was written, and never acknowledged.
+            return
+        version, first_id, count = _RECORD_BODY.unpack_from(body, 0)
+        position = start + length
+        yield version, first_id, _decode_rows(body, _RECORD_BODY.size, count), position
+
+
+def _split(text: str, lengths: Sequence[int]) -> list[str]:
+    """Split concatenated strings, given their lengths."""
+    return [text[start:end] for start, end in pairwise(accumulate(lengths, initial=0))]
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make the creation, renaming and deletion of files in a directory durable."""
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def write_snapshot(path: Path, snapshot: StoreSnapshot) -> None:
+    """Save a snapshot to a file, replacing the previous one only once it is complete."""
+    names = "".join(snapshot.names).encode()
+    descriptions = "".join(snapshot.descriptions).encode()
+    columns = [
+        array("q", snapshot.item_versions).tobytes(),
+        array("d", snapshot.prices).tobytes(),
+        array("I", [len(name) for name in snapshot.names]).tobytes(),
+        array("I", [len(description) for description in snapshot.descriptions]).tobytes(),
+        names,
+        descriptions,
+    ]
+    header = _SNAPSHOT_HEADER.pack(
+        snapshot.epoch.encode(),
+        snapshot.version,
+        len(snapshot.names),
+        len(names),
+        len(descriptions),
+    )
+    crc = zlib.crc32(header)
+    for column in columns:
+        crc = zlib.crc32(column, crc)
+    temporary = path.with_name(path.name + ".tmp")
+    with temporary.open("wb") as file:
+        file.write(_SNAPSHOT_CHECKSUM.pack(_SNAPSHOT_MAGIC, crc))
+        file.write(header)
+        for column in columns:
+            file.write(column)
+        file.flush()
+        os.fsync(file.fileno())
+    temporary.replace(path)
+    _fsync_directory(path.parent)
+
+
+def _verify_snapshot(path: Path, data: mmap.mmap) -> None:
+    """Check the magic number and checksum of a snapshot, raising `ValueError` if corrupt."""
+    magic, crc = _SNAPSHOT_CHECKSUM.unpack_from(data, 0)
+    with memoryview(data) as view, view[_SNAPSHOT_CHECKSUM.size :] as checked:
+        if magic != _SNAPSHOT_MAGIC or zlib.crc32(checked) != crc:
+            message = f"The snapshot {path} is corrupt"
+            raise ValueError(message)
+
+
+def read_snapshot(path: Path) -> StoreSnapshot:
+    """Load a snapshot from a file, through a memory map.
+
+    A snapshot that fails its checksum raises `ValueError`, rather than losing the items.
+
+    Returns:
+        The content of the snapshot.
+    """
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        _verify_snapshot(path, data)
+        epoch, version, count, names_size, descriptions_size = _SNAPSHOT_HEADER.unpack_from(
+            data, _SNAPSHOT_CHECKSUM.size
+        )
+        item_versions, prices = array("q"), array("d")
+        name_lengths, description_lengths = array("I"), array("I")
+        offset = _SNAPSHOT_CHECKSUM.size + _SNAPSHOT_HEADER.size
+        with memoryview(data) as view:
+            for column in (item_versions, prices, name_lengths, description_lengths):
+                column.frombytes(view[offset : offset + count * column.itemsize])
+                offset += count * column.itemsize
+            names = str(view[offset : offset + names_size], "utf-8")
+            offset += names_size
+            descriptions = str(view[offset : offset + descriptions_size], "utf-8")
+    return StoreSnapshot(
+        epoch=epoch.decode(),
+        version=version,
+        names=_split(names, name_lengths),
+        descriptions=_split(descriptions, description_lengths),
+        prices=prices,
+        item_versions=item_versions,
+    )
+
+
+def _segment_version(path: Path) -> int:
+    """Return the first store version that a log segment may hold, from its name."""
+    return int(path.name.removeprefix(_SEGMENT_PREFIX).removesuffix(_SEGMENT_SUFFIX))
+
+
+class WriteAheadLog:
+    """An append-only log in segment files, flushed to disk with group commit.
+
+    Each segment holds the records from a store version on, and is named after that version.
+    """
+
+    def __init__(self, directory: Path, *, sync: bool = True) -> None:
+        """Write the segments in `directory`, waiting for fsync on commit if `sync` is set."""
+        self.directory = directory
+        self.sync = sync
+        self._file: BinaryIO | None = None
+        self._flushed = threading.Condition()
+        self._appended = 0
+        self._synced = 0
+        self._syncing = False
+
+    def segments(self) -> list[Path]:
+        """Return the segment files, in the order of their records."""
+        return sorted(
+            self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"), key=_segment_version
+        )
+
+    def open_segment(self, first_version: int) -> None:
+        """Close the current segment once it is on disk, and start one at `first_version`."""
+        with self._flushed:
+            while self._syncing:
+                self._flushed.wait()
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._synced = self._appended
+            path = self.directory / f"{_SEGMENT_PREFIX}{first_version:020d}{_SEGMENT_SUFFIX}"
+            self._file = path.open("ab")
+            _fsync_directory(self.directory)
+
+    def append(self, record: bytes) -> int:
+        """Append a record to the current segment, without waiting for it to reach the disk.
+
+        Returns:
+            The position of the record, to wait for with `commit`.
+        """
+        with self._flushed:
+            if self._file is None:
+                message = "The log has no open segment"
+                raise RuntimeError(message)
+            self._file.write(record)
+            if not self.sync:
+                # Written to the OS, so that the record survives a crash of the process.
+                self._file.flush()
+            self._appended += 1
+            return self._appended
+
+    def commit(self, position: int) -> None:
+        """Wait until the record at `position` is on disk.
+
+        The first writer to find no flush in progress flushes every record appended so far, while
+        the writers that arrive meanwhile wait for the flush to end, then start the next one.
+        """
+        if not self.sync:
+            return
+        with self._flushed:
+            while self._synced < position:
+                if self._syncing:
+                    self._flushed.wait()
+                    continue
+                if self._file is None:
+                    return
+                self._syncing = True
+                target, file = self._appended, self._file
+                try:
+                    file.flush()
+                    # Release the lock during the fsync, so that more records can be appended.
+                    self._flushed.release()
+                    try:
+                        os.fsync(file.fileno())
+                    finally:
+                        self._flushed.acquire()
+                    self._synced = max(self._synced, target)
+                finally:
+                    self._syncing = False
+                    self._flushed.notify_all()
+
+    def close(self) -> None:
+        """Flush the current segment to disk and close it."""
+        with self._flushed:
+            while self._syncing:
+                self._flushed.wait()
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._synced = self._appended
+
+
+class DurableItemStore:
+    """An in-memory item store whose writes are logged to disk, and restored on startup.
+
+    Reads are served by the in-memory store alone. A write is visible to readers as soon as it is
+    applied, and acknowledged to the writer once it is on disk.
+
+    Writes wait for the disk, so the store is blocking and is called from several threads. Reads
+    take the lock that writes hold while they apply items, so that they never see an item half
+    added; a scan takes it for each item rather than for the whole iteration.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        store: SnapshotItemStore,
+        directory: str | Path,
+        *,
+        sync: bool = True,
+        snapshot_every: int = 100_000,
+    ) -> None:
+        """Wrap an empty in-memory store, and load into it the items saved in `directory`.
+
+        A snapshot is saved in the background after every `snapshot_every` writes (0: only when
+        `snapshot` is called). Without `sync`, writes are acknowledged once written to the OS,
+        so that they survive a crash of the process but not of the machine.
+        """
+        self._store = store
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._directory_lock = self._lock_directory()
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_thread: threading.Thread | None = None
+        self._writes = 0
+        self._log = WriteAheadLog(self.directory, sync=sync)
+        self._recover()
+        if (self.directory / SNAPSHOT_FILE).exists():
+            self._log.open_segment(self._store.version() + 1)
+        else:
+            # Save the epoch of a new store right away, so that it is kept across restarts.
+            self.snapshot()
+
+    def _lock_directory(self) -> BinaryIO:
+        """Lock the directory for this process, failing if another process holds the lock."""
+        lock = (self.directory / "lock").open("wb")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            message = (
+                f"{self.directory} is used by another process; persistence requires one worker"
+            )
+            raise RuntimeError(message) from None
+        return lock
+
+    def _recover(self) -> None:
+        """Load the snapshot, then replay the records written after it."""
+        snapshot_path = self.directory / SNAPSHOT_FILE
+        if snapshot_path.exists():
+            self._store.restore(read_snapshot(snapshot_path))
+        replayed = 0
+        for segment in self._log.segments():
+            data = segment.read_bytes()
+            end = 0
+            for version, first_id, rows, record_end in _read_records(data):
+                end = record_end
+                if version <= self._store.version():
+                    continue
+                items = self._store.add(rows)
+                if version != self._store.version() or items[0].id != first_id:
+                    message = f"The log segment {segment} does not follow the items restored"
+                    raise RuntimeError(message)
+                replayed += 1
+            if end < len(data):
+                logger.warning("Discarding an incomplete record at the end of {}", segment)
+                os.truncate(segment, end)
+        logger.info(
+            "Restored the items at version {} from {}, replaying {} log records",
+            self._store.version(),
+            self.directory,
+            replayed,
+        )
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, and return once their log record is on disk."""
+        if not rows:
+            return []
+        with self._lock:
+            items = self._store.add(rows)
+            position = self._log.append(_encode_record(self._store.version(), items))
+            self._writes += 1
+            snapshot_due = self.snapshot_every > 0 and self._writes >= self.snapshot_every
+        self._log.commit(position)
+        if snapshot_due:
+            self._snapshot_in_background()
+        return items
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        with self._lock:
+            return self._store.get(item_id)
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, kept across restarts."""
+        return self._store.epoch()
+
+    def version(self) -> int:
+        """Return the current store version (0 for an empty store)."""
+        return self._store.version()
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the store version that last wrote an item, or None if not found."""
+        with self._lock:
+            return self._store.item_version(item_id)
+
+    def scan(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the matching items with an id greater than `after`, ordered by id.
+
+        Yields:
+            The matching items, ordered by id.
+        """
+        items = self._store.scan(after, name=name, min_price=min_price, max_price=max_price)
+        while True:
+            with self._lock:
+                item = next(items, None)
+            if item is None:
+                return
+            yield item
+
+    def snapshot(self) -> None:
+        """Save the store to a snapshot, and delete the log segments that it covers.
+
+        Writes are only held while the content of the store is collected, not while it is
+        written to disk: they go to a new log segment meanwhile.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                snapshot = self._store.snapshot()
+                self._log.open_segment(snapshot.version + 1)
+                self._writes = 0
+            write_snapshot(self.directory / SNAPSHOT_FILE, snapshot)
+            for segment in self._log.segments():
+                if _segment_version(segment) <= snapshot.version:
+                    segment.unlink()
+            _fsync_directory(self.directory)
+
+    def _snapshot_in_background(self) -> None:
+        """Start saving a snapshot in a thread, unless one is being saved."""
+        if self._snapshot_lock.locked():
+            return
+        self._snapshot_thread = threading.Thread(
+            target=self._run_snapshot, name="item-snapshot", daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def _run_snapshot(self) -> None:
+        try:
+            self.snapshot()
+        except Exception:  # noqa: BLE001
+            logger.exception("Saving a snapshot of the items failed; the log is kept")
+
+    def close(self) -> None:
+        """Wait for the snapshot being saved, flush the log, and release the directory."""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._log.close()
+        self._store.close()
+        self._directory_lock.close()
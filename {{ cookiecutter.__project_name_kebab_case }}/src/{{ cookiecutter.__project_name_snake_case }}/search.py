@@ -0,0 +1,287 @@
+"""{{ cookiecutter.project_name }} full-text search over item names and descriptions."""
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from itertools import groupby, islice, product
+
+from {{ cookiecutter.__project_name_snake_case }}.models import Item
+
+
+_WORD = re.compile(r"\w+")
+# A query word found in the name of an item counts this many times as much as in its description.
+NAME_WEIGHT = 2.0
+# Number of words per block of the vocabulary.
+_WORD_BLOCK_SIZE = 512
+# Membership is tested in a set of the ids of at most this many items, or of more than
+# _MAX_PROBES lists of ids, rather than with a binary search in each list.
+_SET_SIZE = 4096
+_MAX_PROBES = 8
+# Queries whose rarest word is in at most this many items, or with more than this many words,
+# rank all their matches rather than the best ones first.
+_RANK_ALL_SIZE = 1024
+_RANK_ALL_WORDS = 4
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into case-folded words, dropping punctuation and whitespace.
+
+    Returns:
+        The words of the text, in order.
+    """
+    return _WORD.findall(text.casefold())
+
+
+class _Vocabulary:
+    """The distinct indexed words in sorted order, kept in blocks of bounded size.
+
+    As in the price index of the in-memory stores, a new word only shifts the words of one block,
+    and the words starting with a prefix are found with a binary search.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty vocabulary."""
+        self._blocks: list[list[str]] = []
+        # The last (largest) word of each block, to find a block with a binary search.
+        self._maxes: list[str] = []
+
+    def add(self, word: str) -> None:
+        """Add a word that is not in the vocabulary yet."""
+        if not self._blocks:
+            self._blocks.append([word])
+            self._maxes.append(word)
+            return
+        block = min(bisect_right(self._maxes, word), len(self._maxes) - 1)
+        words = self._blocks[block]
+        insort(words, word)
+        self._maxes[block] = words[-1]
+        if len(words) > 2 * _WORD_BLOCK_SIZE:
+            self._blocks.insert(block + 1, words[_WORD_BLOCK_SIZE:])
+            self._maxes.insert(block + 1, words[-1])
+            del words[_WORD_BLOCK_SIZE:]
+            self._maxes[block] = words[-1]
+
+    def starting_with(self, prefix: str) -> Iterator[str]:
+        """Yield the words starting with a prefix, in sorted order.
+
+        Yields:
+            The matching words, the prefix itself first if it is a word.
+        """
+        for block in range(bisect_left(self._maxes, prefix), len(self._maxes)):
+            words = self._blocks[block]
+            for word in words[bisect_left(words, prefix) :]:
+                if not word.startswith(prefix):
+                    return
+                yield word
+
+
+class _Postings:
+    """The ids of the items holding any of a set of words, as sorted lists of ids."""
+
+    def __init__(self, lists: list[Sequence[int]]) -> None:
+        """Initialize the postings from one sorted list of ids per word."""
+        self._lists = lists
+        # Number of ids, counting an item once per list holding it.
+        self.size = sum(len(ids) for ids in lists)
+        self._ids: set[int] | None = None
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the ids in increasing order, once each.
+
+        Yields:
+            The ids of the items.
+        """
+        last = 0
+        for item_id in heapq.merge(*self._lists):
+            if item_id != last:
+                yield item_id
+                last = item_id
+
+    def __contains__(self, item_id: int) -> bool:
+        """Return whether an item holds any of the words."""
+        if self._ids is None and (self.size <= _SET_SIZE or len(self._lists) > _MAX_PROBES):
+            self._ids = set().union(*self._lists)
+        if self._ids is not None:
+            return item_id in self._ids
+        for ids in self._lists:
+            position = bisect_left(ids, item_id)
+            if position < len(ids) and ids[position] == item_id:
+                return True
+        return False
+
+
+@dataclass(frozen=True)
+class _Match:
+    """The items matching a query word: in their name, and in either their name or description."""
+
+    names: _Postings
+    either: _Postings
+    frequency: int
+
+
+class SearchIndex:
+    """An inverted index of the words of item names and descriptions.
+
+    For each word, the index keeps the ids of the items holding it in their name, and those
+    holding it in their description. Items are indexed in increasing id order, the order in
+    which the stores allocate ids, so that indexing an item only appends to these lists.
+
+    A query matches the items holding each of its words, in their name or description. Its last
+    word also matches the longer words it begins, so that results follow a query as it is typed.
+    Matches are ranked by the sum of the inverse document frequencies of the query words, with
+    words found in the name weighted by `NAME_WEIGHT`, so that rare words and names count most.
+    Ties are broken by id.
+
+    The score of a match only depends on which query words are in its name, so the matches of a
+    query of a few common words are found class by class, from the best score down, until
+    `limit` are found: the first results of a word held by most items cost as little as those of
+    a rare word.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._names: dict[str, array[int]] = {}
+        self._descriptions: dict[str, array[int]] = {}
+        # Number of items holding each word, in their name or description.
+        self._frequencies: dict[str, int] = {}
+        self._vocabulary = _Vocabulary()
+        self._count = 0
+        self.last_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of items indexed."""
+        return self._count
+
+    def add(self, items: Iterable[Item]) -> None:
+        """Index items in increasing id order, skipping those indexed already."""
+        with self._lock:
+            for item in items:
+                if item.id <= self.last_id:
+                    continue
+                name_words = tokenize(item.name)
+                description_words = tokenize(item.description)
+                for word in {*name_words, *description_words}:
+                    if word not in self._frequencies:
+                        self._vocabulary.add(word)
+                        self._frequencies[word] = 0
+                    self._frequencies[word] += 1
+                self._add_postings(item.id, name_words, in_name=True)
+                self._add_postings(item.id, description_words, in_name=False)
+                self.last_id = item.id
+                self._count += 1
+
+    def _add_postings(self, item_id: int, words: list[str], *, in_name: bool) -> None:
+        """Add an item to the postings of the words of its name or description."""
+        postings = self._names if in_name else self._descriptions
+        for word in words:
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = array("q", [item_id])
+            elif ids[-1] != item_id:
+                ids.append(item_id)
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """Return the ids of up to `limit` items matching a query, the most relevant first.
+
+        Returns:
+            The ids of the best matches, or none for a query without words.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            matches = [
+                self._match(word, prefix=position == len(words) - 1)
+                for position, word in enumerate(words)
+            ]
+            if not all(match.frequency for match in matches):
+                return []
+            weights = [math.log(1 + self._count / match.frequency) for match in matches]
+            rarest = min(match.either.size for match in matches)
+            if rarest <= _RANK_ALL_SIZE or len(matches) > _RANK_ALL_WORDS:
+                return _rank_all(matches, weights, limit)
+            return _rank_by_class(matches, weights, limit)
+
+    def _match(self, word: str, *, prefix: bool) -> _Match:
+        """Return the items holding a word, or for a prefix, any of the words it begins."""
+        terms = list(self._vocabulary.starting_with(word)) if prefix else [word]
+        names: list[Sequence[int]] = [self._names[term] for term in terms if term in self._names]
+        descriptions: list[Sequence[int]] = [
+            self._descriptions[term] for term in terms if term in self._descriptions
+        ]
+        frequency = sum(self._frequencies.get(term, 0) for term in terms)
+        return _Match(_Postings(names), _Postings(names + descriptions), frequency)
+
+
+def _score(weights: list[float], in_name: Iterable[bool]) -> float:
+    """Return the score of an item given which query words are in its name."""
+    return sum(
+        weight * NAME_WEIGHT if name else weight
+        for weight, name in zip(weights, in_name, strict=True)
+    )
+
+
+def _rank_all(matches: list[_Match], weights: list[float], limit: int) -> list[int]:
+    """Score every match, going through the items holding the rarest word.
+
+    Returns:
+        The ids of the best matches.
+    """
+    rarest = min(matches, key=lambda match: match.either.size)
+    others = [match.either for match in matches if match is not rarest]
+    candidates = [
+        item_id for item_id in rarest.either if all(item_id in either for either in others)
+    ]
+
+    def rank(item_id: int) -> tuple[float, int]:
+        return -_score(weights, (item_id in match.names for match in matches)), item_id
+
+    return heapq.nsmallest(limit, candidates, key=rank)
+
+
+def _rank_by_class(matches: list[_Match], weights: list[float], limit: int) -> list[int]:
+    """Find the matches by decreasing score, stopping once `limit` are found.
+
+    Matches are grouped by the query words in their name. Groups are searched from the best
+    score down, and groups with equal scores together, so that their matches merge by id.
+
+    Returns:
+        The ids of the best matches.
+    """
+    classes = sorted(
+        product((True, False), repeat=len(matches)), key=lambda in_name: -_score(weights, in_name)
+    )
+    results: list[int] = []
+    for _, group in groupby(classes, key=lambda in_name: _score(weights, in_name)):
+        needed = limit - len(results)
+        found = heapq.merge(*(islice(_in_class(matches, in_name), needed) for in_name in group))
+        results.extend(islice(found, needed))
+        if len(results) == limit:
+            break
+    return results
+
+
+def _in_class(matches: list[_Match], in_name: tuple[bool, ...]) -> Iterator[int]:
+    """Yield the items holding exactly the query words flagged `in_name` in their name.
+
+    Yields:
+        The ids of the items, in increasing order.
+    """
+    required = [
+        match.names if name else match.either for match, name in zip(matches, in_name, strict=True)
+    ]
+    excluded = [match.names for match, name in zip(matches, in_name, strict=True) if not name]
+    # Go through the fewest items, and test first the words that rule out the most.
+    required.sort(key=lambda postings: postings.size)
+    driver, *others = required
+    for item_id in driver:
+        if all(item_id in postings for postings in others) and not any(
+            item_id in postings for postings in excluded
+        ):
+            yield item_id
@@ -1,27 +1,594 @@
 """{{ cookiecutter.project_name }} service layer."""
 
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from {{ cookiecutter.__project_name_snake_case }}.metrics import (
+    ITEM_SERVICE_DURATION,
+    ITEM_SHARED_CACHE_REQUESTS,
+    ITEM_WRITE_BATCH_SIZE,
+)
 from {{ cookiecutter.__project_name_snake_case }}.models import Item, ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.search import SearchIndex
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache, store_tag
+from {{ cookiecutter.__project_name_snake_case }}.storage import ItemStore, MemoryItemStore
+
+
+class IdempotencyKeyConflictError(ValueError):
+    """An idempotency key was sent again with a different request."""
+
+
+class IdempotencyCache:
+    """The items created by idempotency key, in a bounded LRU cache with a TTL.
+
+    An item is created once per key: calls with a key seen less than `ttl` seconds ago get the
+    item created by the first call instead of creating another one, and calls that arrive while
+    it is being created wait for it. A failed create is forgotten, so that it can be retried.
+
+    The cache lives in the memory of the current process: with several workers, a retry served
+    by another worker creates the item again.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400.0) -> None:
+        """Keep the results of up to `maxsize` keys, for `ttl` seconds after they completed."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[object, Future[Item], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of keys in the cache, completed or not."""
+        return len(self._entries)
+
+    def _claim(self, key: str, request: object) -> tuple[Future[Item], bool]:
+        """Return the future result of a key, and whether the caller must run the operation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                if entry[0] != request:
+                    message = "The idempotency key was already used with a different request"
+                    raise IdempotencyKeyConflictError(message)
+                self._entries.move_to_end(key)
+                return entry[1], False
+            future: Future[Item] = Future()
+            # The entry of a running operation does not expire until the operation completes.
+            self._entries[key] = (request, future, float("inf"))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return future, True
+
+    def _complete(self, key: str, future: Future[Item], *, ok: bool) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not future:
+                return
+            if ok:
+                self._entries[key] = (entry[0], future, time.monotonic() + self.ttl)
+            else:
+                del self._entries[key]
+
+    def run(self, key: str, request: object, operation: Callable[[], Item]) -> tuple[Item, bool]:
+        """Run an operation once per key, or return the result of the call that ran it.
+
+        `request` describes what the operation does, such as the validated request body: a key
+        sent again with a different request is a client error, rather than a retry, and raises
+        `IdempotencyKeyConflictError`.
+
+        Returns:
+            The result of the operation, and whether it comes from an earlier call.
+        """
+        if self.maxsize <= 0:
+            return operation(), False
+        future, owner = self._claim(key, request)
+        if not owner:
+            return future.result(), True
+        try:
+            result = operation()
+        except BaseException as exc:
+            self._complete(key, future, ok=False)
+            future.set_exception(exc)
+            raise
+        self._complete(key, future, ok=True)
+        future.set_result(result)
+        return result, False
+
+    async def run_async(
+        self, key: str, request: object, operation: Callable[[], Awaitable[Item]]
+    ) -> tuple[Item, bool]:
+        """Run an awaitable operation once per key, like `run`, without blocking the event loop.
+
+        A call that arrives while the operation runs awaits its result, rather than blocking its
+        thread. The operation completes, and its result is kept, even if the call that started
+        it is cancelled, such as when its client disconnects.
+
+        Returns:
+            The result of the operation, and whether it comes from an earlier call.
+        """
+        if self.maxsize <= 0:
+            return await operation(), False
+        future, owner = self._claim(key, request)
+        if owner:
+            task = asyncio.ensure_future(operation())
+            task.add_done_callback(lambda task: self._settle(key, future, task))
+            return await asyncio.shield(task), False
+        # Cancelling a wrapped future cancels the future it wraps, which other calls share.
+        return await asyncio.shield(asyncio.wrap_future(future)), True
+
+    def _settle(self, key: str, future: Future[Item], task: asyncio.Future[Item]) -> None:
+        """Record the outcome of an operation run by `run_async`."""
+        if task.cancelled():
+            self._complete(key, future, ok=False)
+            future.cancel()
+        elif (exc := task.exception()) is not None:
+            self._complete(key, future, ok=False)
+            future.set_exception(exc)
+        else:
+            self._complete(key, future, ok=True)
+            future.set_result(task.result())
 
 
 class ItemService:
-    """In-memory item service demonstrating the service layer pattern."""
+    """Item service demonstrating the service layer pattern."""
+
+    def __init__(
+        self,
+        store: ItemStore | None = None,
+        json_cache_size: int = 0,
+        idempotency: IdempotencyCache | None = None,
+        shared_cache: SharedItemCache | None = None,
+    ) -> None:
+        """Initialize the service on top of a storage backend (in-memory by default).
 
-    def __init__(self) -> None:
-        """Initialize the service with an empty item store."""
-        self._items: dict[int, Item] = {}
-        self._next_id: int = 1
+        Up to `json_cache_size` serialized items are kept in memory, so that items read again
+        are not serialized again. The items created with an idempotency key are kept in the
+        `idempotency` cache. The items read by id with `get_json` are kept in the `shared_cache`
+        of all the workers, if any.
+        """
+        self._store: ItemStore = store if store is not None else MemoryItemStore()
+        self._search_index = SearchIndex()
+        self._json_cache: dict[int, bytes] = {}
+        self._json_cache_size = json_cache_size
+        # Writes to a blocking store invalidate the cache from the threads that run them.
+        self._json_lock = threading.Lock()
+        self.idempotency = idempotency if idempotency is not None else IdempotencyCache()
+        self.shared_cache = shared_cache
+
+    @property
+    def blocking(self) -> bool:
+        """Whether the calls to the storage backend may wait for I/O."""
+        return self._store.blocking
 
     def create(self, data: ItemCreate) -> Item:
         """Create a new item and return it with an assigned id."""
-        item = Item(id=self._next_id, **data.model_dump())
-        self._items[self._next_id] = item
-        self._next_id += 1
+        with ITEM_SERVICE_DURATION.time(operation="create"):
+            item = self._store.add([data])[0]
+        self._invalidate_json([item])
         return item
 
+    def create_once(self, data: ItemCreate, idempotency_key: str) -> tuple[Item, bool]:
+        """Create an item once per idempotency key, so that retries do not create duplicates.
+
+        A retry with the same key gets the item created by the first call, and a retry that
+        arrives while the first call runs waits for it.
+
+        Returns:
+            The item, and whether it was created by an earlier call with the same key.
+        """
+        return self.idempotency.run(idempotency_key, data, lambda: self.create(data))
+
+    def create_many(self, data: Sequence[ItemCreate]) -> list[Item]:
+        """Create several items at once, allocating their ids as one contiguous block."""
+        with ITEM_SERVICE_DURATION.time(operation="create_many"):
+            items = self._store.add(data)
+        self._invalidate_json(items)
+        return items
+
     def get(self, item_id: int) -> Item | None:
         """Return an item by id, or None if not found."""
-        return self._items.get(item_id)
+        with ITEM_SERVICE_DURATION.time(operation="get"):
+            return self._store.get(item_id)
+
+    def get_json(self, item_id: int) -> tuple[int, bytes] | None:
+        """Return the version and JSON serialization of an item, or None if not found.
+
+        The item comes from the shared cache when any worker read it since it was last written.
+        """
+        found = self.cached_json(item_id)
+        return found if found is not None else self.load_json(item_id)
+
+    def cached_json(self, item_id: int) -> tuple[int, bytes] | None:
+        """Return the version and JSON serialization of an item from the shared cache, or None."""
+        if self.shared_cache is None:
+            return None
+        found = self.shared_cache.get(store_tag(self._store.epoch()), item_id)
+        ITEM_SHARED_CACHE_REQUESTS.inc(result="miss" if found is None else "hit")
+        return found
+
+    def load_json(self, item_id: int) -> tuple[int, bytes] | None:
+        """Read the version and JSON serialization of an item from the store, and cache them.
+
+        Returns:
+            The version and serialization of the item, or None if not found.
+        """
+        tag = store_tag(self._store.epoch())
+        ticket = self.shared_cache.ticket(tag, item_id) if self.shared_cache is not None else 0
+        version = self.item_version(item_id)
+        item = self.get(item_id) if version is not None else None
+        if version is None or item is None:
+            return None
+        content = self.item_json(item)
+        if self.shared_cache is not None:
+            self.shared_cache.put(tag, item_id, version, content, ticket)
+        return version, content
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, telling its versions apart from others'."""
+        return self._store.epoch()
+
+    def version(self) -> int:
+        """Return the store version, which changes whenever any item is written."""
+        return self._store.version()
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the version of an item, which changes whenever it is written, or None."""
+        return self._store.item_version(item_id)
 
     def list_all(self) -> list[Item]:
         """Return all items."""
-        return list(self._items.values())
+        return list(self._store.scan())
+
+    def list_page(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> list[Item]:
+        """Return up to `limit` matching items with an id greater than `after`, ordered by id."""
+        with ITEM_SERVICE_DURATION.time(operation="list_page"):
+            items = self._store.scan(after, name=name, min_price=min_price, max_price=max_price)
+            return list(islice(items, limit))
+
+    def iter_items(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the items with an id greater than `after`, ordered by id.
+
+        Items can be filtered by exact name and by an inclusive price range, which the storage
+        backend answers from its indexes rather than by scanning every item.
+
+        The time spent producing the items is observed once the iteration ends. The time the
+        caller spends between items, such as sending them to a client, is not counted.
+
+        Yields:
+            The matching items, ordered by id.
+        """
+        items = self._store.scan(after, name=name, min_price=min_price, max_price=max_price)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                item = next(items, None)
+                elapsed += time.perf_counter() - start
+                if item is None:
+                    return
+                yield item
+        finally:
+            ITEM_SERVICE_DURATION.observe(elapsed, operation="iter_items")
+
+    def search(self, query: str, limit: int) -> list[Item]:
+        """Return up to `limit` items matching a full-text query, the most relevant first.
+
+        The search index is built by the first search, then catches up at each search with the
+        items written since, including those written to a shared store by other workers.
+        """
+        with ITEM_SERVICE_DURATION.time(operation="search"):
+            self._search_index.add(self._store.scan(after=self._search_index.last_id))
+            items = map(self._store.get, self._search_index.search(query, limit))
+            return [item for item in items if item is not None]
+
+    def item_json(self, item: Item) -> bytes:
+        """Return the JSON serialization of an item, from the cache when possible."""
+        content = self._json_cache.get(item.id)
+        if content is None:
+            content = item.__pydantic_serializer__.to_json(item)
+            if self._json_cache_size:
+                with self._json_lock:
+                    if len(self._json_cache) >= self._json_cache_size:
+                        # Evict the oldest entry; dicts iterate in insertion order.
+                        self._json_cache.pop(next(iter(self._json_cache)), None)
+                    self._json_cache[item.id] = content
+        return content
+
+    def items_json(self, items: Iterable[Item]) -> bytes:
+        """Return the JSON array serialization of several items, from the cache when possible."""
+        return b"[" + b",".join(self.item_json(item) for item in items) + b"]"
+
+    def _invalidate_json(self, items: Sequence[Item]) -> None:
+        """Drop the cached serialization of items that were written, in all workers."""
+        with self._json_lock:
+            for item in items:
+                self._json_cache.pop(item.id, None)
+        if self.shared_cache is not None:
+            self.shared_cache.invalidate(
+                store_tag(self._store.epoch()), (item.id for item in items)
+            )
+
+    def close(self) -> None:
+        """Release the resources held by the storage backend."""
+        self._store.close()
+
+
+def _take(items: Iterator[Item], size: int) -> list[Item]:
+    """Return the next `size` items of an iterator, or fewer at its end."""
+    return list(islice(items, size))
+
+
+class WriteBatcher:
+    """Creates the items of concurrent requests together, with one write per batch.
+
+    The first create to arrive starts a batch, which the creates arriving in the next `window`
+    seconds join. The batch is written when the window ends, or as soon as it holds `max_size`
+    items, with a single call to `write`: the storage backend then commits all its items at
+    once, such as in one SQLite transaction or one write-ahead log flush (group commit). Each
+    create gets its own item, and all of them get the error of a failed write.
+
+    A create cancelled before its batch is written, such as when its client disconnects, is
+    left out of the batch. The other creates of a batch are not affected.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Sequence[ItemCreate]], Awaitable[list[Item]]],
+        window: float = 0.0,
+        max_size: int = 100,
+    ) -> None:
+        """Write the batches with `write`, which returns the created items in order."""
+        self.write = write
+        self.window = window
+        self.max_size = max_size
+        self._batch: list[tuple[ItemCreate, asyncio.Future[Item]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # The running writes, which the event loop only references weakly.
+        self._writes: set[asyncio.Task[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether creates are batched, rather than written one at a time."""
+        return self.window > 0 and self.max_size > 1
+
+    async def create(self, data: ItemCreate) -> Item:
+        """Create an item in the next batch, and return it once the batch is written."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Item] = loop.create_future()
+        self._batch.append((data, future))
+        if len(self._batch) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Start writing the current batch, without the creates cancelled meanwhile."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(data, future) for data, future in self._batch if not future.done()]
+        self._batch = []
+        if batch:
+            task = asyncio.ensure_future(self._write(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[ItemCreate, asyncio.Future[Item]]]) -> None:
+        """Write a batch, and settle the future of each of its creates."""
+        ITEM_WRITE_BATCH_SIZE.observe(len(batch))
+        try:
+            items = await self.write([data for data, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), item in zip(batch, items, strict=True):
+            if not future.done():
+                future.set_result(item)
+
+
+class AsyncItemService:
+    """Awaitable counterpart of `ItemService`, so that the API routes never block the event loop.
+
+    The calls to a blocking storage backend run in a pool of at most `max_threads` threads: a
+    slow query or disk flush then holds up its own request only, and not the others served by
+    the event loop meanwhile. Keeping the pool as large as the connection pool of the backend
+    means that a thread never waits for a connection. The in-memory stores answer in
+    microseconds, so their calls run inline, which saves a handoff to a thread per call.
+    """
+
+    def __init__(
+        self,
+        service: ItemService | None = None,
+        max_threads: int = 4,
+        batch_window: float = 0.0,
+        batch_size: int = 100,
+    ) -> None:
+        """Wrap a service (an in-memory one by default), with a thread pool if it blocks.
+
+        Creates are batched by a `WriteBatcher` with a window of `batch_window` seconds and up
+        to `batch_size` items, if the window is positive.
+        """
+        self.service = service if service is not None else ItemService()
+        self.max_threads = max_threads
+        self._executor = self._new_executor()
+        self.batcher = WriteBatcher(self.create_many, batch_window, batch_size)
+
+    def _new_executor(self) -> ThreadPoolExecutor | None:
+        """Return a thread pool for a blocking service, or None. Threads start on demand."""
+        if not self.service.blocking:
+            return None
+        return ThreadPoolExecutor(self.max_threads, thread_name_prefix="item-storage")
+
+    async def create(self, data: ItemCreate) -> Item:
+        """Create a new item and return it with an assigned id, in a batch if enabled."""
+        if self.batcher.enabled:
+            return await self.batcher.create(data)
+        if self._executor is None:
+            return self.service.create(data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.create, data)
+
+    async def create_once(self, data: ItemCreate, idempotency_key: str) -> tuple[Item, bool]:
+        """Create an item once per idempotency key, so that retries do not create duplicates.
+
+        Returns:
+            The item, and whether it was created by an earlier call with the same key.
+        """
+        return await self.service.idempotency.run_async(
+            idempotency_key, data, lambda: self.create(data)
+        )
+
+    async def create_many(self, data: Sequence[ItemCreate]) -> list[Item]:
+        """Create several items at once, allocating their ids as one contiguous block."""
+        if self._executor is None:
+            return self.service.create_many(data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.create_many, data)
+
+    async def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        if self._executor is None:
+            return self.service.get(item_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.get, item_id)
+
+    @property
+    def shared_cache(self) -> SharedItemCache | None:
+        """The cache of serialized items shared by the workers, if any."""
+        return self.service.shared_cache
+
+    async def get_json(self, item_id: int) -> tuple[int, bytes] | None:
+        """Return the version and JSON serialization of an item, or None if not found.
+
+        A hit in the shared cache is answered on the event loop, without reading the store.
+        """
+        found = self.service.cached_json(item_id)
+        if found is not None:
+            return found
+        if self._executor is None:
+            return self.service.load_json(item_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.load_json, item_id)
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, which no backend reads from storage."""
+        return self.service.epoch()
+
+    async def version(self) -> int:
+        """Return the store version, which changes whenever any item is written."""
+        if self._executor is None:
+            return self.service.version()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.version)
+
+    async def item_version(self, item_id: int) -> int | None:
+        """Return the version of an item, which changes whenever it is written, or None."""
+        if self._executor is None:
+            return self.service.item_version(item_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.item_version, item_id)
+
+    async def list_page(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> list[Item]:
+        """Return up to `limit` matching items with an id greater than `after`, ordered by id."""
+        list_page = partial(
+            self.service.list_page,
+            after,
+            limit,
+            name=name,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        if self._executor is None:
+            return list_page()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, list_page)
+
+    async def iter_chunks(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        size: int = 100,
+    ) -> AsyncIterator[list[Item]]:
+        """Yield up to `limit` matching items with an id greater than `after`, in chunks.
+
+        Each chunk of up to `size` items is read in a single call to the thread pool.
+
+        Yields:
+            The next chunk of matching items, ordered by id.
+        """
+        items = self.service.iter_items(after, name=name, min_price=min_price, max_price=max_price)
+        remaining = islice(items, limit)
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._executor is None:
+                chunk = _take(remaining, size)
+            else:
+                chunk = await loop.run_in_executor(self._executor, _take, remaining, size)
+            if not chunk:
+                return
+            yield chunk
+
+    async def search(self, query: str, limit: int) -> list[Item]:
+        """Return up to `limit` items matching a full-text query, the most relevant first."""
+        if self._executor is None:
+            return self.service.search(query, limit)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.service.search, query, limit)
+
+    def item_json(self, item: Item) -> bytes:
+        """Return the JSON serialization of an item, from the cache when possible."""
+        return self.service.item_json(item)
+
+    def items_json(self, items: Iterable[Item]) -> bytes:
+        """Return the JSON array serialization of several items, from the cache when possible."""
+        return self.service.items_json(items)
+
+    def close(self) -> None:
+        """Wait for the calls in progress, then release the resources of the storage backend.
+
+        Like the backends, the service can still be used afterwards, with a new thread pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = self._new_executor()
+        self.service.close()
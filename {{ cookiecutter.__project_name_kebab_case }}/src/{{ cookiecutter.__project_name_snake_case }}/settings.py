@@ -1,19 +1,86 @@
-"""{{ cookiecutter.project_name }} settings."""
+"""{{ cookiecutter.project_name }} settings.
 
+The settings are read once, into the `settings` instance that the other modules import. They can
+be read again from the environment and the .env file with `settings.reload()`, which updates the
+instance in place, all fields at once, so that the modules see the new values without being
+restarted. Components that hold values derived from the settings subscribe to the changes with
+`settings.subscribe()`.
+"""
+
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any{% if cookiecutter.with_fastapi_api|int %}, Literal{% endif %}
+
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+SettingsChanges = Mapping[str, tuple[Any, Any]]
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables and .env file."""
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    _reload_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _subscribers: list[Callable[[SettingsChanges], None]] = PrivateAttr(default_factory=list)
+
     app_name: str = "{{ cookiecutter.project_name }}"
     log_level: str = "INFO"
     debug: bool = False
 {%- if cookiecutter.with_fastapi_api|int %}
     api_host: str = "0.0.0.0"  # noqa: S104
     api_port: int = 8000
+    api_workers: int | Literal["auto"] = "auto"
+    api_worker_memory_mb: int = 256
+    api_threads: int = 40
+    api_timeout: int = 30
+    api_graceful_timeout: int = 10
+    api_keep_alive: int = 10
+    api_max_requests: int = 0
+    api_max_requests_jitter: int = 0
+    api_backlog: int = 2048
+    log_json: bool = False
+    api_fast_json: bool = False
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_level: int = 6
+    items_page_size: int = 100
+    items_max_page_size: int = 1000
+    items_batch_max_size: int = 1000
+    items_json_cache_size: int = 100_000
+    items_shared_cache_path: str = ""
+    items_shared_cache_slots: int = 65_536
+    items_shared_cache_slot_size: int = 512
+    idempotency_cache_size: int = 10_000
+    idempotency_ttl: float = 86_400.0
+    items_write_batch_window: float = 0.0
+    items_write_batch_size: int = 100
+    storage_backend: Literal["memory", "columnar", "sqlite"] = "memory"
+    sqlite_path: str = "data/items.db"
+    sqlite_pool_size: int = 4
+    storage_threads: int = 4
+    persistence_dir: str = ""
+    persistence_fsync: bool = True
+    persistence_snapshot_every: int = 100_000
+    metrics_enabled: bool = True
+    metrics_multiprocess_dir: str = ""
+    health_check_ttl: float = 5.0
+    health_check_timeout: float = 2.0
+    admin_token: str = ""
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "reports/profiles"
+    admission_read_concurrency: int = 64
+    admission_read_queue: int = 256
+    admission_read_rate: float = 0.0
+    admission_read_burst: int = 100
+    admission_write_concurrency: int = 16
+    admission_write_queue: int = 64
+    admission_write_rate: float = 0.0
+    admission_write_burst: int = 20
+    admission_queue_timeout: float = 2.0
 {%- endif %}
 {%- if cookiecutter.with_sentry|int %}
     sentry_dsn: str = ""
@@ -21,5 +88,45 @@ class Settings(BaseSettings):
     sentry_traces_sample_rate: float = 0.1
 {%- endif %}
 
+    def subscribe(self, callback: Callable[[SettingsChanges], None]) -> None:
+        """Call `callback` with the changed fields, and their old and new values, after reloads."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[SettingsChanges], None]) -> None:
+        """Stop calling `callback` after reloads."""
+        self._subscribers.remove(callback)
+
+    def reload(self) -> SettingsChanges:
+        """Read the settings again, apply them at once, and notify the subscribers of the changes.
+
+        The new settings are validated before any of them is applied, so invalid values leave the
+        current settings untouched. The fields are then replaced with a single update of the
+        instance's dictionary, which other threads cannot observe half done. When a subscriber
+        raises an exception, the other subscribers are still notified, then the first exception
+        is raised again.
+
+        Returns:
+            The changed fields, with their old and new values.
+        """
+        reloaded = type(self)()
+        with self._reload_lock:
+            changes = {
+                name: (getattr(self, name), getattr(reloaded, name))
+                for name in type(self).model_fields
+                if getattr(self, name) != getattr(reloaded, name)
+            }
+            self.__dict__.update(reloaded.__dict__)
+            subscribers = list(self._subscribers)
+        errors = []
+        if changes:
+            for callback in subscribers:
+                try:
+                    callback(changes)
+                except Exception as exc:  # noqa: BLE001
+                    errors.append(exc)
+        if errors:
+            raise errors[0]
+        return changes
+
 
 settings = Settings()
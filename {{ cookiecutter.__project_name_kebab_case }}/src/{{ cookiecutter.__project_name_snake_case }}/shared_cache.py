@@ -0,0 +1,186 @@
+"""{{ cookiecutter.project_name }} cache of serialized items shared by the API workers.
+
+gunicorn serves the API from several worker processes, each with its own `ItemService`. A cache
+in the memory of each worker holds the popular items once per worker, and an item read by one
+worker is still a miss in the others. This cache lives in a memory-mapped file instead, by
+default in /dev/shm, whose pages all the workers share: it takes the same memory whatever the
+number of workers, and an item read by any worker is a hit in all of them.
+
+The file is a fixed-size hash table: a header, then `slots` slots of `slot_size` bytes, each
+holding at most one item, its version and its JSON serialization. An item goes into the slot
+given by its id, replacing the item held there, so the cache needs neither an allocator nor an
+eviction policy, and reading an item costs one lookup.
+
+Readers take no lock. Each slot starts with a sequence number, which writers make odd while they
+write the slot and even again once done: a reader that sees an odd or changed number, or content
+that does not match its checksum, treats the slot as a miss. Writers of the same slot exclude
+each other with a lock on a byte of the file (`fcntl.lockf`), one per stripe of slots.
+
+A write to the store invalidates the slots of the items written. Reading an item from the store
+and caching it are not atomic, so a reader first takes a ticket, the sequence number of the slot:
+the item is only cached if the slot was not written since, which an invalidation would have done.
+
+Items are keyed by the epoch of their store as well as their id, so that workers with separate
+in-memory stores, or a new store after a restart, never read each other's items.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from functools import cache
+from pathlib import Path
+
+
+# File layout: a header holding the layout, padded to _HEADER_SIZE bytes, then the slots. Each
+# slot holds its sequence number, the store tag, item id, version, length and CRC-32 of the
+# content, then the content.
+_MAGIC = b"ITEMCAC1"
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<QQqQII")
+_SEQUENCE = struct.Struct("<Q")
+# Writers lock byte 0 of the file to create it, and byte 1 + the stripe of a slot to write it.
+_CREATE_LOCK = 0
+_STRIPES = 64
+
+
+@cache
+def store_tag(epoch: str) -> int:
+    """Return the 64-bit tag of the items of the store with an epoch, never 0."""
+    digest = hashlib.blake2b(epoch.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class SharedItemCache:
+    """A cache of serialized items in a memory-mapped file, shared by the processes mapping it.
+
+    Opening the file creates it if needed. Every process must open it with the same `slots` and
+    `slot_size`: opening it with another layout resets it, which is only safe while no other
+    process uses it, such as when the server starts.
+    """
+
+    def __init__(self, path: str | Path, slots: int = 65_536, slot_size: int = 512) -> None:
+        """Open the cache file, creating it with `slots` slots of `slot_size` bytes if needed."""
+        if slots < 1 or slot_size <= _SLOT.size:
+            message = f"The cache needs at least 1 slot of more than {_SLOT.size} bytes"
+            raise ValueError(message)
+        self.path = Path(path)
+        self.slots = slots
+        self.slot_size = slot_size
+        # Items serialized to more bytes than this are not cached.
+        self.max_size = slot_size - _SLOT.size
+        size = _HEADER_SIZE + slots * slot_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        header = _HEADER.pack(_MAGIC, slots, slot_size)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _CREATE_LOCK)
+        try:
+            if os.pread(self._fd, _HEADER.size, 0) != header:
+                # Truncating first zeroes the slots of an earlier layout.
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, header, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _CREATE_LOCK)
+        self._map = mmap.mmap(self._fd, size)
+        self._locks = [threading.Lock() for _ in range(_STRIPES)]
+
+    def _offset(self, tag: int, item_id: int) -> int:
+        """Return the offset of the slot of an item. Consecutive ids get consecutive slots."""
+        return _HEADER_SIZE + (tag + item_id) % self.slots * self.slot_size
+
+    def get(self, tag: int, item_id: int) -> tuple[int, bytes] | None:
+        """Return the version and JSON serialization of an item, or None if not cached."""
+        offset = self._offset(tag, item_id)
+        sequence, slot_tag, slot_id, version, length, crc = _SLOT.unpack_from(self._map, offset)
+        if sequence & 1 or slot_tag != tag or slot_id != item_id or length > self.max_size:
+            return None
+        start = offset + _SLOT.size
+        content = self._map[start : start + length]
+        # A writer that started meanwhile changed the sequence number, and possibly the content.
+        if self._sequence(offset) != sequence or zlib.crc32(content) != crc:
+            return None
+        return version, content
+
+    def ticket(self, tag: int, item_id: int) -> int:
+        """Return the sequence number of the slot of an item, to `put` it once read."""
+        return self._sequence(self._offset(tag, item_id))
+
+    def put(self, tag: int, item_id: int, version: int, content: bytes, ticket: int) -> bool:
+        """Cache an item read after taking a `ticket`, unless its slot was written since.
+
+        Returns:
+            Whether the item was cached.
+        """
+        if len(content) > self.max_size:
+            return False
+        offset = self._offset(tag, item_id)
+        with self._locked(offset):
+            sequence = self._sequence(offset)
+            if sequence != ticket:
+                return False
+            self._write(offset, sequence, tag, item_id, version, content)
+        return True
+
+    def invalidate(self, tag: int, item_ids: Iterable[int]) -> None:
+        """Drop items that were written from the cache, in all processes.
+
+        Their slots are written even when they hold other items, so that the items read before
+        the write are not cached afterwards.
+        """
+        offsets: dict[int, list[int]] = {}
+        for item_id in item_ids:
+            offset = self._offset(tag, item_id)
+            offsets.setdefault(self._stripe(offset), []).append(offset)
+        for group in offsets.values():
+            with self._locked(group[0]):
+                for offset in group:
+                    sequence = self._sequence(offset)
+                    self._write(offset, sequence, 0, 0, 0, b"")
+
+    def _sequence(self, offset: int) -> int:
+        sequence: int = _SEQUENCE.unpack_from(self._map, offset)[0]
+        return sequence
+
+    def _write(
+        self, offset: int, sequence: int, tag: int, item_id: int, version: int, content: bytes
+    ) -> None:
+        """Write a slot, holding its lock, with an odd sequence number until it is complete.
+
+        A slot left with an odd number by a writer that died skips to the next odd number.
+        """
+        writing = sequence + 1 + (sequence & 1)
+        _SEQUENCE.pack_into(self._map, offset, writing)
+        start = offset + _SLOT.size
+        self._map[start : start + len(content)] = content
+        crc = zlib.crc32(content)
+        _SLOT.pack_into(self._map, offset, writing, tag, item_id, version, len(content), crc)
+        _SEQUENCE.pack_into(self._map, offset, writing + 1)
+
+    def _stripe(self, offset: int) -> int:
+        return (offset - _HEADER_SIZE) // self.slot_size % _STRIPES
+
+    @contextmanager
+    def _locked(self, offset: int) -> Generator[None]:
+        """Hold the lock of the stripe of a slot, against the threads of all processes.
+
+        The `fcntl` locks of a process do not exclude its own threads, hence the thread locks.
+        """
+        stripe = self._stripe(offset)
+        with self._locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 1 + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 1 + stripe)
+
+    def close(self) -> None:
+        """Unmap the cache file, leaving it to the other processes."""
+        self._map.close()
+        os.close(self._fd)
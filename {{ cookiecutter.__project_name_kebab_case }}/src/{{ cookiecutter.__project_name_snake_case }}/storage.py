@@ -0,0 +1,641 @@
+"""{{ cookiecutter.project_name }} storage backends."""
+
+import math
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Generator, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from {{ cookiecutter.__project_name_snake_case }}.models import Item, ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings
+
+
+class ItemStore(Protocol):
+    """Storage backend behind the `ItemService`.
+
+    A store allocates item ids in increasing order and returns items ordered by id, which is what
+    makes `after` cursors work. It also keeps a version number, incremented by every write, and
+    records for each item the store version that last wrote it. Versions are only comparable
+    within a store, so each store also has a random epoch telling it apart from the others.
+
+    A store is `blocking` when its calls may wait for I/O, such as a database or a disk flush:
+    the `AsyncItemService` then runs them in a thread pool rather than on the event loop.
+    """
+
+    blocking: bool
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, allocating their ids as one contiguous block.
+
+        Adding no rows is not a write: it leaves the store version unchanged.
+        """
+        ...
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        ...
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, fixed for its lifetime."""
+        ...
+
+    def version(self) -> int:
+        """Return the current store version (0 for an empty store)."""
+        ...
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the store version that last wrote an item, or None if not found."""
+        ...
+
+    def scan(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the matching items with an id greater than `after`, ordered by id."""
+        ...
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+        ...
+
+
+@dataclass(frozen=True)
+class StoreSnapshot:
+    """The content of an in-memory store, one column per field, where item ids run from 1."""
+
+    epoch: str
+    version: int
+    names: Sequence[str]
+    descriptions: Sequence[str]
+    prices: Sequence[float]
+    item_versions: Sequence[int]
+
+
+# Number of entries per block of the price index.
+_PRICE_BLOCK_SIZE = 512
+# A price range matching at least 1/8 of the items is scanned through the id list.
+_DENSE_RANGE_FACTOR = 8
+_PRICE_RANGE_CACHE_SIZE = 64
+
+
+class _PriceIndex:
+    """Item ids ordered by (price, id), kept in blocks of bounded size.
+
+    An insert only shifts the values of one block, so building the index costs O(n log n) even
+    when prices arrive in random order, where a single sorted array would cost O(n²).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._prices: list[array[float]] = []
+        self._ids: list[array[int]] = []
+        # The last (largest) price of each block, to find a block with a binary search.
+        self._maxes: list[float] = []
+
+    def add(self, item_id: int, price: float) -> None:
+        """Add an item with an id greater than every id already indexed."""
+        if not self._prices:
+            self._prices.append(array("d", [price]))
+            self._ids.append(array("q", [item_id]))
+            self._maxes.append(price)
+            return
+        block = min(bisect_right(self._maxes, price), len(self._maxes) - 1)
+        prices, ids = self._prices[block], self._ids[block]
+        position = bisect_right(prices, price)
+        prices.insert(position, price)
+        ids.insert(position, item_id)
+        self._maxes[block] = prices[-1]
+        if len(prices) > 2 * _PRICE_BLOCK_SIZE:
+            self._prices[block + 1 : block + 1] = [prices[_PRICE_BLOCK_SIZE:]]
+            self._ids[block + 1 : block + 1] = [ids[_PRICE_BLOCK_SIZE:]]
+            self._maxes.insert(block + 1, prices[-1])
+            del prices[_PRICE_BLOCK_SIZE:], ids[_PRICE_BLOCK_SIZE:]
+            self._maxes[block] = prices[-1]
+
+    def load(self, prices: Sequence[float]) -> None:
+        """Index items with ids from 1 and the given prices, into an empty index.
+
+        Sorting once and cutting the result into blocks is several times faster than adding the
+        items one at a time.
+        """
+        # The sort is stable, so items with the same price stay ordered by id.
+        order = sorted(range(len(prices)), key=prices.__getitem__)
+        for start in range(0, len(order), _PRICE_BLOCK_SIZE):
+            positions = order[start : start + _PRICE_BLOCK_SIZE]
+            self._prices.append(array("d", [prices[position] for position in positions]))
+            self._ids.append(array("q", [position + 1 for position in positions]))
+            self._maxes.append(self._prices[-1][-1])
+
+    def count(self, low: float, high: float) -> int:
+        """Return the number of items priced between `low` and `high`, inclusive."""
+        return sum(stop - start for _, start, stop in self._ranges(low, high))
+
+    def ids(self, low: float, high: float) -> Sequence[int]:
+        """Return the ids of the items priced between `low` and `high`, inclusive, sorted."""
+        ids = array("q")
+        for block, start, stop in self._ranges(low, high):
+            ids.extend(self._ids[block][start:stop])
+        return array("q", sorted(ids))
+
+    def _ranges(self, low: float, high: float) -> Iterator[tuple[int, int, int]]:
+        """Yield the block index and the slice bounds of every block overlapping a range."""
+        for block in range(bisect_left(self._maxes, low), len(self._maxes)):
+            prices = self._prices[block]
+            if prices[0] > high:
+                break
+            yield block, bisect_left(prices, low), bisect_right(prices, high)
+
+
+class _SecondaryIndexes:
+    """Secondary indexes of an in-memory store: a hash index on name and a sorted one on price.
+
+    Ids are allocated in increasing order, so appending keeps every list of ids sorted and lets
+    cursors seek with a binary search instead of a scan.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty indexes."""
+        self._ids = array("q")
+        self._ids_by_name: dict[str, array[int]] = {}
+        self._prices = _PriceIndex()
+        # Sorted ids of recent price ranges, so that paging through a range sorts it only once.
+        self._ids_by_price_range: dict[tuple[float, float], Sequence[int]] = {}
+
+    def add(self, item_id: int, name: str, price: float) -> None:
+        """Add an item to the indexes."""
+        self._ids.append(item_id)
+        self._ids_by_name.setdefault(name, array("q")).append(item_id)
+        self._prices.add(item_id, price)
+        self._ids_by_price_range.clear()
+
+    def load(self, names: Sequence[str], prices: Sequence[float]) -> None:
+        """Index items with ids from 1 and the given names and prices, into empty indexes."""
+        self._ids = array("q", range(1, len(names) + 1))
+        for item_id, name in enumerate(names, start=1):
+            self._ids_by_name.setdefault(name, array("q")).append(item_id)
+        self._prices.load(prices)
+
+    def candidates(
+        self, name: str | None, min_price: float | None, max_price: float | None
+    ) -> Sequence[int]:
+        """Return the sorted ids of a superset of the items matching the filters.
+
+        The most selective index provides the candidates, so a filtered query never scans the
+        store. Unfiltered and name-filtered candidates are live views that grow with the store.
+        A price range matching a large share of the items is served by the id list instead of
+        sorting the range: a page then reads a bounded number of non-matching items.
+        """
+        if name is None and min_price is None and max_price is None:
+            return self._ids
+        name_ids = self._ids_by_name.get(name, array("q")) if name is not None else None
+        if min_price is None and max_price is None:
+            return name_ids or array("q")
+        low = -math.inf if min_price is None else min_price
+        high = math.inf if max_price is None else max_price
+        if (low, high) in self._ids_by_price_range:
+            return self._ids_by_price_range[low, high]
+        count = self._prices.count(low, high)
+        if name_ids is not None and len(name_ids) <= count:
+            return name_ids
+        if count * _DENSE_RANGE_FACTOR >= len(self._ids):
+            return self._ids
+        if len(self._ids_by_price_range) >= _PRICE_RANGE_CACHE_SIZE:
+            self._ids_by_price_range.clear()
+        ids = self._ids_by_price_range[low, high] = self._prices.ids(low, high)
+        return ids
+
+
+class MemoryItemStore:
+    """Item store keeping every item in a dict, private to the current process."""
+
+    blocking = False
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._items: dict[int, Item] = {}
+        self._item_versions: dict[int, int] = {}
+        self._indexes = _SecondaryIndexes()
+        self._next_id: int = 1
+        self._version: int = 0
+        self._epoch = uuid.uuid4().hex
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, allocating their ids as one contiguous block."""
+        if not rows:
+            return []
+        first_id = self._next_id
+        self._next_id += len(rows)
+        self._version += 1
+        items = [Item(id=first_id + i, **row.model_dump()) for i, row in enumerate(rows)]
+        for item in items:
+            self._items[item.id] = item
+            self._item_versions[item.id] = self._version
+            self._indexes.add(item.id, item.name, item.price)
+        return items
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        return self._items.get(item_id)
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, fixed for its lifetime."""
+        return self._epoch
+
+    def version(self) -> int:
+        """Return the current store version (0 for an empty store)."""
+        return self._version
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the store version that last wrote an item, or None if not found."""
+        return self._item_versions.get(item_id)
+
+    def scan(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the matching items with an id greater than `after`, ordered by id.
+
+        Items are looked up one at a time, so the store is never copied and items created while
+        iterating an unfiltered or name-filtered query are picked up.
+        """
+        ids = self._indexes.candidates(name, min_price, max_price)
+        low = -math.inf if min_price is None else min_price
+        high = math.inf if max_price is None else max_price
+        position = bisect_right(ids, after)
+        while position < len(ids):
+            item = self._items[ids[position]]
+            position += 1
+            if (name is None or item.name == name) and low <= item.price <= high:
+                yield item
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+
+    def snapshot(self) -> StoreSnapshot:
+        """Return the content of the store, as of the last write."""
+        items = list(self._items.values())
+        return StoreSnapshot(
+            epoch=self._epoch,
+            version=self._version,
+            names=[item.name for item in items],
+            descriptions=[item.description for item in items],
+            prices=array("d", [item.price for item in items]),
+            item_versions=array("q", [self._item_versions[item.id] for item in items]),
+        )
+
+    def restore(self, snapshot: StoreSnapshot) -> None:
+        """Load the content of a snapshot into the empty store."""
+        columns = zip(snapshot.names, snapshot.descriptions, snapshot.prices, strict=True)
+        self._items = {
+            item_id: Item(id=item_id, name=name, description=description, price=price)
+            for item_id, (name, description, price) in enumerate(columns, start=1)
+        }
+        self._item_versions = dict(enumerate(snapshot.item_versions, start=1))
+        self._indexes.load(snapshot.names, snapshot.prices)
+        self._next_id = len(snapshot.names) + 1
+        self._version = snapshot.version
+        self._epoch = snapshot.epoch
+
+
+class ColumnarItemStore:
+    """Compact item store keeping each field in a column, private to the current process.
+
+    Ids and prices live in typed arrays (8 bytes per value) and names and descriptions are
+    interned, so repeated strings are stored once. Items are only materialized as `Item` models
+    when they are read, which saves the per-instance overhead of the dict-based store.
+    """
+
+    blocking = False
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._prices = array("d")
+        self._names: list[str] = []
+        self._descriptions: list[str] = []
+        self._item_versions = array("q")
+        # Ids are allocated densely from 1, so an item's position in the columns is its id - 1.
+        self._indexes = _SecondaryIndexes()
+        self._version: int = 0
+        self._epoch = uuid.uuid4().hex
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, allocating their ids as one contiguous block."""
+        if not rows:
+            return []
+        first_id = len(self._prices) + 1
+        self._version += 1
+        for i, row in enumerate(rows):
+            name = sys.intern(row.name)
+            self._prices.append(row.price)
+            self._names.append(name)
+            self._descriptions.append(sys.intern(row.description))
+            self._item_versions.append(self._version)
+            self._indexes.add(first_id + i, name, row.price)
+        return [self._materialize(first_id - 1 + i) for i in range(len(rows))]
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        if not 0 < item_id <= len(self._prices):
+            return None
+        return self._materialize(item_id - 1)
+
+    def epoch(self) -> str:
+        """Return the random identifier of the store, fixed for its lifetime."""
+        return self._epoch
+
+    def version(self) -> int:
+        """Return the current store version (0 for an empty store)."""
+        return self._version
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the store version that last wrote an item, or None if not found."""
+        if not 0 < item_id <= len(self._item_versions):
+            return None
+        return self._item_versions[item_id - 1]
+
+    def scan(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the matching items with an id greater than `after`, ordered by id.
+
+        Filters are evaluated on the columns, so only the yielded items get materialized.
+        """
+        ids = self._indexes.candidates(name, min_price, max_price)
+        low = -math.inf if min_price is None else min_price
+        high = math.inf if max_price is None else max_price
+        position = bisect_right(ids, after)
+        while position < len(ids):
+            index = ids[position] - 1
+            position += 1
+            if (name is None or self._names[index] == name) and low <= self._prices[index] <= high:
+                yield self._materialize(index)
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+
+    def snapshot(self) -> StoreSnapshot:
+        """Return the content of the store, as of the last write."""
+        count = len(self._prices)
+        return StoreSnapshot(
+            epoch=self._epoch,
+            version=self._version,
+            names=self._names[:count],
+            descriptions=self._descriptions[:count],
+            prices=self._prices[:count],
+            item_versions=self._item_versions[:count],
+        )
+
+    def restore(self, snapshot: StoreSnapshot) -> None:
+        """Load the content of a snapshot into the empty store."""
+        self._names = [sys.intern(name) for name in snapshot.names]
+        self._descriptions = [sys.intern(description) for description in snapshot.descriptions]
+        self._prices = array("d", snapshot.prices)
+        self._item_versions = array("q", snapshot.item_versions)
+        self._indexes.load(self._names, self._prices)
+        self._version = snapshot.version
+        self._epoch = snapshot.epoch
+
+    def _materialize(self, index: int) -> Item:
+        """Build the item stored at a position."""
+        return Item(
+            id=index + 1,
+            name=self._names[index],
+            description=self._descriptions[index],
+            price=self._prices[index],
+        )
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price REAL NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_name ON items (name);
+CREATE INDEX IF NOT EXISTS items_price ON items (price);
+CREATE TABLE IF NOT EXISTS store (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL,
+    epoch TEXT NOT NULL
+);
+INSERT OR IGNORE INTO store (id, version, epoch) VALUES (1, 0, lower(hex(randomblob(16))));
+"""
+_COLUMNS = "id, name, description, price"
+_INSERT = "INSERT INTO items (id, name, description, price, version) VALUES (?, ?, ?, ?, ?)"
+_LAST_ID = "SELECT COALESCE(MAX(id), 0) FROM items"
+_BUMP_VERSION = "UPDATE store SET version = version + 1"
+_VERSION = "SELECT version FROM store"
+_EPOCH = "SELECT epoch FROM store"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM items WHERE id = ?"  # noqa: S608
+_SELECT_VERSION_BY_ID = "SELECT version FROM items WHERE id = ?"
+
+
+class SQLiteItemStore:
+    """Item store backed by a SQLite database in WAL mode, shared by all worker processes.
+
+    WAL mode lets readers proceed while a worker writes. Each worker process keeps its own pool
+    of connections, and every connection caches the prepared statements of the constant SQL
+    strings it executes. A call to `add` commits all of its rows in a single transaction.
+    """
+
+    SCAN_CHUNK_SIZE = 500
+    blocking = True
+
+    def __init__(self, path: str | Path, pool_size: int = 4, timeout: float = 5.0) -> None:
+        """Open (and create if needed) the database at `path`."""
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._reset_pool()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+            # The epoch is created with the database, so all the workers sharing it agree on it.
+            (epoch,) = connection.execute(_EPOCH).fetchone()
+        self._epoch = str(epoch)
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items in one transaction, allocating their ids as one contiguous block."""
+        if not rows:
+            return []
+        with self._connection() as connection:
+            # Take the write lock up front so that concurrent workers allocate disjoint id blocks.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                (last_id,) = connection.execute(_LAST_ID).fetchone()
+                connection.execute(_BUMP_VERSION)
+                (version,) = connection.execute(_VERSION).fetchone()
+                items = [
+                    Item(id=last_id + 1 + i, **row.model_dump()) for i, row in enumerate(rows)
+                ]
+                connection.executemany(
+                    _INSERT,
+                    [
+                        (item.id, item.name, item.description, item.price, version)
+                        for item in items
+                    ],
+                )
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+        return items
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, or None if not found."""
+        with self._connection() as connection:
+            row = connection.execute(_SELECT_BY_ID, (item_id,)).fetchone()
+        return None if row is None else _row_to_item(row)
+
+    def epoch(self) -> str:
+        """Return the random identifier of the database, fixed for its lifetime."""
+        return self._epoch
+
+    def version(self) -> int:
+        """Return the current store version (0 for an empty store)."""
+        with self._connection() as connection:
+            (version,) = connection.execute(_VERSION).fetchone()
+        return int(version)
+
+    def item_version(self, item_id: int) -> int | None:
+        """Return the store version that last wrote an item, or None if not found."""
+        with self._connection() as connection:
+            row = connection.execute(_SELECT_VERSION_BY_ID, (item_id,)).fetchone()
+        return None if row is None else int(row[0])
+
+    def scan(
+        self,
+        after: int = 0,
+        *,
+        name: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Iterator[Item]:
+        """Yield the matching items with an id greater than `after`, ordered by id.
+
+        Rows are fetched in keyset-paginated chunks, so a connection is only held while a chunk
+        is read and never for the lifetime of the iterator.
+        """
+        conditions = ["id > ?"]
+        params: list[str | float] = []
+        if name is not None:
+            conditions.append("name = ?")
+            params.append(name)
+        if min_price is not None:
+            conditions.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            conditions.append("price <= ?")
+            params.append(max_price)
+        # Only constant fragments are interpolated, values are always bound as parameters.
+        sql = (
+            f"SELECT {_COLUMNS} FROM items WHERE {' AND '.join(conditions)} "  # noqa: S608
+            f"ORDER BY id LIMIT {self.SCAN_CHUNK_SIZE}"
+        )
+        while True:
+            with self._connection() as connection:
+                rows = connection.execute(sql, (after, *params)).fetchall()
+            yield from map(_row_to_item, rows)
+            if len(rows) < self.SCAN_CHUNK_SIZE:
+                return
+            after = rows[-1][0]
+
+    def close(self) -> None:
+        """Close the connections of the current process."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._reset_pool()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection in autocommit mode, with transactions managed explicitly."""
+        connection = sqlite3.connect(
+            self._path, timeout=self._timeout, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode, NORMAL only syncs at checkpoints: commits stay durable across application
+        # crashes and the database cannot be corrupted by a power loss.
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reset_pool(self) -> None:
+        """Start a new, empty connection pool owned by the current process."""
+        self._pid = os.getpid()
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+
+    @contextmanager
+    def _connection(self) -> Generator[sqlite3.Connection]:
+        """Borrow a connection from the pool of the current process.
+
+        Yields:
+            A connection, returned to the pool on exit.
+        """
+        if os.getpid() != self._pid:
+            # Connections must not be shared with a forked worker: start a fresh pool instead.
+            self._reset_pool()
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self._pool_size
+                self._opened += can_open
+            connection = self._connect() if can_open else self._pool.get(timeout=self._timeout)
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+
+def _row_to_item(row: tuple[int, str, str, float]) -> Item:
+    """Build an item from a database row."""
+    item_id, name, description, price = row
+    return Item(id=item_id, name=name, description=description, price=price)
+
+
+def create_item_store(settings: Settings) -> ItemStore:
+    """Create the item store selected by the settings.
+
+    The memory and columnar stores are made durable when a persistence directory is set.
+    """
+    if settings.storage_backend == "sqlite":
+        return SQLiteItemStore(settings.sqlite_path, pool_size=settings.sqlite_pool_size)
+    store = ColumnarItemStore() if settings.storage_backend == "columnar" else MemoryItemStore()
+    if not settings.persistence_dir:
+        return store
+    # Imported here, since the persistence module builds on this one.
+    from {{ cookiecutter.__project_name_snake_case }}.persistence import DurableItemStore
+
+    return DurableItemStore(
+        store,
+        settings.persistence_dir,
+        sync=settings.persistence_fsync,
+        snapshot_every=settings.persistence_snapshot_every,
+    )
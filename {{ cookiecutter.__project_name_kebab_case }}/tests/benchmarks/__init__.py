@@ -0,0 +1 @@
+"""{{ cookiecutter.project_name }} benchmarks."""
@@ -0,0 +1,32 @@
+"""Shared fixtures for the benchmarks.
+
+Benchmarks are deselected by default. Run them with `pytest -m benchmark -s` to see the results.
+"""
+
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Mark every test in this directory as a benchmark."""
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(pytest.mark.benchmark)
+
+
+@pytest.fixture
+def silent_logger() -> Iterator[None]:
+    """Format log records as usual, but discard them instead of writing to stderr."""
+    logger.remove()
+    handler_id = logger.add(lambda _: None, level="INFO")
+    yield
+    logger.remove(handler_id)
+    logger.add(sys.stderr)
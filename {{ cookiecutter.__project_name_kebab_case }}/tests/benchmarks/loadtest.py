@@ -0,0 +1,247 @@
+"""Load test for the REST API.
+
+Sends concurrent requests to `/health`, `POST /items`, and `GET /items`, and reports the
+throughput and latency percentiles of each scenario. The API is driven either in-process through
+httpx's ASGI transport, which measures the application alone, or over HTTP against a gunicorn
+server started locally, which also measures the server and the network stack.
+
+Results can be saved as JSON and compared against a baseline saved earlier:
+
+    python -m tests.benchmarks.loadtest --output reports/baseline.json
+    python -m tests.benchmarks.loadtest --baseline reports/baseline.json --output reports/new.json
+
+The comparison exits with a non-zero status when a scenario regressed beyond the tolerance. The
+output cannot be the baseline itself, which would be replaced by every run it is compared with.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess  # noqa: S404
+import sys
+import time
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from {{ cookiecutter.__project_name_snake_case }}.api import app
+
+
+SEED_ITEMS = 1_000
+SERVER_START_TIMEOUT = 30.0
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A request sent repeatedly during a load test."""
+
+    name: str
+    method: str
+    path: str
+    body: Any = None
+
+
+SCENARIOS = (
+    Scenario("health", "GET", "/health"),
+    Scenario("create_item", "POST", "/items", {"name": "Widget", "price": 9.99}),
+    Scenario("list_items", "GET", "/items?limit=100"),
+)
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Throughput and latency percentiles, in milliseconds, of one scenario."""
+
+    requests: int
+    errors: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> ScenarioResult:
+    """Send `requests` requests with `concurrency` of them in flight at any time."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path, json=scenario.body)
+            latencies.append(time.perf_counter() - start)
+            errors += response.is_error
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        requests_per_second=requests / elapsed,
+        p50_ms=percentiles[49] * 1000,
+        p95_ms=percentiles[94] * 1000,
+        p99_ms=percentiles[98] * 1000,
+    )
+
+
+async def run_load_test(
+    client: httpx.AsyncClient, requests: int, concurrency: int
+) -> dict[str, ScenarioResult]:
+    """Seed the API with items, then run every scenario after a short warm-up."""
+    seed = [{"name": f"Seed {i}", "price": float(i % 500) + 1} for i in range(SEED_ITEMS)]
+    (await client.post("/items/batch", json=seed)).raise_for_status()
+    results = {}
+    for scenario in SCENARIOS:
+        await run_scenario(client, scenario, max(requests // 10, concurrency), concurrency)
+        results[scenario.name] = await run_scenario(client, scenario, requests, concurrency)
+    return results
+
+
+@contextmanager
+def gunicorn_server(workers: int) -> Generator[str]:
+    """Start the API with gunicorn on a free local port and stop it on exit.
+
+    Yields:
+        The base URL of the server, once it answers health checks.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(workers),
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+        "{{ cookiecutter.__project_name_snake_case }}.api:app",
+    ]
+    process = subprocess.Popen(  # noqa: S603
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
+            try:
+                httpx.get(f"{base_url}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    message = "gunicorn did not start"
+                    raise RuntimeError(message) from None
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def compare(
+    results: dict[str, ScenarioResult], baseline: dict[str, ScenarioResult], tolerance: float
+) -> list[str]:
+    """Return a description of every scenario whose throughput or p99 latency regressed."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result.requests_per_second < before.requests_per_second * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result.requests_per_second:,.0f} req/s"
+                f" (baseline {before.requests_per_second:,.0f} req/s)"
+            )
+        if result.p99_ms > before.p99_ms * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {result.p99_ms:.2f} ms (baseline {before.p99_ms:.2f} ms)"
+            )
+    return regressions
+
+
+def format_results(results: dict[str, ScenarioResult]) -> str:
+    """Format results as a table with one row per scenario."""
+    lines = [f"{'scenario':<12} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} errors"]
+    lines.extend(
+        f"{name:<12} {result.requests_per_second:>10,.0f} {result.p50_ms:>8.2f}"
+        f" {result.p95_ms:>8.2f} {result.p99_ms:>8.2f} {result.errors:>6}"
+        for name, result in results.items()
+    )
+    return "\n".join(lines)
+
+
+def load_results(path: Path) -> dict[str, ScenarioResult]:
+    """Load results saved with `--output`."""
+    scenarios = json.loads(path.read_text(encoding="utf-8"))["scenarios"]
+    return {name: ScenarioResult(**result) for name, result in scenarios.items()}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the load test from the command line and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["asgi", "gunicorn"], default="asgi")
+    parser.add_argument("--requests", type=int, default=2_000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--output", type=Path, help="save the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against these saved results")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression")
+    args = parser.parse_args(argv)
+    if args.output and args.baseline and args.output.resolve() == args.baseline.resolve():
+        parser.error("--output must differ from --baseline")
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    async def run(
+        base_url: str, transport: httpx.AsyncBaseTransport | None = None
+    ) -> dict[str, ScenarioResult]:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=base_url, transport=transport, limits=limits
+        ) as client:
+            return await run_load_test(client, args.requests, args.concurrency)
+
+    if args.target == "asgi":
+        # Request logs would be written to the terminal in between the results.
+        logger.disable("{{ cookiecutter.__project_name_snake_case }}")
+        try:
+            results = asyncio.run(run("http://testserver", httpx.ASGITransport(app=app)))
+        finally:
+            logger.enable("{{ cookiecutter.__project_name_snake_case }}")
+    else:
+        with gunicorn_server(args.workers) as base_url:
+            results = asyncio.run(run(base_url))
+
+    print(format_results(results))  # noqa: T201
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "scenarios": {name: asdict(result) for name, result in results.items()},
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")  # noqa: T201
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
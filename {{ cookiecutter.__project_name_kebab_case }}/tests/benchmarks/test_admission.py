@@ -0,0 +1,110 @@
+"""Benchmarks for the admission control under overload."""
+
+import asyncio
+import statistics
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from {{ cookiecutter.__project_name_snake_case }} import api
+from {{ cookiecutter.__project_name_snake_case }}.admission import AdmissionLimits
+from {{ cookiecutter.__project_name_snake_case }}.api import AdmissionMiddleware
+
+
+# A worker that serves CAPACITY requests at a time, in SERVICE_TIME seconds each (400 requests
+# per second), offered REQUESTS requests at ARRIVAL_RATE requests per second for a second.
+CAPACITY = 4
+SERVICE_TIME = 0.01
+ARRIVAL_RATE = 2_000
+REQUESTS = 2_000
+
+
+def slow_app() -> ASGIApp:
+    """Return an ASGI app that serves a limited number of requests at a time, slowly."""
+    capacity = asyncio.Semaphore(CAPACITY)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+        async with capacity:
+            await asyncio.sleep(SERVICE_TIME)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def request(asgi_app: ASGIApp) -> tuple[int, float]:
+    """Send a GET /items request to an ASGI app in-process.
+
+    Returns:
+        The status code and the latency of the response.
+    """
+    scope = {"type": "http", "method": "GET", "path": "/items", "headers": []}
+    status = 500
+
+    async def receive() -> Message:  # noqa: RUF029
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:  # noqa: RUF029
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    start = time.perf_counter()
+    await asgi_app(scope, receive, send)
+    return status, time.perf_counter() - start
+
+
+async def overload(asgi_app: ASGIApp) -> list[tuple[int, float]]:
+    """Send REQUESTS requests to an ASGI app at ARRIVAL_RATE, without waiting for the responses.
+
+    Returns:
+        The status code and latency of every response.
+    """
+    tasks = []
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        await asyncio.sleep(max(0.0, start + i / ARRIVAL_RATE - time.perf_counter()))
+        tasks.append(asyncio.create_task(request(asgi_app)))
+    return await asyncio.gather(*tasks)
+
+
+def summary(results: list[tuple[int, float]], status: int) -> str:
+    """Return the count and latency percentiles of the responses with a status code."""
+    latencies = sorted(latency for code, latency in results if code == status)
+    if not latencies:
+        return f"{status}: none"
+    p99 = latencies[int(len(latencies) * 0.99)]
+    return (
+        f"{status}: {len(latencies):5,} responses,"
+        f" p50 {statistics.median(latencies) * 1000:7.1f} ms, p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+def test_admission_under_overload(silent_logger: None) -> None:  # noqa: ARG001
+    """Compare the latencies of a load beyond capacity without and with admission control.
+
+    Without admission control, every request waits its turn, so the latency grows for as long
+    as the overload lasts. With it, the queue holds a few requests for a short time: the
+    admitted ones keep a bounded latency, and the others are rejected at once.
+    """
+    group = api.admission_groups["read"]
+    previous = group.limits
+    unlimited = AdmissionLimits(concurrency=0, queue_size=0, queue_timeout=1.0, rate=0, burst=1)
+    limited = AdmissionLimits(
+        concurrency=CAPACITY, queue_size=4 * CAPACITY, queue_timeout=0.05, rate=0, burst=1
+    )
+    try:
+        group.configure(unlimited)
+        without = asyncio.run(overload(AdmissionMiddleware(slow_app())))
+        group.configure(limited)
+        with_admission = asyncio.run(overload(AdmissionMiddleware(slow_app())))
+    finally:
+        group.configure(previous)
+    print(  # noqa: T201
+        f"\n{ARRIVAL_RATE:,} req/s to {CAPACITY} slots of {SERVICE_TIME * 1000:g} ms each:"
+        f"\n  without admission control: {summary(without, 200)}"
+        f"\n  with admission control:    {summary(with_admission, 200)}"
+        f"\n                             {summary(with_admission, 503)}"
+    )
+    assert all(status == 200 for status, _ in without)  # noqa: PLR2004
+    assert any(status == 503 for status, _ in with_admission)  # noqa: PLR2004
@@ -0,0 +1,53 @@
+"""Benchmarks for response compression."""
+
+import time
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.api import NDJSON_CHUNK_SIZE
+from {{ cookiecutter.__project_name_snake_case }}.compression import ENCODERS
+from {{ cookiecutter.__project_name_snake_case }}.models import Item
+
+
+PAGE_SIZE = 1_000
+ROUNDS = 20
+
+
+def page_body() -> bytes:
+    """Return the JSON body of a page of `PAGE_SIZE` items."""
+    items = [
+        Item(id=i, name=f"Item {i % 100}", description=f"Description {i}", price=i + 0.99)
+        for i in range(1, PAGE_SIZE + 1)
+    ]
+    return b"[" + b",".join(item.model_dump_json().encode() for item in items) + b"]"
+
+
+@pytest.mark.parametrize("encoding", list(ENCODERS))
+@pytest.mark.parametrize("level", [1, 6, 9])
+def test_compress_page(encoding: str, level: int) -> None:
+    """Report the size and cost of compressing a page at once and as a stream of NDJSON chunks."""
+    body = page_body()
+    chunk_size = len(body) * NDJSON_CHUNK_SIZE // PAGE_SIZE
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        encoder = ENCODERS[encoding](level)
+        whole = encoder.compress(body) + encoder.finish()
+    whole_seconds = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        encoder = ENCODERS[encoding](level)
+        streamed = b"".join(encoder.compress(chunk) + encoder.flush() for chunk in chunks)
+        streamed += encoder.finish()
+    streamed_seconds = (time.perf_counter() - start) / ROUNDS
+
+    print(  # noqa: T201
+        f"\n{encoding} level {level}, {len(body):,} bytes:"
+        f"\n  whole:    {len(whole):>9,} bytes ({len(body) / len(whole):4.1f}x)"
+        f" in {whole_seconds * 1000:6.2f} ms"
+        f"\n  streamed: {len(streamed):>9,} bytes ({len(body) / len(streamed):4.1f}x)"
+        f" in {streamed_seconds * 1000:6.2f} ms"
+    )
+    assert len(whole) < len(body)
@@ -0,0 +1,106 @@
+"""Benchmarks for the JSON response paths."""
+
+import asyncio
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from starlette.types import Message
+
+from {{ cookiecutter.__project_name_snake_case }}.api import app, get_item_service
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.services import AsyncItemService, ItemService
+from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+
+
+ITEMS = 10_000
+PAGE_SIZE = 1_000
+ROUNDS = 20
+
+Overrides = dict[Callable[..., Any], Callable[..., Any]]
+
+
+def make_service(json_cache_size: int) -> AsyncItemService:
+    """Return a service holding `ITEMS` items."""
+    service = ItemService(json_cache_size=json_cache_size)
+    service.create_many([ItemCreate(name=f"Item {i}", price=float(i) + 1) for i in range(ITEMS)])
+    return AsyncItemService(service)
+
+
+@pytest.fixture
+def overrides(silent_logger: None) -> Iterator[Overrides]:  # noqa: ARG001
+    """Provide the app's dependency overrides, cleared after the test.
+
+    Yields:
+        The overrides, empty at first.
+    """
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+
+
+async def get(query: str, accept: str) -> int:
+    """Call GET /items on the app in-process and return the size of the response body."""
+    scope = {
+        "type": "http",
+        # From spec 2.4, streaming responses do not wait for the client to disconnect.
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items",
+        "raw_path": b"/items",
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"testserver"), (b"accept", accept.encode())],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    size = 0
+
+    async def receive() -> Message:  # noqa: RUF029
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:  # noqa: RUF029
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+
+async def seconds_per_listing(media_type: str) -> float:
+    """Return the average time to read every item, one page at a time or as one stream."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if media_type == "application/json":
+            for after in range(0, ITEMS, PAGE_SIZE):
+                await get(f"after={after}&limit={PAGE_SIZE}", media_type)
+        else:
+            await get("", media_type)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+@pytest.mark.parametrize("media_type", ["application/json", "application/x-ndjson"])
+def test_fast_json_listing(
+    overrides: Overrides,
+    media_type: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Compare GET /items over 10k items with default and pre-serialized JSON responses."""
+    default_service = make_service(json_cache_size=0)
+    overrides[get_item_service] = lambda: default_service
+    default = asyncio.run(seconds_per_listing(media_type))
+
+    fast_service = make_service(json_cache_size=ITEMS)
+    overrides[get_item_service] = lambda: fast_service
+    monkeypatch.setattr(settings, "api_fast_json", True)
+    asyncio.run(seconds_per_listing(media_type))  # Fill the cache.
+    fast = asyncio.run(seconds_per_listing(media_type))
+    print(  # noqa: T201
+        f"\nGET /items ({media_type}), {ITEMS:,} items:"
+        f"\n  default:         {default * 1e3:8.2f} ms"
+        f"\n  pre-serialized:  {fast * 1e3:8.2f} ms ({default / fast:.1f}x)"
+    )
+    assert asyncio.run(get("", media_type)) > 0
@@ -0,0 +1,30 @@
+"""Benchmarks for the REST API under concurrent load."""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.loadtest import compare, load_results, main
+
+
+def test_load_test_in_process(tmp_path: Path) -> None:
+    """Run the load test against the in-process app and compare it with its own results."""
+    output = tmp_path / "loadtest.json"
+    assert main(["--requests", "500", "--concurrency", "16", "--output", str(output)]) == 0
+    results = load_results(output)
+    assert set(results) == {"health", "create_item", "list_items"}
+    assert all(result.errors == 0 for result in results.values())
+
+    slower = {name: replace(result, p99_ms=result.p99_ms * 2) for name, result in results.items()}
+    assert compare(slower, results, tolerance=0.5)
+    assert not compare(results, results, tolerance=0.5)
+
+
+def test_load_test_keeps_its_baseline(tmp_path: Path) -> None:
+    """The load test refuses to overwrite the baseline it compares against."""
+    baseline = tmp_path / "loadtest.json"
+    baseline.write_text('{"scenarios": {}}', encoding="utf-8")
+    with pytest.raises(SystemExit):
+        main(["--baseline", str(baseline), "--output", str(tmp_path / "." / "loadtest.json")])
+    assert baseline.read_text(encoding="utf-8") == '{"scenarios": {}}'
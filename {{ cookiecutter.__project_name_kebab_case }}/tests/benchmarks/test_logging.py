@@ -0,0 +1,58 @@
+"""Benchmarks for the logging setup."""
+
+import asyncio
+import time
+
+import pytest
+from loguru import logger
+
+from {{ cookiecutter.__project_name_snake_case }}.api import app
+from {{ cookiecutter.__project_name_snake_case }}.logs import BatchingSink
+
+from tests.benchmarks.test_middleware import requests_per_second
+
+
+REQUESTS = 2_000
+
+
+class SlowStream:
+    """A stream where every write blocks for a while, like stderr piped to a busy collector."""
+
+    def __init__(self, delay: float) -> None:
+        """Initialize the stream with the time each write blocks for."""
+        self.delay = delay
+
+    def write(self, message: str) -> None:  # noqa: ARG002
+        """Block, then discard the message."""
+        time.sleep(self.delay)
+
+    def flush(self) -> None:
+        """Do nothing; writes are not buffered."""
+
+    def isatty(self) -> bool:  # noqa: PLR6301
+        """Report that the stream is not a terminal."""
+        return False
+
+
+@pytest.mark.parametrize("delay", [0.0, 0.0002])
+def test_access_log_overhead(silent_logger: None, delay: float) -> None:  # noqa: ARG001
+    """Compare /health throughput when access logs are written inline or by a writer thread."""
+    discarded = asyncio.run(requests_per_second(app, "/health", REQUESTS))
+    slow_stream = SlowStream(delay)
+    sinks: list[tuple[str, SlowStream | BatchingSink]] = [
+        ("inline", slow_stream),
+        ("by a thread", BatchingSink(slow_stream)),  # type: ignore[arg-type]
+    ]
+    results = {}
+    for name, sink in sinks:
+        handler_id = logger.add(sink, level="INFO")
+        results[name] = asyncio.run(requests_per_second(app, "/health", REQUESTS))
+        logger.remove(handler_id)
+    print(f"\n/health, logs discarded:           {discarded:,.0f} req/s")  # noqa: T201
+    for name, rps in results.items():
+        print(  # noqa: T201
+            f"/health, logs written {name + ',':<12} {rps:,.0f} req/s"
+            f" ({(1 / rps - 1 / discarded) * 1e6:+.1f} us per request"
+            f" with {delay * 1e6:.0f} us writes)"
+        )
+    assert all(rps > 0 for rps in results.values())
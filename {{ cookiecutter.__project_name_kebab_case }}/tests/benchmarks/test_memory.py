@@ -0,0 +1,48 @@
+"""Memory benchmarks for the in-memory storage backends."""
+
+import gc
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.storage import ColumnarItemStore, ItemStore, MemoryItemStore
+
+
+ITEMS = 1_000_000
+BATCH_SIZE = 10_000
+
+
+@pytest.mark.parametrize("store_class", [MemoryItemStore, ColumnarItemStore])
+def test_store_memory(store_class: type[ItemStore]) -> None:
+    """Measure the memory held by a million items in each in-memory store, and its build time.
+
+    Prices are random, as in real data, so that the price index is not filled in order. The build
+    time includes the tracing overhead of `tracemalloc`, so only compare it between stores.
+    """
+    prices = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = store_class()
+    for first in range(0, ITEMS, BATCH_SIZE):
+        store.add([
+            ItemCreate(
+                name=f"Item {i % 1000}",
+                description=f"Batch {first}",
+                price=round(prices.uniform(1, 1000), 2),
+            )
+            for i in range(first, first + BATCH_SIZE)
+        ])
+    build = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(  # noqa: T201
+        f"\n{store_class.__name__} with {ITEMS:,} items:"
+        f" {current / 2**20:,.1f} MiB ({current / ITEMS:,.0f} bytes/item),"
+        f" peak {peak / 2**20:,.1f} MiB, built in {build:,.1f} s"
+    )
+    assert store.get(ITEMS) is not None
@@ -0,0 +1,108 @@
+"""Benchmarks for the API middleware."""
+
+import asyncio
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message
+
+from {{ cookiecutter.__project_name_snake_case }}.api import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestLoggingMiddleware,
+    app,
+)
+
+
+REQUESTS = 20_000
+
+
+async def requests_per_second(
+    asgi_app: ASGIApp,
+    path: str,
+    n: int = REQUESTS,
+    headers: list[tuple[bytes, bytes]] | None = None,
+) -> float:
+    """Call an ASGI app `n` times in-process and return the achieved requests per second."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), *(headers or [])],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> Message:  # noqa: RUF029
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await asgi_app(dict(scope), receive, send)
+    return n / (time.perf_counter() - start)
+
+
+def test_request_logging_overhead(silent_logger: None) -> None:  # noqa: ARG001
+    """Compare /health throughput with and without the request logging middleware."""
+    bare_app = FastAPI(routes=app.routes)
+    logged_app = FastAPI(routes=app.routes)
+    logged_app.add_middleware(RequestLoggingMiddleware)
+    without = asyncio.run(requests_per_second(bare_app, "/health"))
+    with_logging = asyncio.run(requests_per_second(logged_app, "/health"))
+    print(  # noqa: T201
+        f"\n/health without RequestLoggingMiddleware: {without:,.0f} req/s"
+        f"\n/health with RequestLoggingMiddleware:    {with_logging:,.0f} req/s"
+        f" ({(without / with_logging - 1) * 100:+.1f}% per-request cost)"
+    )
+    assert without > 0
+    assert with_logging > 0
+
+
+def test_metrics_overhead(silent_logger: None) -> None:  # noqa: ARG001
+    """Compare /health throughput with the logging middleware alone and with metrics added."""
+    logged_app = FastAPI(routes=app.routes)
+    logged_app.add_middleware(RequestLoggingMiddleware)
+    metered_app = FastAPI(routes=app.routes)
+    metered_app.add_middleware(RequestLoggingMiddleware)
+    metered_app.add_middleware(MetricsMiddleware)
+    without = asyncio.run(requests_per_second(logged_app, "/health"))
+    with_metrics = asyncio.run(requests_per_second(metered_app, "/health"))
+    print(  # noqa: T201
+        f"\n/health with logging only:        {without:,.0f} req/s"
+        f"\n/health with logging and metrics: {with_metrics:,.0f} req/s"
+        f" ({(without / with_metrics - 1) * 100:+.1f}% per-request cost)"
+    )
+    assert without > 0
+    assert with_metrics > 0
+
+
+def test_profiling_overhead(silent_logger: None, tmp_path: Path) -> None:  # noqa: ARG001
+    """Compare /health throughput without profiling, with idle profiling, and when profiled.
+
+    The profiling middleware is only added when profiling is enabled; when it is added but no
+    request is selected, it only looks for the `X-Profile` header and draws a random number.
+    """
+    logged_app = FastAPI(routes=app.routes)
+    logged_app.add_middleware(RequestLoggingMiddleware)
+    idle_app = ProfilingMiddleware(logged_app, directory=tmp_path)
+    without = asyncio.run(requests_per_second(logged_app, "/health"))
+    idle = asyncio.run(requests_per_second(idle_app, "/health"))
+    profiled = asyncio.run(
+        requests_per_second(idle_app, "/health", n=REQUESTS // 20, headers=[(b"x-profile", b"1")])
+    )
+    print(  # noqa: T201
+        f"\n/health without profiling:      {without:,.0f} req/s"
+        f"\n/health with idle profiling:    {idle:,.0f} req/s"
+        f"\n/health profiled every request: {profiled:,.0f} req/s"
+    )
+    assert idle > 0
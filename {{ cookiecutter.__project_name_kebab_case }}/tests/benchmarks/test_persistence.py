@@ -0,0 +1,94 @@
+"""Benchmarks for the persistence of the in-memory stores."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.persistence import DurableItemStore
+from {{ cookiecutter.__project_name_snake_case }}.storage import ColumnarItemStore, ItemStore, MemoryItemStore
+
+
+WRITES = 4_000
+WRITERS = 16
+RECOVERY_ITEMS = 1_000_000
+RECOVERY_BATCH_SIZE = 1_000
+
+
+def writes_per_second(store: ItemStore, writers: int) -> float:
+    """Write WRITES single items to a store from `writers` threads.
+
+    Returns:
+        The writes per second achieved.
+    """
+    row = ItemCreate(name="Widget", description="A widget", price=9.99)
+
+    def write(count: int) -> None:
+        for _ in range(count):
+            store.add([row])
+
+    threads = [threading.Thread(target=write, args=(WRITES // writers,)) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return WRITES / (time.perf_counter() - start)
+
+
+def test_write_throughput(tmp_path: Path) -> None:
+    """Compare single-item writes without persistence, logged without fsync, and with fsync.
+
+    With fsync, the writes of concurrent writers share the flushes (group commit), so their
+    throughput exceeds the one of a single writer, which waits for an fsync per write.
+    """
+    results = {"memory only": writes_per_second(MemoryItemStore(), 1)}
+    for sync in (False, True):
+        for writers in (1, WRITERS):
+            directory = tmp_path / f"{sync}-{writers}"
+            store = DurableItemStore(MemoryItemStore(), directory, sync=sync, snapshot_every=0)
+            label = f"{'fsync' if sync else 'no fsync'}, {writers} writer{'s' * (writers > 1)}"
+            results[label] = writes_per_second(store, writers)
+            store.close()
+    print(f"\nSingle-item writes ({WRITES:,}, in {tmp_path}):")  # noqa: T201
+    for label, rate in results.items():
+        print(f"  {label:<22} {rate:12,.0f} writes/s")  # noqa: T201
+    assert all(rate > 0 for rate in results.values())
+
+
+@pytest.mark.parametrize("backend", [MemoryItemStore, ColumnarItemStore])
+def test_recovery_time(tmp_path: Path, backend: type[MemoryItemStore | ColumnarItemStore]) -> None:
+    """Compare the startup time of a store of 1M items from the log alone and from a snapshot."""
+    store = DurableItemStore(backend(), tmp_path, sync=False, snapshot_every=0)
+    rows = [
+        ItemCreate(name=f"Item {i % 1000}", description="A widget", price=float(i % 5000) + 1)
+        for i in range(RECOVERY_BATCH_SIZE)
+    ]
+    for _ in range(RECOVERY_ITEMS // RECOVERY_BATCH_SIZE):
+        store.add(rows)
+    store.close()
+    log_size = sum(path.stat().st_size for path in tmp_path.glob("wal-*.log"))
+
+    start = time.perf_counter()
+    from_log = DurableItemStore(backend(), tmp_path, snapshot_every=0)
+    log_recovery = time.perf_counter() - start
+    start = time.perf_counter()
+    from_log.snapshot()
+    snapshot_time = time.perf_counter() - start
+    from_log.close()
+    snapshot_size = (tmp_path / "snapshot.bin").stat().st_size
+
+    start = time.perf_counter()
+    from_snapshot = DurableItemStore(backend(), tmp_path)
+    snapshot_recovery = time.perf_counter() - start
+    assert from_snapshot.get(RECOVERY_ITEMS) is not None
+    from_snapshot.close()
+    print(  # noqa: T201
+        f"\n{backend.__name__} with {RECOVERY_ITEMS:,} items:"
+        f"\n  recovery from the log:      {log_recovery:6.2f} s ({log_size / 2**20:,.0f} MiB)"
+        f"\n  saving a snapshot:          {snapshot_time:6.2f} s"
+        f"\n  recovery from the snapshot: {snapshot_recovery:6.2f} s"
+        f" ({snapshot_size / 2**20:,.0f} MiB)"
+    )
@@ -0,0 +1,117 @@
+"""Benchmarks for the full-text search."""
+
+import gc
+import itertools
+import random
+import statistics
+import string
+import time
+import tracemalloc
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.search import SearchIndex, tokenize
+from {{ cookiecutter.__project_name_snake_case }}.services import ItemService
+from {{ cookiecutter.__project_name_snake_case }}.storage import ColumnarItemStore
+
+
+ITEMS = 1_000_000
+BATCH_SIZE = 10_000
+VOCABULARY = 50_000
+QUERIES = 200
+LIMIT = 20
+
+
+def make_service() -> tuple[ItemService, list[str]]:
+    """Return a service over a columnar store of ITEMS items with text drawn from VOCABULARY words.
+
+    Word frequencies follow Zipf's law, as in natural language: a few words are in most items
+    and most words in a few.
+
+    Returns:
+        The service, and the words from the most to the least frequent.
+    """
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) + str(rank)
+        for rank in range(VOCABULARY)
+    ]
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY + 1)))
+    service = ItemService(ColumnarItemStore())
+    for _ in range(0, ITEMS, BATCH_SIZE):
+        drawn = rng.choices(words, cum_weights=cum_weights, k=10 * BATCH_SIZE)
+        service.create_many([
+            ItemCreate(
+                name=" ".join(drawn[i : i + 2]).title(),
+                description=" ".join(drawn[i + 2 : i + 10]),
+                price=1.0,
+            )
+            for i in range(0, len(drawn), 10)
+        ])
+    return service, words
+
+
+def latency(service: ItemService, query: str) -> float:
+    """Return the median duration of a search, in seconds."""
+    durations = []
+    for _ in range(QUERIES):
+        start = time.perf_counter()
+        service.search(query, LIMIT)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def scan(service: ItemService, query: str) -> list[int]:
+    """Search by tokenizing every item, as without an index.
+
+    Returns:
+        The ids of the first LIMIT items holding all the words of the query.
+    """
+    words = set(tokenize(query))
+    matches = []
+    for item in service.iter_items():
+        if words <= set(tokenize(f"{item.name} {item.description}")):
+            matches.append(item.id)
+            if len(matches) == LIMIT:
+                break
+    return matches
+
+
+def test_search_latency_and_index_size(silent_logger: None) -> None:  # noqa: ARG001
+    """Measure the build time and memory of the index, and the latency of typical queries.
+
+    The memory is measured by indexing the items again under `tracemalloc`, which slows the
+    indexing down, so the build time is measured without it first.
+    """
+    service, words = make_service()
+    start = time.perf_counter()
+    service.search("warm up", LIMIT)
+    build = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    index = SearchIndex()
+    index.add(service.iter_items())
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = {
+        "rare word": words[VOCABULARY // 10],
+        "two words": f"{words[10]} {words[100]}",
+        "common word": words[0],
+        "prefix": words[50][:3],
+    }
+    print(  # noqa: T201
+        f"\nSearch index over {ITEMS:,} items: built in {build:.1f} s,"
+        f" {size / 2**20:,.0f} MiB ({size / ITEMS:,.0f} bytes/item)"
+    )
+    for label, query in queries.items():
+        matches = len(index.search(query, ITEMS))
+        seconds = latency(service, query)
+        print(f"  {label:<12} {query!r:<20} {matches:9,} matches {seconds * 1e6:10,.0f} us")  # noqa: T201
+    start = time.perf_counter()
+    scanned = scan(service, queries["rare word"])
+    seconds = time.perf_counter() - start
+    print(f"  linear scan  {queries['rare word']!r:<20} {'':17} {seconds * 1e6:10,.0f} us")  # noqa: T201
+    assert scanned
+    assert set(scanned) <= set(index.search(queries["rare word"], ITEMS))
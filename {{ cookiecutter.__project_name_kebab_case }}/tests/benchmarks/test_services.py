@@ -0,0 +1,39 @@
+"""Benchmarks for the service layer."""
+
+import time
+from collections.abc import Callable
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.services import ItemService
+
+
+ITEMS = 100_000
+QUERIES = 200
+
+
+def seconds_per_call(func: Callable[[], object], n: int = QUERIES) -> float:
+    """Return the average wall-clock duration of `func` over `n` calls."""
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n
+
+
+def test_secondary_index_lookups() -> None:
+    """Compare indexed name and price lookups with a full scan of the store."""
+    service = ItemService()
+    for i in range(ITEMS):
+        service.create(ItemCreate(name=f"Item {i % 1000}", price=float(i % 5000) + 1))
+
+    by_name = seconds_per_call(lambda: service.list_page(name="Item 42"))
+    by_price = seconds_per_call(lambda: service.list_page(min_price=100, max_price=102))
+    scan = seconds_per_call(
+        lambda: [item for item in service.list_all() if item.name == "Item 42"], n=10
+    )
+    print(  # noqa: T201
+        f"\nLookups over {ITEMS:,} items:"
+        f"\n  name index:  {by_name * 1e6:10,.1f} us"
+        f"\n  price index: {by_price * 1e6:10,.1f} us"
+        f"\n  full scan:   {scan * 1e6:10,.1f} us"
+    )
+    assert len(service.list_page(name="Item 42")) == ITEMS // 1000
@@ -0,0 +1,120 @@
+"""Benchmarks for the cache of serialized items shared by the workers."""
+
+import itertools
+import multiprocessing
+import random
+import time
+from pathlib import Path
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.services import ItemService
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache
+from {{ cookiecutter.__project_name_snake_case }}.storage import SQLiteItemStore
+
+
+ITEMS = 100_000
+BATCH_SIZE = 10_000
+READS = 20_000
+# 16k slots of 512 bytes, 8 MiB, hold a fraction of the items.
+SLOTS = 16_384
+WORKERS = (1, 4, 8)
+# Item popularity follows Zipf's law: the item of rank r is read in proportion to 1/r.
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, ITEMS + 1)))
+
+
+def memory_kib() -> tuple[int, int]:
+    """Return the resident and proportional set sizes of the current process, in KiB.
+
+    The proportional set size (PSS) divides the pages shared by several processes between them,
+    so that the PSS of all the workers adds up to the memory they take together.
+
+    Returns:
+        The RSS and PSS of the process.
+    """
+    sizes = {}
+    for line in Path("/proc/self/smaps_rollup").read_text(encoding="utf-8").splitlines():
+        name, _, value = line.partition(":")
+        if name in {"Rss", "Pss"}:
+            sizes[name] = int(value.split()[0])
+    return sizes["Rss"], sizes["Pss"]
+
+
+def read_items(database: Path, cache_path: Path, seed: int) -> tuple[int, int, int]:
+    """Read READS popular items through a service, as a worker serving GET /items/{item_id}.
+
+    Returns:
+        The number of cache hits, and the RSS and PSS of the worker in KiB.
+    """
+    cache = SharedItemCache(cache_path, SLOTS)
+    service = ItemService(SQLiteItemStore(database), shared_cache=cache)
+    rng = random.Random(seed)
+    hits = 0
+    for item_id in rng.choices(range(1, ITEMS + 1), cum_weights=CUM_WEIGHTS, k=READS):
+        if service.cached_json(item_id) is None:
+            service.load_json(item_id)
+        else:
+            hits += 1
+    service.close()
+    cache.close()
+    return hits, *memory_kib()
+
+
+def run_workers(database: Path, cache_paths: list[Path]) -> tuple[float, int, int, float]:
+    """Run one worker process per cache path, all at once.
+
+    Returns:
+        The hit rate, the average RSS and the total PSS of the workers in KiB, and the reads per
+        second of all the workers.
+    """
+    context = multiprocessing.get_context("fork")
+    start = time.perf_counter()
+    with context.Pool(len(cache_paths)) as pool:
+        results = pool.starmap(
+            read_items, [(database, path, seed) for seed, path in enumerate(cache_paths)]
+        )
+    seconds = time.perf_counter() - start
+    reads = READS * len(cache_paths)
+    hits = sum(hits for hits, _, _ in results)
+    rss = sum(rss for _, rss, _ in results) // len(results)
+    pss = sum(pss for _, _, pss in results)
+    return hits / reads, rss, pss, reads / seconds
+
+
+def test_hit_rate_and_memory_by_workers(tmp_path: Path) -> None:
+    """Compare a cache per worker with one cache shared by all the workers, of the same size.
+
+    The items are in a SQLite database, which all the workers read, as with
+    `STORAGE_BACKEND=sqlite`. With a cache per worker, each worker warms its own cache, and the
+    memory of the caches grows with the number of workers. With a shared cache, an item read by
+    any worker is a hit in all of them, and the cache takes the same memory for any number of
+    workers.
+    """
+    database = tmp_path / "items.db"
+    store = SQLiteItemStore(database)
+    for first in range(0, ITEMS, BATCH_SIZE):
+        store.add([
+            ItemCreate(name=f"Item {i}", description="A popular widget", price=float(i % 500) + 1)
+            for i in range(first, first + BATCH_SIZE)
+        ])
+    store.close()
+
+    print(  # noqa: T201
+        f"\n{READS:,} reads per worker of {ITEMS:,} items, cache of {SLOTS:,} slots:"
+        f"\n  {'workers':>7} {'cache':<11} {'hit rate':>8} {'RSS/worker':>12}"
+        f" {'total PSS':>11} {'reads/s':>9}"
+    )
+    rates = {}
+    for workers in WORKERS:
+        for mode in ("per worker", "shared"):
+            directory = tmp_path / f"{mode.replace(' ', '-')}-{workers}"
+            paths = [
+                directory / (f"worker-{worker}.cache" if mode == "per worker" else "items.cache")
+                for worker in range(workers)
+            ]
+            rate, rss, pss, throughput = run_workers(database, paths)
+            rates[workers, mode] = rate
+            print(  # noqa: T201
+                f"  {workers:>7} {mode:<11} {rate:>8.1%} {rss / 1024:>8,.1f} MiB"
+                f" {pss / 1024:>7,.1f} MiB {throughput:>9,.0f}"
+            )
+    assert rates[WORKERS[-1], "shared"] > rates[WORKERS[-1], "per worker"]
@@ -0,0 +1,89 @@
+"""Benchmarks for the storage backends."""
+
+import itertools
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.storage import (
+    ColumnarItemStore,
+    ItemStore,
+    MemoryItemStore,
+    SQLiteItemStore,
+)
+
+
+ITEMS = 10_000
+BATCH_SIZE = 1_000
+PRICED_ITEMS = 200_000
+PAGES = 20
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_storage_backends(backend: str, tmp_path: Path) -> None:
+    """Compare single writes, batched writes, point reads, and scans across backends."""
+    store: ItemStore = (
+        MemoryItemStore() if backend == "memory" else SQLiteItemStore(tmp_path / "items.db")
+    )
+    rows = [ItemCreate(name=f"Item {i % 100}", price=float(i % 500) + 1) for i in range(ITEMS)]
+
+    start = time.perf_counter()
+    for row in rows:
+        store.add([row])
+    single = ITEMS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, ITEMS, BATCH_SIZE):
+        store.add(rows[i : i + BATCH_SIZE])
+    batched = ITEMS / (time.perf_counter() - start)
+
+    ids = random.sample(range(1, 2 * ITEMS + 1), ITEMS)
+    start = time.perf_counter()
+    for item_id in ids:
+        store.get(item_id)
+    reads = ITEMS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scanned = sum(1 for _ in store.scan())
+    scan = scanned / (time.perf_counter() - start)
+    store.close()
+
+    print(  # noqa: T201
+        f"\n{backend} backend ({ITEMS:,} items):"
+        f"\n  single writes:  {single:12,.0f} items/s"
+        f"\n  batched writes: {batched:12,.0f} items/s (batches of {BATCH_SIZE:,})"
+        f"\n  point reads:    {reads:12,.0f} items/s"
+        f"\n  full scan:      {scan:12,.0f} items/s"
+    )
+    assert scanned == 2 * ITEMS
+
+
+@pytest.mark.parametrize("backend", ["memory", "columnar"])
+def test_price_index_random_prices(backend: str) -> None:
+    """Time building the price index from random prices, then paging through price ranges."""
+    store: ItemStore = MemoryItemStore() if backend == "memory" else ColumnarItemStore()
+    rows = [ItemCreate(name="Item", price=random.uniform(1, 1_000)) for _ in range(PRICED_ITEMS)]
+
+    start = time.perf_counter()
+    for i in range(0, PRICED_ITEMS, BATCH_SIZE):
+        store.add(rows[i : i + BATCH_SIZE])
+    build = time.perf_counter() - start
+
+    timings = {}
+    for label, (low, high) in {"narrow": (100.0, 110.0), "wide": (100.0, 900.0)}.items():
+        start = time.perf_counter()
+        after = 0
+        for _ in range(PAGES):
+            page = list(itertools.islice(store.scan(after, min_price=low, max_price=high), 100))
+            after = page[-1].id
+        timings[label] = (time.perf_counter() - start) / PAGES
+
+    print(  # noqa: T201
+        f"\n{backend} price index ({PRICED_ITEMS:,} random prices):"
+        f"\n  build:       {build * 1000:10.1f} ms"
+        f"\n  narrow page: {timings['narrow'] * 1e6:10.1f} us"
+        f"\n  wide page:   {timings['wide'] * 1e6:10.1f} us"
+    )
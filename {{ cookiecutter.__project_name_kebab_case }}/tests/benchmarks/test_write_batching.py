@@ -0,0 +1,77 @@
+"""Benchmarks for the batching of concurrent creates."""
+
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.persistence import DurableItemStore
+from {{ cookiecutter.__project_name_snake_case }}.services import AsyncItemService, ItemService
+from {{ cookiecutter.__project_name_snake_case }}.storage import ItemStore, MemoryItemStore, SQLiteItemStore
+
+
+WRITERS = 200
+CREATES = 20
+BACKENDS = ("sqlite", "durable")
+WINDOWS = (0.0, 0.001, 0.005)
+BATCH_SIZE = 100
+
+
+def make_store(backend: str, directory: Path) -> ItemStore:
+    """Return an empty SQLite store, or durable in-memory store, in a directory."""
+    if backend == "sqlite":
+        return SQLiteItemStore(directory / "items.db")
+    return DurableItemStore(MemoryItemStore(), directory, snapshot_every=0)
+
+
+async def create_items(service: AsyncItemService) -> list[float]:
+    """Create CREATES items from each of WRITERS concurrent writers, as concurrent requests.
+
+    Returns:
+        The duration of each create, in seconds.
+    """
+    row = ItemCreate(name="Widget", description="A widget", price=9.99)
+    durations: list[float] = []
+
+    async def writer() -> None:
+        for _ in range(CREATES):
+            start = time.perf_counter()
+            await service.create(row)
+            durations.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(writer() for _ in range(WRITERS)))
+    return durations
+
+
+def test_create_throughput_by_batch_window(tmp_path: Path, silent_logger: None) -> None:  # noqa: ARG001
+    """Compare creates written one at a time with creates batched over windows of a few ms.
+
+    Each write to SQLite commits a transaction, and each write to a durable store waits for an
+    fsync of its log. Batching turns the creates of the concurrent writers into a few large
+    writes, which trade a little latency for many fewer commits.
+    """
+    print(  # noqa: T201
+        f"\n{WRITERS} concurrent writers, {CREATES} creates each, batches of up to {BATCH_SIZE}:"
+        f"\n  {'backend':<8} {'window':>7} {'creates/s':>10} {'p50':>9} {'p99':>9}"
+    )
+    rates = {}
+    for name in BACKENDS:
+        for window in WINDOWS:
+            directory = tmp_path / f"{name}-{window}"
+            directory.mkdir()
+            store = make_store(name, directory)
+            service = AsyncItemService(
+                ItemService(store), batch_window=window, batch_size=BATCH_SIZE
+            )
+            start = time.perf_counter()
+            durations = asyncio.run(create_items(service))
+            rates[name, window] = len(durations) / (time.perf_counter() - start)
+            assert len(service.service.list_all()) == WRITERS * CREATES
+            service.close()
+            p50, p99 = (statistics.quantiles(durations, n=100)[i] * 1e3 for i in (49, 98))
+            print(  # noqa: T201
+                f"  {name:<8} {window * 1e3:>4.0f} ms {rates[name, window]:>10,.0f}"
+                f" {p50:>6.1f} ms {p99:>6.1f} ms"
+            )
+    assert all(rates[name, WINDOWS[-1]] > rates[name, 0.0] for name in BACKENDS)
@@ -7,6 +7,26 @@ Feature: REST API
     Then the response status code should be 200
     And the response JSON should contain "status" = "ok"
 
+  Scenario: Liveness endpoint returns ok
+    Given the API test client
+    When I request GET /health/live
+    Then the response status code should be 200
+    And the response JSON should contain "status" = "ok"
+
+  Scenario: Readiness endpoint checks the storage backend
+    Given the API test client
+    When I request GET /health/ready
+    Then the response status code should be 200
+    And the response JSON should contain "status" = "ok"
+
+  Scenario: Settings reload requires the admin token
+    Given the API test client
+    And the admin token is "secret"
+    When I reload the settings with the token "wrong"
+    Then the response status code should be 401
+    When I reload the settings with the token "secret"
+    Then the response status code should be 200
+
   Scenario: Create an item
     Given the API test client
     When I create an item with name "Widget" and price 9.99
@@ -17,3 +37,46 @@ Feature: REST API
     Given the API test client
     When I request GET /items/999
     Then the response status code should be 404
+
+  Scenario: List items one page at a time
+    Given the API test client
+    When I request GET /items?limit=1
+    Then the response status code should be 200
+
+  Scenario: Report the invalid rows of a batch
+    Given the API test client
+    When I create a batch with an item named "Bulk" and an item without a name
+    Then the response status code should be 200
+    And the batch should have created 1 item and rejected 1
+
+  Scenario: Retry a create with an idempotency key
+    Given the API test client
+    When I create an item named "Once" twice with the idempotency key "retry-1"
+    Then the response status code should be 201
+    And the response header "Idempotent-Replayed" should be "true"
+
+  Scenario: Reject a batch above the maximum size
+    Given the API test client
+    And the maximum batch size is 2
+    When I create a batch of 3 items
+    Then the response status code should be 413
+
+  Scenario: Get an unchanged item with its ETag
+    Given the API test client
+    And an item named "Tagged" was created
+    When I request the item with its current ETag
+    Then the response status code should be 304
+
+  Scenario: List items again after a write
+    Given the API test client
+    And the ETag of the item list
+    When I create an item with name "Fresh" and price 1.0
+    And I request the item list with that ETag
+    Then the response status code should be 200
+
+  Scenario: Report request latency per route
+    Given the API test client
+    When I request GET /items/999
+    And I request GET /metrics
+    Then the response status code should be 200
+    And the response text should contain "http_requests_total{method="GET",route="/items/{item_id}",status="404"}"
@@ -14,10 +14,11 @@ Feature: CLI
     And the output should contain "app_name"
 {%- if cookiecutter.with_fastapi_api|int %}
 
-  Scenario: Health command executes
+  Scenario: Health command reports unreachable targets
     Given a CLI runner
-    When I run the health command
-    Then the exit code should be 0
+    When I run the health command against an unreachable target
+    Then the exit code should be 1
+    And the output should contain "2/2 (100%)"
 {%- endif %}
 
   Scenario: Verbose flag is accepted
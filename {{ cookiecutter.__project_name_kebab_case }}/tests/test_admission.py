@@ -0,0 +1,83 @@
+"""Tests for the admission control."""
+
+import asyncio
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.admission import (
+    AdmissionGroup,
+    AdmissionLimits,
+    ConcurrencyLimiter,
+    Rejection,
+    TokenBucket,
+)
+
+
+def test_token_bucket_allows_bursts_then_the_rate() -> None:
+    """A full bucket lets a burst through, then tells how long until the next token."""
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert 0 < bucket.take() <= 0.1  # noqa: PLR2004
+    unlimited = TokenBucket(rate=0, burst=1)
+    assert all(unlimited.take() == 0 for _ in range(100))
+
+
+def test_limiter_queues_then_rejects() -> None:
+    """Requests over the limit wait in the queue in order, and are rejected once it is full."""
+    limiter = ConcurrencyLimiter("test", limit=1, queue_size=1, queue_timeout=1.0)
+
+    async def scenario() -> None:
+        assert await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        assert limiter.full()
+        assert not await limiter.acquire()
+        limiter.release()
+        assert await queued
+        assert (limiter.active, limiter.waiting) == (1, 0)
+        limiter.release()
+
+    asyncio.run(scenario())
+    assert limiter.active == 0
+
+
+def test_limiter_queue_timeout_and_cancellation() -> None:
+    """Requests leave the queue when their wait times out or their task is cancelled."""
+    limiter = ConcurrencyLimiter("test", limit=1, queue_size=10, queue_timeout=0.05)
+
+    async def scenario() -> None:
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert (limiter.active, limiter.waiting) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_group_rejections_and_reconfiguration() -> None:
+    """A group rejects with 429 over the rate and 503 over capacity, and applies new limits."""
+    limits = AdmissionLimits(concurrency=1, queue_size=0, queue_timeout=1.0, rate=0, burst=1)
+    group = AdmissionGroup("test", limits)
+
+    async def scenario() -> None:
+        assert await group.admit() is None
+        assert await group.admit() == Rejection(503, "queue_full", 1)
+        group.configure(AdmissionLimits(**{**vars(limits), "queue_size": 5}))
+        queued = asyncio.create_task(group.admit())
+        await asyncio.sleep(0)
+        group.configure(AdmissionLimits(**{**vars(limits), "concurrency": 2}))
+        assert await queued is None
+        assert group.limiter.active == 2  # noqa: PLR2004
+        group.release()
+        group.release()
+        group.configure(AdmissionLimits(**{**vars(limits), "rate": 0.5}))
+        assert await group.admit() is None
+        assert await group.admit() == Rejection(429, "rate_limited", 2)
+
+    asyncio.run(scenario())
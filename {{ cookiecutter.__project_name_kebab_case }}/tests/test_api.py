@@ -1,11 +1,15 @@
 {%- if cookiecutter.with_pytest_bdd|int -%}
 {%- raw %}"""BDD step definitions for API tests."""{% endraw %}
 
+from typing import Any
+
+import pytest
 from fastapi.testclient import TestClient
 from httpx import Response
 from pytest_bdd import given, parsers, scenarios, then, when
 
 from {{ cookiecutter.__project_name_snake_case }}.api import app
+from {{ cookiecutter.__project_name_snake_case }}.settings import settings
 
 
 scenarios("api.feature")
@@ -45,14 +49,130 @@ def check_status_code(response: Response, code: int) -> None:
 def check_json_field(response: Response, key: str, value: str) -> None:
     """Verify a field in the response JSON."""
     assert response.json()[key] == value
+
+
+@given(parsers.cfparse("the maximum batch size is {size:d}"))
+def max_batch_size(monkeypatch: pytest.MonkeyPatch, size: int) -> None:
+    """Lower the maximum batch size for this scenario."""
+    monkeypatch.setattr(settings, "items_batch_max_size", size)
+
+
+@given(parsers.cfparse('the admin token is "{token}"'))
+def admin_token(monkeypatch: pytest.MonkeyPatch, token: str) -> None:
+    """Set the admin token for this scenario."""
+    monkeypatch.setenv("ADMIN_TOKEN", token)
+    monkeypatch.setattr(settings, "admin_token", token)
+
+
+@when(parsers.cfparse('I reload the settings with the token "{token}"'), target_fixture="response")
+def reload_settings(client: TestClient, token: str) -> Response:
+    """Send an authenticated settings reload request."""
+    return client.post("/admin/settings/reload", headers={"Authorization": f"Bearer {token}"})
+
+
+@given(parsers.cfparse('an item named "{name}" was created'), target_fixture="item")
+def created_item(client: TestClient, name: str) -> dict[str, Any]:
+    """Create an item and provide it."""
+    return client.post("/items", json={"name": name, "price": 1.0}).json()
+
+
+@given("the ETag of the item list", target_fixture="etag")
+def item_list_etag(client: TestClient) -> str:
+    """Provide the current ETag of the item list."""
+    return client.get("/items").headers["etag"]
+
+
+@when(
+    parsers.cfparse('I create a batch with an item named "{name}" and an item without a name'),
+    target_fixture="response",
+)
+def create_batch_with_invalid_row(client: TestClient, name: str) -> Response:
+    """Send a batch with one valid and one invalid row."""
+    return client.post("/items/batch", json=[{"name": name, "price": 1.0}, {"price": 1.0}])
+
+
+@when(
+    parsers.cfparse('I create an item named "{name}" twice with the idempotency key "{key}"'),
+    target_fixture="response",
+)
+def create_item_twice(client: TestClient, name: str, key: str) -> Response:
+    """Send the same create request twice with an idempotency key, and provide the second."""
+    body = {"name": name, "price": 1.0}
+    first = client.post("/items", json=body, headers={"Idempotency-Key": key})
+    retry = client.post("/items", json=body, headers={"Idempotency-Key": key})
+    assert retry.json() == first.json()
+    return retry
+
+
+@when(parsers.cfparse("I create a batch of {count:d} items"), target_fixture="response")
+def create_batch(client: TestClient, count: int) -> Response:
+    """Send a batch of valid rows."""
+    return client.post("/items/batch", json=[{"name": "Bulk", "price": 1.0}] * count)
+
+
+@when("I request the item with its current ETag", target_fixture="response")
+def request_item_with_etag(client: TestClient, item: dict[str, Any]) -> Response:
+    """Request an item with the ETag it currently has."""
+    etag = client.get(f"/items/{item['id']}").headers["etag"]
+    return client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+
+
+@when("I request the item list with that ETag", target_fixture="response")
+def request_item_list_with_etag(client: TestClient, etag: str) -> Response:
+    """Request the item list with an ETag obtained earlier."""
+    return client.get("/items", headers={"If-None-Match": etag})
+
+
+@then(parsers.cfparse("the batch should have created {created:d} item and rejected {rejected:d}"))
+def check_batch_result(response: Response, created: int, rejected: int) -> None:
+    """Verify the number of created and rejected rows of a batch."""
+    result = response.json()
+    assert len(result["created"]) == created
+    assert len(result["errors"]) == rejected
+
+
+@then(parsers.cfparse('the response header "{name}" should be "{value}"'))
+def check_header(response: Response, name: str, value: str) -> None:
+    """Verify a response header."""
+    assert response.headers[name] == value
+
+
+@then(parsers.cfparse('the response text should contain "{text}"'))
+def check_text(response: Response, text: str) -> None:
+    """Verify that the response body contains a text."""
+    assert text in response.text
 {%- else -%}
 """Tests for the REST API."""
 
+import asyncio
+import json
+import os
+import pstats
+import signal
+import time
+from collections.abc import AsyncIterator
 from http import HTTPStatus
+from pathlib import Path
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
+from loguru import logger
 
-from {{ cookiecutter.__project_name_snake_case }}.api import app
+from {{ cookiecutter.__project_name_snake_case }} import api
+from {{ cookiecutter.__project_name_snake_case }}.api import (
+    BATCH_MAX_ROW_BYTES,
+    ProfilingMiddleware,
+    app,
+    get_item_service,
+    lifespan,
+)
+from {{ cookiecutter.__project_name_snake_case }}.health import HealthChecks
+from {{ cookiecutter.__project_name_snake_case }}.models import Item, ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.services import AsyncItemService, ItemService
+from {{ cookiecutter.__project_name_snake_case }}.settings import settings
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache
+from {{ cookiecutter.__project_name_snake_case }}.storage import MemoryItemStore
 
 
 client = TestClient(app)
@@ -65,6 +185,169 @@ def test_health_endpoint() -> None:
     assert response.json()["status"] == "ok"
 
 
+def test_liveness_and_readiness_endpoints() -> None:
+    """Liveness checks nothing; readiness reports the checks, including the log writer's."""
+    assert client.get("/health/live").json() == {"status": "ok"}
+    with TestClient(app) as started:
+        response = started.get("/health/ready")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"status": "ok", "checks": {"storage": "ok", "log_writer": "ok"}}
+
+
+def test_admin_settings_reload(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The reload endpoint requires the admin token, and applies and names the changes."""
+    assert client.post("/admin/settings/reload").status_code == HTTPStatus.NOT_FOUND
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    settings.reload()
+    try:
+        headers = {"Authorization": "Bearer wrong"}
+        response = client.post("/admin/settings/reload", headers=headers)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        monkeypatch.setenv("HEALTH_CHECK_TTL", "42")
+        monkeypatch.setenv("ITEMS_MAX_PAGE_SIZE", "5000")
+        headers = {"Authorization": "Bearer secret"}
+        response = client.post("/admin/settings/reload", headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "changed": ["health_check_ttl", "items_max_page_size"],
+            "restart_required": ["items_max_page_size"],
+        }
+        assert api.health_checks.ttl == 42  # noqa: PLR2004
+        monkeypatch.setenv("ITEMS_PAGE_SIZE", "many")
+        response = client.post("/admin/settings/reload", headers=headers)
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert response.json()["detail"] == "Invalid settings: items_page_size"
+    finally:
+        monkeypatch.undo()
+        settings.reload()
+    assert api.health_checks.ttl == settings.health_check_ttl
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP is POSIX only")
+def test_sighup_reloads_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A SIGHUP received while the app runs reloads the settings."""
+
+    async def serve_and_signal() -> None:
+        async with lifespan(app):
+            os.kill(os.getpid(), signal.SIGHUP)
+            await asyncio.sleep(0.1)
+
+    monkeypatch.setenv("HEALTH_CHECK_TIMEOUT", "3.5")
+    try:
+        asyncio.run(serve_and_signal())
+        assert api.health_checks.timeout == pytest.approx(3.5)
+    finally:
+        monkeypatch.undo()
+        settings.reload()
+
+
+def test_profiling_middleware(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Requests with the X-Profile header, or drawn at the sample rate, are profiled to a file."""
+    profiled = TestClient(ProfilingMiddleware(app, directory=tmp_path))
+    assert "x-profile-file" not in profiled.get("/health").headers
+    response = profiled.get("/health", headers={"X-Profile": "1"})
+    assert response.status_code == HTTPStatus.OK
+    stats = pstats.Stats(str(tmp_path / response.headers["x-profile-file"]))
+    assert any(function == "health" for _, _, function in stats.stats)
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    assert "x-profile-file" not in profiled.get("/health", headers={"X-Profile": "1"}).headers
+    assert "x-profile-file" in profiled.get("/health", headers={"X-Profile": "secret"}).headers
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    assert "x-profile-file" in profiled.get("/health").headers
+    assert len(list(tmp_path.glob("*.prof"))) == 3  # noqa: PLR2004
+
+
+def test_admission_control_sheds_load(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Requests over the rate get 429 and over capacity 503, with Retry-After; health never."""
+    monkeypatch.setenv("ADMISSION_READ_RATE", "0.5")
+    monkeypatch.setenv("ADMISSION_READ_BURST", "1")
+    monkeypatch.setenv("ADMISSION_WRITE_CONCURRENCY", "1")
+    monkeypatch.setenv("ADMISSION_WRITE_QUEUE", "0")
+    settings.reload()
+    writes = api.admission_groups["write"]
+    try:
+        assert client.get("/items").status_code == HTTPStatus.OK
+        response = client.get("/items")
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert response.headers["retry-after"] == "2"
+        assert asyncio.run(writes.admit()) is None
+        response = client.post("/items", json={"name": "Widget", "price": 1.0})
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert response.headers["retry-after"] == "1"
+        assert client.get("/health").status_code == HTTPStatus.OK
+        writes.release()
+        response = client.post("/items", json={"name": "Widget", "price": 1.0})
+        assert response.status_code == HTTPStatus.CREATED
+        body = client.get("/metrics").text
+        assert 'admission_rejected_total{group="write",reason="queue_full"}' in body
+        assert 'admission_queue_depth{group="write"} 0.0' in body
+    finally:
+        monkeypatch.undo()
+        settings.reload()
+    assert writes.limiter.limit == settings.admission_write_concurrency
+
+
+def test_readiness_fails_when_a_check_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Readiness is 503 while any check fails, and reports why."""
+
+    def failing() -> None:
+        msg = "database is locked"
+        raise RuntimeError(msg)
+
+    checks = HealthChecks(ttl=0)
+    checks.register("storage", failing)
+    monkeypatch.setattr(api, "health_checks", checks)
+    response = client.get("/health/ready")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json() == {
+        "status": "unavailable",
+        "checks": {"storage": "RuntimeError: database is locked"},
+    }
+
+
+class SlowItemStore(MemoryItemStore):
+    """An in-memory store answering reads as slowly as an overloaded database."""
+
+    blocking = True
+    DELAY = 0.5
+
+    def get(self, item_id: int) -> Item | None:
+        """Return an item by id, after a delay."""
+        time.sleep(self.DELAY)
+        return super().get(item_id)
+
+
+def test_slow_storage_does_not_delay_other_requests() -> None:
+    """A slow storage call runs in a thread, so the event loop keeps answering /health."""
+    service = AsyncItemService(ItemService(SlowItemStore()))
+    app.dependency_overrides[get_item_service] = lambda: service
+
+    async def timed_requests() -> tuple[float, float]:
+        """Request an item, then /health while the item is read.
+
+        Returns:
+            The times from the first request until each response.
+        """
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            start = time.perf_counter()
+            slow = asyncio.create_task(http.get("/items/1"))
+            await asyncio.sleep(0.05)
+            await http.get("/health")
+            health = time.perf_counter() - start
+            await slow
+            return health, time.perf_counter() - start
+
+    try:
+        health, slow = asyncio.run(timed_requests())
+    finally:
+        app.dependency_overrides.clear()
+        service.close()
+    assert slow >= SlowItemStore.DELAY
+    assert health < SlowItemStore.DELAY / 2
+
+
 def test_create_item() -> None:
     """Create an item via POST."""
     response = client.post("/items", json={"name": "Widget", "price": 9.99})
@@ -72,8 +355,328 @@ def test_create_item() -> None:
     assert response.json()["name"] == "Widget"
 
 
+def test_create_item_with_idempotency_key() -> None:
+    """Retries with the same Idempotency-Key get the first response instead of a new item."""
+    headers = {"Idempotency-Key": "create-widget-1"}
+    body = {"name": "Widget", "price": 9.99}
+    first = client.post("/items", json=body, headers=headers)
+    retry = client.post("/items", json=body, headers=headers)
+    assert first.status_code == retry.status_code == HTTPStatus.CREATED
+    assert retry.json() == first.json()
+    assert "idempotent-replayed" not in first.headers
+    assert retry.headers["idempotent-replayed"] == "true"
+    conflict = client.post("/items", json={**body, "price": 1.0}, headers=headers)
+    assert conflict.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def write_batches() -> tuple[float, float]:
+    """Return the number of batches written by the write batcher, and of items in them."""
+    samples = dict(
+        line.split() for line in client.get("/metrics").text.splitlines() if line[0] != "#"
+    )
+    return (
+        float(samples.get("item_write_batch_size_count", 0)),
+        float(samples.get("item_write_batch_size_sum", 0)),
+    )
+
+
+def test_concurrent_creates_are_batched(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With a batch window, concurrent creates are written together, each with its own item."""
+    batches, batched = write_batches()
+    monkeypatch.setenv("ITEMS_WRITE_BATCH_WINDOW", "0.05")
+    settings.reload()
+
+    async def create_items() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            bodies = [{"name": f"Batched {i}", "price": 1.0} for i in range(5)]
+            return await asyncio.gather(*(http.post("/items", json=body) for body in bodies))
+
+    try:
+        responses = asyncio.run(create_items())
+    finally:
+        monkeypatch.undo()
+        settings.reload()
+    assert api.get_item_service().batcher.window == settings.items_write_batch_window
+    assert all(response.status_code == HTTPStatus.CREATED for response in responses)
+    items = [response.json() for response in responses]
+    assert all(client.get(f"/items/{item['id']}").json() == item for item in items)
+    assert sorted(item["name"] for item in items) == [f"Batched {i}" for i in range(5)]
+    assert write_batches() == (batches + 1, batched + 5)
+
+
 def test_get_nonexistent_item() -> None:
     """GET a non-existent item returns 404."""
     response = client.get("/items/999")
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_items_paginates_with_cursor() -> None:
+    """GET /items returns a page after the cursor and links to the next page."""
+    ids = [
+        client.post("/items", json={"name": f"Page {i}", "price": 1.0}).json()["id"]
+        for i in range(3)
+    ]
+    response = client.get("/items", params={"after": ids[0] - 1, "limit": 2})
+    assert response.status_code == HTTPStatus.OK
+    assert [item["id"] for item in response.json()] == ids[:2]
+    assert f"after={ids[1]}" in response.headers["link"]
+    assert 'rel="next"' in response.headers["link"]
+
+
+def test_list_items_streams_ndjson() -> None:
+    """GET /items streams newline-delimited JSON when the client asks for it."""
+    created = client.post("/items", json={"name": "Streamed", "price": 2.5}).json()
+    response = client.get(
+        "/items",
+        params={"after": created["id"] - 1},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert json.loads(lines[0]) == created
+
+
+def test_list_items_filters_by_name_and_price() -> None:
+    """GET /items filters on name and on an inclusive price range."""
+    cheap = client.post("/items", json={"name": "Filtered", "price": 1.0}).json()
+    client.post("/items", json={"name": "Filtered", "price": 50.0})
+    response = client.get("/items", params={"name": "Filtered", "max_price": 10})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [cheap]
+
+
+def test_search_items() -> None:
+    """GET /items/search returns the items matching all the words, the best matches first."""
+    in_description = client.post(
+        "/items", json={"name": "Kettle", "description": "Searchable teapot", "price": 1.0}
+    ).json()
+    in_name = client.post("/items", json={"name": "Searchable teapot", "price": 2.0}).json()
+    response = client.get("/items/search", params={"q": "searchable TEA"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [in_name, in_description]
+    assert client.get("/items/search", params={"q": "searchable", "limit": 1}).json() == [in_name]
+    assert client.get("/items/search").status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_create_items_batch_reports_row_errors() -> None:
+    """POST /items/batch creates the valid rows and reports the invalid ones."""
+    rows = [
+        {"name": "Bulk A", "price": 1.0},
+        {"name": "", "price": 1.0},
+        {"name": "Bulk B", "price": 2},
+    ]
+    response = client.post("/items/batch", json=rows)
+    assert response.status_code == HTTPStatus.OK
+    result = response.json()
+    assert [item["name"] for item in result["created"]] == ["Bulk A", "Bulk B"]
+    assert result["created"][1]["id"] == result["created"][0]["id"] + 1
+    assert [(error["index"], error["loc"]) for error in result["errors"]] == [(1, ["name"])]
+
+
+def test_create_items_batch_accepts_ndjson() -> None:
+    """POST /items/batch accepts NDJSON and rejects malformed lines individually."""
+    body = '{"name": "Line A", "price": 1.0}\nnot json\n{"name": "Line B", "price": 2.0}\n'
+    response = client.post(
+        "/items/batch", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    result = response.json()
+    assert [item["name"] for item in result["created"]] == ["Line A", "Line B"]
+    assert [(error["index"], error["type"]) for error in result["errors"]] == [(1, "json_invalid")]
+
+
+def test_create_items_batch_enforces_max_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """POST /items/batch rejects batches above the configured maximum size."""
+    monkeypatch.setattr(settings, "items_batch_max_size", 2)
+    response = client.post("/items/batch", json=[{"name": "Big", "price": 1.0}] * 3)
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+def test_create_items_batch_rejects_large_bodies_early(monkeypatch: pytest.MonkeyPatch) -> None:
+    """POST /items/batch rejects oversized bodies from Content-Length or from the NDJSON rows."""
+    monkeypatch.setattr(settings, "items_batch_max_size", 2)
+    received: list[bytes] = []
+
+    async def ndjson_rows() -> AsyncIterator[bytes]:  # noqa: RUF029
+        for _ in range(10):
+            received.append(b'{"name": "Streamed", "price": 1.0}\n')
+            yield received[-1]
+
+    async def post_stream() -> httpx.Response:
+        # The ASGI transport pulls the body lazily, unlike the test client which buffers it.
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            headers = {"Content-Type": "application/x-ndjson"}
+            return await http.post("/items/batch", content=ndjson_rows(), headers=headers)
+
+    streamed = asyncio.run(post_stream())
+    assert streamed.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert len(received) == 3  # noqa: PLR2004
+    declared = client.post("/items/batch", content=b" " * 2 * BATCH_MAX_ROW_BYTES + b"[]")
+    assert declared.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert "bytes" in declared.json()["detail"]
+
+
+def test_create_items_batch_without_valid_rows_is_not_a_write() -> None:
+    """A batch whose rows are all rejected leaves the list ETag unchanged."""
+    etag = client.get("/items").headers["etag"]
+    response = client.post("/items/batch", json=[{"name": "", "price": 1.0}])
+    assert response.json()["created"] == []
+    assert client.get("/items").headers["etag"] == etag
+
+
+def test_get_item_supports_conditional_requests() -> None:
+    """GET /items/{item_id} answers a matching If-None-Match with 304."""
+    created = client.post("/items", json={"name": "Tagged", "price": 1.0}).json()
+    response = client.get(f"/items/{created['id']}")
+    etag = response.headers["etag"]
+    cached = client.get(f"/items/{created['id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.headers["etag"] == etag
+    assert not cached.content
+
+
+def test_list_items_etag_changes_on_write() -> None:
+    """GET /items returns 304 until an item is created."""
+    etag = client.get("/items").headers["etag"]
+    cached = client.get("/items", headers={"If-None-Match": etag})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    client.post("/items", json={"name": "Fresh", "price": 1.0})
+    response = client.get("/items", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
+
+
+def test_etags_differ_between_stores() -> None:
+    """Stores at the same version, such as a store recreated by a restart, get different ETags."""
+
+    def etags(service: AsyncItemService) -> tuple[str, str]:
+        app.dependency_overrides[get_item_service] = lambda: service
+        try:
+            created = client.post("/items", json={"name": "Restarted", "price": 1.0}).json()
+            return (
+                client.get("/items").headers["etag"],
+                client.get(f"/items/{created['id']}").headers["etag"],
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+    first, second = etags(AsyncItemService()), etags(AsyncItemService())
+    assert first[0] != second[0]
+    assert first[1] != second[1]
+
+
+def test_large_responses_are_compressed() -> None:
+    """Responses above the minimum size are gzipped and get a weak ETag that is still honored."""
+    for i in range(30):
+        client.post("/items", json={"name": f"Compressed {i}", "price": 1.0})
+    headers = {"Accept-Encoding": "gzip"}
+    response = client.get("/items", params={"limit": 30}, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 30  # noqa: PLR2004
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    cached = client.get("/items", params={"limit": 30}, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    health = client.get("/health", headers=headers)
+    assert "content-encoding" not in health.headers
+
+
+def test_ndjson_stream_is_compressed() -> None:
+    """Streamed NDJSON listings are compressed on the fly, without a Content-Length."""
+    for i in range(30):
+        client.post("/items", json={"name": f"Streamed {i}", "price": 1.0})
+    response = client.get(
+        "/items", headers={"Accept": "application/x-ndjson", "Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert all(json.loads(line)["id"] for line in response.text.splitlines())
+
+
+def test_request_logging_uses_route_template() -> None:
+    """Request log lines report the route template rather than the raw path."""
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, format="{message}")
+    try:
+        client.get("/items/999")
+    finally:
+        logger.remove(handler_id)
+    assert any(message.startswith("GET /items/{item_id} 404 ") for message in messages)
+
+
+def test_metrics_endpoint_reports_route_latency() -> None:
+    """The metrics endpoint reports request counts and latencies per route template."""
+    client.get("/items/999")
+    client.get("/no/such/path")
+    client.get("/items", headers={"Accept": "application/x-ndjson"})
+    response = client.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="404"}' in body
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"}' in body
+    assert "http_requests_in_flight 1.0" in body
+    assert 'item_service_operation_duration_seconds_count{operation="get"}' in body
+    assert 'item_service_operation_duration_seconds_count{operation="iter_items"}' in body
+
+
+def test_fast_json_responses_match_default_responses(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With `api_fast_json`, item routes return the same bodies and headers as by default."""
+    service = AsyncItemService(ItemService(json_cache_size=10))
+    app.dependency_overrides[get_item_service] = lambda: service
+    try:
+        created = client.post("/items", json={"name": "Fast", "price": 2.5})
+        item_id = created.json()["id"]
+        default_item = client.get(f"/items/{item_id}")
+        default_page = client.get("/items", params={"limit": 1})
+        monkeypatch.setattr(settings, "api_fast_json", True)
+        fast_item = client.get(f"/items/{item_id}")
+        cached_item = client.get(f"/items/{item_id}")
+        fast_page = client.get("/items", params={"limit": 1})
+        fast_created = client.post("/items", json={"name": "Fast", "price": 2.5})
+    finally:
+        app.dependency_overrides.clear()
+    assert fast_item.json() == default_item.json()
+    assert cached_item.content == fast_item.content
+    assert fast_item.headers["etag"] == default_item.headers["etag"]
+    assert fast_item.headers["content-type"] == "application/json"
+    assert fast_page.json() == default_page.json()
+    assert fast_page.headers["link"] == default_page.headers["link"]
+    assert fast_created.status_code == HTTPStatus.CREATED
+    assert fast_created.json() == {**created.json(), "id": fast_created.json()["id"]}
+
+
+def test_shared_cache_serves_items(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """With a shared cache, GET /items/{item_id} returns the same bodies and ETags as without."""
+    monkeypatch.setattr(settings, "api_fast_json", True)
+    store = MemoryItemStore()
+    created = ItemService(store).create(ItemCreate(name="Shared", price=1.0))
+    responses = []
+
+    def get_from_worker() -> None:
+        cache = SharedItemCache(tmp_path / "items.cache", slots=16)
+        service = AsyncItemService(ItemService(store, shared_cache=cache))
+        app.dependency_overrides[get_item_service] = lambda: service
+        try:
+            response = client.get(f"/items/{created.id}")
+            etag = response.headers["etag"]
+            cached = client.get(f"/items/{created.id}", headers={"If-None-Match": etag})
+            assert cached.status_code == HTTPStatus.NOT_MODIFIED
+            assert client.get("/items/404").status_code == HTTPStatus.NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
+        responses.append(response)
+
+    get_from_worker()
+    get_from_worker()
+    first, second = responses
+    assert first.json() == created.model_dump()
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
 {%- endif %}
@@ -29,10 +29,12 @@ def run_config(runner: CliRunner) -> Result:
 {%- if cookiecutter.with_fastapi_api|int %}
 
 
-@when("I run the health command", target_fixture="result")
-def run_health(runner: CliRunner) -> Result:
-    """Execute the health command."""
-    return runner.invoke(app, ["health"])
+@when("I run the health command against an unreachable target", target_fixture="result")
+def run_health_unreachable(runner: CliRunner) -> Result:
+    """Execute the health command against a port nothing listens on."""
+    return runner.invoke(
+        app, ["health", "http://127.0.0.1:9", "--count", "2", "--interval", "0", "--timeout", "1"]
+    )
 {%- endif %}
 
 
@@ -55,9 +57,22 @@ def check_output_contains(result: Result, text: str) -> None:
 {%- else -%}
 """Tests for the CLI."""
 
+{%- if cookiecutter.with_fastapi_api|int %}
+
+import asyncio
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from {{ cookiecutter.__project_name_snake_case }} import api
+from {{ cookiecutter.__project_name_snake_case }}.cli import ProbeStats, app, probe_targets
+{%- else %}
+
 from typer.testing import CliRunner
 
 from {{ cookiecutter.__project_name_snake_case }}.cli import app
+{%- endif %}
 
 
 runner = CliRunner()
@@ -83,6 +98,32 @@ def test_health_command() -> None:
     result = runner.invoke(app, ["health"])
     # Exit code 1 is expected when no server is running.
     assert result.exit_code in {0, 1}
+
+
+def test_health_command_reports_unreachable_targets() -> None:
+    """Health command fails when a probe fails, and reports the error rate of every target."""
+    result = runner.invoke(
+        app, ["health", "http://127.0.0.1:9", "--count", "2", "--interval", "0", "--timeout", "1"]
+    )
+    assert result.exit_code == 1
+    assert "2/2 (100%)" in result.stdout
+
+
+def test_probe_targets() -> None:
+    """Every target is probed `count` times, and non-200 answers count as errors."""
+    transport = httpx.ASGITransport(app=api.app)
+    urls = ["http://replica-1/health", "http://replica-2/health", "http://replica-1/missing"]
+    stats = asyncio.run(probe_targets(urls, count=3, transport=transport))
+    assert [len(target.latencies_ms) for target in stats.values()] == [3, 3, 0]
+    assert [target.errors for target in stats.values()] == [0, 0, 3]
+    assert stats[urls[2]].summary() is None
+
+
+def test_probe_stats_summary() -> None:
+    """The summary reports the min, average, 95th percentile and max latency."""
+    stats = ProbeStats(latencies_ms=[float(ms) for ms in range(1, 101)], errors=25)
+    assert stats.summary() == pytest.approx((1.0, 50.5, 95.05, 100.0))
+    assert stats.error_rate == pytest.approx(0.2)
 {%- endif %}
 
 
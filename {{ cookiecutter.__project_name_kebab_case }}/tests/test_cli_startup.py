@@ -0,0 +1,56 @@
+"""Start-up time budget of the CLI.
+
+The CLI module is imported in a fresh interpreter with `python -X importtime`, which reports the
+cumulative import time of every module on stderr. Raise the budget with the
+`CLI_IMPORT_BUDGET_MS` environment variable on slow machines.
+"""
+
+import os
+import subprocess  # noqa: S404
+import sys
+
+
+CLI_MODULE = "{{ cookiecutter.__project_name_snake_case }}.cli"
+CLI_IMPORT_BUDGET_MS = float(os.environ.get("CLI_IMPORT_BUDGET_MS", "200"))
+# Modules that only some commands need, and that must not be imported at start-up.
+LAZY_MODULES = (
+    "httpx",
+    "pydantic",
+    "rich.table",
+    "urllib.request",
+    "{{ cookiecutter.__project_name_snake_case }}.settings",
+)
+
+
+def import_cli() -> tuple[dict[str, float], set[str]]:
+    """Import the CLI in a new interpreter.
+
+    Returns:
+        The cumulative import time of every module, in milliseconds, and the modules loaded.
+    """
+    code = f"import sys, {CLI_MODULE}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    cumulative_ms = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                cumulative_ms[module.strip()] = int(cumulative) / 1000
+    return cumulative_ms, set(result.stdout.split())
+
+
+def test_cli_imports_within_budget() -> None:
+    """Importing the CLI takes less than the start-up budget."""
+    cumulative_ms, _ = import_cli()
+    assert cumulative_ms[CLI_MODULE] < CLI_IMPORT_BUDGET_MS
+
+
+def test_cli_imports_command_dependencies_lazily() -> None:
+    """The dependencies of individual commands are not imported with the CLI."""
+    _, modules = import_cli()
+    assert not modules.intersection(LAZY_MODULES)
@@ -0,0 +1,43 @@
+"""Tests for the response compression encoders."""
+
+import gzip
+import zlib
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.compression import ENCODERS, GzipEncoder, negotiate
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate", None),
+        ("", None),
+        ("*", next(iter(ENCODERS))),
+        ("*, gzip;q=0", next(iter(ENCODERS)) if len(ENCODERS) > 1 else None),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    """The accepted encoding with the highest quality wins, and q=0 refuses an encoding."""
+    assert negotiate(accept_encoding, ENCODERS) == expected
+
+
+def test_negotiate_prefers_server_order_on_ties() -> None:
+    """Encodings of equal quality are chosen in the order of preference of the server."""
+    assert negotiate("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate("gzip, zstd;q=0.9", ["zstd", "gzip"]) == "gzip"
+
+
+def test_gzip_flush_decodes_before_the_end() -> None:
+    """Every flush emits enough output to decode all the data compressed so far."""
+    encoder = GzipEncoder(6)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    first = encoder.compress(b'{"id": 1}\n') + encoder.flush()
+    assert decoder.decompress(first) == b'{"id": 1}\n'
+    second = encoder.compress(b'{"id": 2}\n') + encoder.finish()
+    assert decoder.decompress(second) == b'{"id": 2}\n'
+    assert gzip.decompress(first + second) == b'{"id": 1}\n{"id": 2}\n'
@@ -0,0 +1,125 @@
+"""Tests for the gunicorn configuration."""
+
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from gunicorn.arbiter import Arbiter
+from pytest_mock import MockerFixture
+
+from {{ cookiecutter.__project_name_snake_case }} import gunicorn_conf
+from {{ cookiecutter.__project_name_snake_case }}.gunicorn_conf import auto_workers, cpu_limit, memory_limit, resolve_workers
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings
+
+
+def write_files(root: Path, files: dict[str, str]) -> Path:
+    """Write files under a fake cgroup root.
+
+    Returns:
+        The root.
+    """
+    for name, content in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content + "\n", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize(
+    ("files", "expected"),
+    [
+        ({"cpu.max": "50000 100000"}, 0.5),
+        ({"cpu/cpu.cfs_quota_us": "25000", "cpu/cpu.cfs_period_us": "100000"}, 0.25),
+    ],
+)
+def test_cpu_limit_reads_the_cgroup_quota(
+    tmp_path: Path, files: dict[str, str], expected: float
+) -> None:
+    """The CPU quota of cgroup v2 and v1 limits the CPUs, even below one CPU."""
+    assert cpu_limit(write_files(tmp_path, files)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "files",
+    [{}, {"cpu.max": "max 100000"}, {"cpu/cpu.cfs_quota_us": "-1", "cpu/cpu.cfs_period_us": "1"}],
+)
+def test_cpu_limit_without_quota(tmp_path: Path, files: dict[str, str]) -> None:
+    """Without a quota, every CPU the process may run on counts."""
+    assert cpu_limit(write_files(tmp_path, files)) >= 1
+
+
+def test_memory_limit(tmp_path: Path) -> None:
+    """The memory limit is the cgroup limit or the memory available on the host, if lower."""
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal: 8388608 kB\nMemAvailable: 4194304 kB\n", encoding="utf-8")
+    cgroup_v2 = write_files(tmp_path / "v2", {"memory.max": str(2**30)})
+    cgroup_v1 = write_files(tmp_path / "v1", {"memory/memory.limit_in_bytes": str(2**63 - 4096)})
+    unlimited = write_files(tmp_path / "unlimited", {"memory.max": "max"})
+    assert memory_limit(cgroup_v2, meminfo) == 2**30
+    assert memory_limit(cgroup_v1, meminfo) == 4 * 2**30
+    assert memory_limit(unlimited, meminfo) == 4 * 2**30
+    assert memory_limit(unlimited, tmp_path / "missing") is None
+
+
+@pytest.mark.parametrize(
+    ("cpus", "memory", "expected"),
+    [(4, None, 4), (1.5, None, 2), (0.25, None, 1), (8, 3 * 2**28, 3), (8, 2**20, 1)],
+)
+def test_auto_workers(cpus: float, memory: int | None, expected: int) -> None:
+    """One worker per CPU, capped by memory at 256 MiB per worker, and at least one."""
+    assert auto_workers(cpus, memory, 2**28) == expected
+
+
+def test_resolve_workers() -> None:
+    """A fixed number of workers is used as is; `auto` sizes the workers to the resources."""
+    assert resolve_workers(Settings(api_workers=3)) == 3  # noqa: PLR2004
+    assert resolve_workers(Settings(api_workers="auto")) >= 1
+
+
+def test_server_removes_the_shared_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    """The shared item cache of an earlier run is removed when the server starts and stops."""
+    path = tmp_path / "items.cache"
+    monkeypatch.setattr(gunicorn_conf.settings, "items_shared_cache_path", str(path))
+    server = mocker.Mock(spec=Arbiter)
+    for hook in (gunicorn_conf.on_starting, gunicorn_conf.on_exit):
+        path.write_bytes(b"cached items")
+        hook(server)
+        assert not path.exists()
+    hook(server)
+
+
+def test_when_ready_logs_the_configuration(mocker: MockerFixture) -> None:
+    """The effective configuration is logged when the server is ready."""
+    cfg = SimpleNamespace(
+        workers=3,
+        timeout=30,
+        graceful_timeout=10,
+        keepalive=10,
+        max_requests=1000,
+        max_requests_jitter=50,
+        backlog=2048,
+    )
+    server = mocker.Mock(spec=Arbiter, cfg=cfg, log=mocker.Mock())
+    gunicorn_conf.when_ready(server)
+    message, *args = server.log.info.call_args.args
+    assert "workers=3" in message % tuple(args)
+    assert "max_requests=1000 max_requests_jitter=50" in message % tuple(args)
+
+
+def test_gunicorn_accepts_the_configuration() -> None:
+    """The configuration module and the app load in gunicorn."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            "python:{{ cookiecutter.__project_name_snake_case }}.gunicorn_conf",
+            "--check-config",
+            "{{ cookiecutter.__project_name_snake_case }}.api:app",
+        ],
+        check=True,
+    )
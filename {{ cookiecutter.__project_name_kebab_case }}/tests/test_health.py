@@ -0,0 +1,67 @@
+"""Tests for the readiness checks."""
+
+import asyncio
+import time
+
+from {{ cookiecutter.__project_name_snake_case }}.health import CheckResult, HealthChecks
+
+
+def test_results_are_cached_for_the_ttl() -> None:
+    """Checks run once per TTL, however often the results are asked for."""
+    calls = 0
+
+    def check() -> None:
+        nonlocal calls
+        calls += 1
+
+    checks = HealthChecks(ttl=60)
+    checks.register("storage", check)
+
+    async def run_three_times() -> None:
+        for _ in range(3):
+            assert await checks.run() == {"storage": CheckResult(ok=True)}
+
+    asyncio.run(run_three_times())
+    assert calls == 1
+    checks.register("other", check)
+    asyncio.run(checks.run())
+    assert calls == 3  # noqa: PLR2004
+
+
+def test_concurrent_runs_share_one_run() -> None:
+    """Probes that arrive while the checks run wait for that run instead of starting another."""
+    calls = 0
+
+    def slow_check() -> None:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+
+    checks = HealthChecks(ttl=0)
+    checks.register("slow", slow_check)
+
+    async def run_concurrently() -> list[dict[str, CheckResult]]:
+        return await asyncio.gather(*(checks.run() for _ in range(10)))
+
+    results = asyncio.run(run_concurrently())
+    assert calls == 1
+    assert all(result == {"slow": CheckResult(ok=True)} for result in results)
+
+
+def test_failures_and_timeouts_are_reported() -> None:
+    """A check fails when it raises or outlives the timeout, without failing the others."""
+
+    def failing() -> None:
+        msg = "no such table: items"
+        raise RuntimeError(msg)
+
+    checks = HealthChecks(ttl=0, timeout=0.05)
+    checks.register("ok", lambda: None)
+    checks.register("failing", failing)
+    checks.register("hanging", lambda: time.sleep(0.2))
+    results = asyncio.run(checks.run())
+    assert results == {
+        "ok": CheckResult(ok=True),
+        "failing": CheckResult(ok=False, detail="RuntimeError: no such table: items"),
+        "hanging": CheckResult(ok=False, detail="timed out after 0.05 s"),
+    }
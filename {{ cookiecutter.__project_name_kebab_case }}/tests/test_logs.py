@@ -0,0 +1,99 @@
+"""Tests for the logging setup."""
+
+import io
+import json
+import sys
+import threading
+
+from loguru import logger
+
+from {{ cookiecutter.__project_name_snake_case }}.logs import BatchingSink, configure_logging
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings
+
+
+def test_batching_sink_writes_every_message_in_order() -> None:
+    """Stopping the sink writes all queued messages, in order."""
+    stream = io.StringIO()
+    sink = BatchingSink(stream, max_batch_size=7)
+    for i in range(100):
+        sink.write(f"{i}\n")
+    sink.stop()
+    assert stream.getvalue().splitlines() == [str(i) for i in range(100)]
+
+
+class FailingStream(io.StringIO):
+    """A stream whose first write fails."""
+
+    def __init__(self) -> None:
+        """Initialize an empty stream."""
+        super().__init__()
+        self.failed = threading.Event()
+
+    def write(self, text: str) -> int:
+        """Fail on the first call, then write normally."""
+        if not self.failed.is_set():
+            self.failed.set()
+            message = "disk full"
+            raise OSError(message)
+        return super().write(text)
+
+
+class BlockingStream(io.StringIO):
+    """A stream whose writes wait until they are released."""
+
+    def __init__(self) -> None:
+        """Initialize an empty stream."""
+        super().__init__()
+        self.writing = threading.Event()
+        self.released = threading.Event()
+
+    def write(self, text: str) -> int:
+        """Wait for the release, then write."""
+        self.writing.set()
+        self.released.wait()
+        return super().write(text)
+
+
+def test_batching_sink_survives_write_errors() -> None:
+    """A failed write is reported without stopping the writer thread."""
+    stream = FailingStream()
+    sink = BatchingSink(stream)
+    sink.write("lost\n")
+    assert stream.failed.wait(timeout=5)
+    sink.write("kept\n")
+    sink.stop()
+    assert stream.getvalue() == "kept\n"
+
+
+def test_batching_sink_drops_and_counts_messages_when_full() -> None:
+    """Messages beyond the queue bound are dropped, and their number is logged."""
+    stream = BlockingStream()
+    sink = BatchingSink(stream, flush_interval=0, max_queue_size=3)
+    sink.write("first\n")
+    assert stream.writing.wait(timeout=5)
+    for i in range(5):
+        sink.write(f"{i}\n")
+    stream.released.set()
+    sink.stop()
+    assert sink.dropped == 2  # noqa: PLR2004
+    assert stream.getvalue().splitlines() == [
+        "first",
+        "0",
+        "1",
+        "2",
+        "2 log messages dropped: the log queue was full",
+    ]
+
+
+def test_configure_logging_writes_json_lines() -> None:
+    """With `log_json`, every record is written as one JSON object per line."""
+    stream = io.StringIO()
+    handler_id = configure_logging(Settings(log_json=True), stream)
+    try:
+        logger.info("Hello {name}", name="world")
+    finally:
+        logger.remove(handler_id)
+        logger.add(sys.stderr)
+    record = json.loads(stream.getvalue())["record"]
+    assert record["message"] == "Hello world"
+    assert record["level"]["name"] == "INFO"
@@ -0,0 +1,69 @@
+"""Tests for the metrics registry."""
+
+import multiprocessing
+from pathlib import Path
+
+from {{ cookiecutter.__project_name_snake_case }}.metrics import MetricsRegistry
+
+
+def test_render_counter_and_gauge() -> None:
+    """Counters and gauges are rendered with their labels in the Prometheus text format."""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    requests.inc(route="/items")
+    requests.inc(2, route="/items")
+    requests.inc(route='/a"b')
+    in_flight.inc()
+    in_flight.dec()
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 1.0',
+        'requests_total{route="/items"} 3.0',
+        "# HELP in_flight In flight.",
+        "# TYPE in_flight gauge",
+        "in_flight 0.0",
+    ]
+
+
+def test_render_histogram_buckets_are_cumulative() -> None:
+    """Histogram buckets count every observation less than or equal to their bound."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        latency.observe(value)
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2.0',
+        'latency_seconds_bucket{le="1.0"} 3.0',
+        'latency_seconds_bucket{le="+Inf"} 4.0',
+        "latency_seconds_sum 5.65",
+        "latency_seconds_count 4.0",
+    ]
+
+
+def _record_in_child(directory: Path) -> None:
+    registry = MetricsRegistry(directory)
+    registry.counter("requests_total", "Requests.").inc(2)
+    registry.gauge("in_flight", "In flight.").inc(5)
+
+
+def test_multiprocess_mode_merges_workers(tmp_path: Path) -> None:
+    """Counters are summed over all processes, gauges only over the processes still alive.
+
+    Files in the directory that were not written by a registry are ignored.
+    """
+    registry = MetricsRegistry(tmp_path)
+    requests = registry.counter("requests_total", "Requests.")
+    in_flight = registry.gauge("in_flight", "In flight.")
+    requests.inc()
+    in_flight.inc()
+    child = multiprocessing.get_context("fork").Process(target=_record_in_child, args=(tmp_path,))
+    child.start()
+    child.join()
+    assert len(list(tmp_path.glob("metrics-*.db"))) == 2  # noqa: PLR2004
+    (tmp_path / "unrelated.db").write_bytes(b"not metrics")
+    (tmp_path / "metrics-backup.db").write_bytes(b"not metrics")
+    lines = registry.render().splitlines()
+    assert "requests_total 3.0" in lines
+    assert "in_flight 1.0" in lines
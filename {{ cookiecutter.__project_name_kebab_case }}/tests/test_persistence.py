@@ -0,0 +1,108 @@
+"""Tests for the persistence of the in-memory stores."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.persistence import SNAPSHOT_FILE, DurableItemStore, SnapshotItemStore
+from {{ cookiecutter.__project_name_snake_case }}.storage import ColumnarItemStore, MemoryItemStore
+
+
+def rows(*names: str) -> list[ItemCreate]:
+    """Return rows to create items with the given names.
+
+    Returns:
+        One row per name.
+    """
+    return [ItemCreate(name=name, description=f"{name} é", price=1.5) for name in names]
+
+
+@pytest.mark.parametrize("backend", [MemoryItemStore, ColumnarItemStore])
+def test_items_survive_a_restart(tmp_path: Path, backend: type[SnapshotItemStore]) -> None:
+    """Items, versions and the epoch are restored from the snapshot and the log."""
+    store = DurableItemStore(backend(), tmp_path, snapshot_every=0)
+    store.add(rows("a", "b"))
+    store.snapshot()
+    store.add(rows("c"))
+    store.add(rows("d", "e"))
+    epoch = store.epoch()
+    store.close()
+
+    restored = DurableItemStore(backend(), tmp_path)
+    assert [item.name for item in restored.scan()] == ["a", "b", "c", "d", "e"]
+    assert restored.get(3) == store.get(3)
+    assert (restored.version(), restored.item_version(4), restored.epoch()) == (3, 3, epoch)
+    assert [item.name for item in restored.scan(name="d")] == ["d"]
+    assert restored.add(rows("f"))[0].id == 6  # noqa: PLR2004
+    restored.close()
+
+
+def test_snapshots_replace_the_log(tmp_path: Path) -> None:
+    """A snapshot is saved every `snapshot_every` writes, and the log it covers is deleted."""
+    store = DurableItemStore(MemoryItemStore(), tmp_path, snapshot_every=3)
+    for name in "abcdefg":
+        store.add(rows(name))
+    store.close()
+    assert (tmp_path / SNAPSHOT_FILE).exists()
+    assert len(list(tmp_path.glob("wal-*.log"))) == 1
+    restored = DurableItemStore(MemoryItemStore(), tmp_path)
+    assert restored.version() == 7  # noqa: PLR2004
+    restored.close()
+
+
+def test_an_incomplete_record_is_discarded(tmp_path: Path) -> None:
+    """A record torn by a crash is dropped on recovery, and the log goes on after it."""
+    store = DurableItemStore(MemoryItemStore(), tmp_path, snapshot_every=0)
+    store.add(rows("a"))
+    store.close()
+    (segment,) = tmp_path.glob("wal-*.log")
+    size = segment.stat().st_size
+    with segment.open("ab") as file:
+        file.write(b"\x40\x00\x00\x00torn")
+    restored = DurableItemStore(MemoryItemStore(), tmp_path, snapshot_every=0)
+    assert segment.stat().st_size == size
+    restored.add(rows("b"))
+    restored.close()
+    again = DurableItemStore(MemoryItemStore(), tmp_path)
+    assert [item.name for item in again.scan()] == ["a", "b"]
+    again.close()
+
+
+def test_corrupt_snapshots_and_shared_directories_are_refused(tmp_path: Path) -> None:
+    """A corrupt snapshot fails the startup, and so does a directory used by another store."""
+    store = DurableItemStore(MemoryItemStore(), tmp_path)
+    with pytest.raises(RuntimeError, match="another process"):
+        DurableItemStore(MemoryItemStore(), tmp_path)
+    store.close()
+    snapshot = tmp_path / SNAPSHOT_FILE
+    snapshot.write_bytes(snapshot.read_bytes()[:-1] + b"!")
+    with pytest.raises(ValueError, match="corrupt"):
+        DurableItemStore(MemoryItemStore(), tmp_path)
+
+
+def test_concurrent_writes_share_fsyncs(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Writers that arrive during a flush are committed together by the next one."""
+    store = DurableItemStore(MemoryItemStore(), tmp_path, snapshot_every=0)
+    fsync = os.fsync
+
+    def slow_fsync(descriptor: int) -> None:
+        time.sleep(0.002)
+        fsync(descriptor)
+
+    spy = mocker.patch("os.fsync", side_effect=slow_fsync)
+    threads = [
+        threading.Thread(target=lambda: [store.add(rows("x")) for _ in range(20)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.version() == 160  # noqa: PLR2004
+    assert spy.call_count < 160  # noqa: PLR2004
+    store.close()
@@ -0,0 +1,58 @@
+"""Tests for the container health probe."""
+
+import subprocess  # noqa: S404
+import sys
+import threading
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }} import probe
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Answer `/ready` with a 200 status and any other path with a 503 status."""
+
+    def do_GET(self) -> None:
+        """Send the status of the requested path."""
+        status = HTTPStatus.OK if self.path == "/ready" else HTTPStatus.SERVICE_UNAVAILABLE
+        self.send_response(status)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    """Serve `StatusHandler` on a free local port.
+
+    Yields:
+        The base URL of the server.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_probe_checks_the_status(server_url: str) -> None:
+    """The probe succeeds on a 200 status only, and fails when nothing listens."""
+    assert probe.main([f"{server_url}/ready"]) == 0
+    assert probe.main([f"{server_url}/starting"]) == 1
+    assert probe.main(["http://127.0.0.1:9/ready"]) == 1
+
+
+def test_probe_runs_without_site_packages(server_url: str) -> None:
+    """The probe runs as a script in an isolated interpreter, as in the Docker HEALTHCHECK."""
+    command = [sys.executable, "-I", "-S", probe.__file__]
+    ready = subprocess.run([*command, f"{server_url}/ready"], check=False)  # noqa: S603
+    assert ready.returncode == 0
+    starting = subprocess.run([*command, f"{server_url}/starting"], check=False)  # noqa: S603
+    assert starting.returncode == 1
@@ -0,0 +1,85 @@
+"""Tests for the full-text search."""
+
+import random
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }} import search
+from {{ cookiecutter.__project_name_snake_case }}.models import Item
+from {{ cookiecutter.__project_name_snake_case }}.search import SearchIndex, tokenize
+
+
+def items(*texts: tuple[str, str]) -> list[Item]:
+    """Return items with ids from 1 and the given names and descriptions.
+
+    Returns:
+        One item per name and description.
+    """
+    return [
+        Item(id=i, name=name, description=description, price=1.0)
+        for i, (name, description) in enumerate(texts, start=1)
+    ]
+
+
+def test_tokenize_splits_and_folds_case() -> None:
+    """Words are split on punctuation and whitespace, and compared case-insensitively."""
+    assert tokenize("Blue-Widget, LARGE (v2) café") == ["blue", "widget", "large", "v2", "café"]
+    assert tokenize(" -- ") == []
+
+
+def test_search_matches_every_word_and_ranks_matches() -> None:
+    """Matches hold all the words; names rank above descriptions, and rare words above common."""
+    index = SearchIndex()
+    index.add(
+        items(
+            ("Gadget", "A blue widget"),
+            ("Blue widget", "The original"),
+            ("Red widget", "Not blue"),
+            ("Widget stand", "Holds a widget"),
+        )
+    )
+    assert index.search("blue widget", limit=10) == [2, 3, 1]
+    assert index.search("WIDGET", limit=2) == [2, 3]
+    assert index.search("blue gizmo", limit=10) == []
+    assert index.search("?!", limit=10) == []
+
+
+def test_search_matches_the_last_word_as_a_prefix() -> None:
+    """The last word of a query matches the words it begins, the other words only whole."""
+    index = SearchIndex()
+    index.add(items(("Widget", ""), ("Widgets", ""), ("Wide widget", ""), ("Wider", "")))
+    assert index.search("wid", limit=10) == [1, 2, 3, 4]
+    assert index.search("widget", limit=10) == [1, 2, 3]
+    assert index.search("wid widget", limit=10) == []
+    assert index.search("widget wid", limit=10) == [1, 3]
+    assert index.search("wide wid", limit=10) == [3]
+
+
+def test_index_is_maintained_incrementally() -> None:
+    """Items are indexed once, and a vocabulary split over several blocks is searched in order."""
+    index = SearchIndex()
+    words = [f"word{i:04}" for i in range(3000)]
+    index.add(items(*((word, "") for word in reversed(words))))
+    index.add(items(("word0001 again", "")))
+    assert len(index) == len(words)
+    assert index.last_id == len(words)
+    assert index.search("word000", limit=20) == list(range(2991, 3001))
+    assert index.search("word2999", limit=1) == [1]
+
+
+def test_common_words_are_ranked_as_rare_ones(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Finding the best matches first gives the same results as ranking every match."""
+    rng = random.Random(0)
+    words = ["red", "green", "blue", "widget", "gadget", "large", "small"]
+    index = SearchIndex()
+    texts = [
+        (" ".join(rng.choices(words, k=2)), " ".join(rng.choices(words, k=4))) for _ in range(3000)
+    ]
+    index.add(items(*texts))
+    queries = ["red", "blue widget", "large gadget gr", "small red blue w", "widget widget"]
+    limit = 50
+    monkeypatch.setattr(search, "_RANK_ALL_SIZE", len(index))
+    expected = [index.search(query, limit) for query in queries]
+    monkeypatch.setattr(search, "_RANK_ALL_SIZE", 0)
+    assert [index.search(query, limit) for query in queries] == expected
+    assert all(len(ids) == limit for ids in expected)
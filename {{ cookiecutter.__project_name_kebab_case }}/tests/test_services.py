@@ -0,0 +1,327 @@
+"""Tests for the service layer."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.models import Item, ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.services import (
+    AsyncItemService,
+    IdempotencyCache,
+    IdempotencyKeyConflictError,
+    ItemService,
+    WriteBatcher,
+)
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache, store_tag
+from {{ cookiecutter.__project_name_snake_case }}.storage import MemoryItemStore
+
+
+def make_service(n: int) -> ItemService:
+    """Return a service holding `n` items with ids 1 to `n`."""
+    service = ItemService()
+    for i in range(1, n + 1):
+        service.create(ItemCreate(name=f"Item {i}", price=float(i)))
+    return service
+
+
+def test_create_many_allocates_a_block_of_ids() -> None:
+    """Batch creates get contiguous ids and are indexed like single creates."""
+    service = make_service(1)
+    items = service.create_many([
+        ItemCreate(name="A", price=1.0),
+        ItemCreate(name="B", price=2.0),
+    ])
+    assert [item.id for item in items] == [2, 3]
+    assert service.create(ItemCreate(name="C", price=3.0)).id == items[-1].id + 1
+    assert [item.id for item in service.iter_items(name="B")] == [3]
+
+
+def test_list_page_uses_cursor() -> None:
+    """A page starts after the cursor and holds at most `limit` items."""
+    service = make_service(5)
+    assert [item.id for item in service.list_page(after=2, limit=2)] == [3, 4]
+    assert [item.id for item in service.list_page(after=4, limit=2)] == [5]
+    assert service.list_page(after=5, limit=2) == []
+
+
+def test_iter_items_sees_items_created_while_iterating() -> None:
+    """Iterating does not copy the store and survives concurrent creates."""
+    service = make_service(2)
+    items = service.iter_items()
+    assert next(items).id == 1
+    service.create(ItemCreate(name="Late", price=1.0))
+    assert [item.id for item in items] == [2, 3]
+
+
+def test_filter_by_name_uses_hash_index() -> None:
+    """Items can be looked up by exact name."""
+    service = make_service(3)
+    duplicate = service.create(ItemCreate(name="Item 2", price=9.0))
+    assert [item.id for item in service.iter_items(name="Item 2")] == [2, duplicate.id]
+    assert list(service.iter_items(name="Missing")) == []
+
+
+def test_filter_by_price_range_uses_sorted_index() -> None:
+    """Items can be looked up by an inclusive price range, and combined with other filters."""
+    service = make_service(10)
+    assert [item.id for item in service.iter_items(min_price=3, max_price=5)] == [3, 4, 5]
+    assert [item.id for item in service.iter_items(after=4, min_price=3)] == list(range(5, 11))
+    assert [item.id for item in service.iter_items(name="Item 4", max_price=4)] == [4]
+    assert service.list_page(name="Item 4", min_price=5) == []
+
+
+def test_search_catches_up_with_new_items() -> None:
+    """Searches see the items written since the previous search, even by another service."""
+    store = MemoryItemStore()
+    service, other = ItemService(store), ItemService(store)
+    service.create(ItemCreate(name="Blue widget", price=1.0))
+    assert [item.name for item in service.search("widget", limit=10)] == ["Blue widget"]
+    other.create(ItemCreate(name="Red widget", price=1.0))
+    assert [item.name for item in service.search("widget", limit=10)] == [
+        "Blue widget",
+        "Red widget",
+    ]
+    assert service.search("red", limit=10) == [store.get(2)]
+
+
+def test_item_json_is_cached_and_bounded() -> None:
+    """Serialized items are cached up to the configured size, oldest entries evicted first."""
+    service = ItemService(json_cache_size=2)
+    first, second, third = service.create_many([
+        ItemCreate(name=f"Item {i}", price=float(i)) for i in range(1, 4)
+    ])
+    content = service.item_json(first)
+    assert content == first.model_dump_json().encode()
+    assert service.item_json(first) is content
+    service.item_json(second)
+    service.item_json(third)
+    assert service.item_json(first) is not content
+    expected = f"[{content.decode()},{second.model_dump_json()}]".encode()
+    assert service.items_json([first, second]) == expected
+
+
+def test_shared_cache_serves_the_reads_of_other_workers(tmp_path: Path) -> None:
+    """An item read by a worker is a hit in the others, until a worker writes it."""
+    store = MemoryItemStore()
+    workers = [
+        ItemService(store, shared_cache=SharedItemCache(tmp_path / "items.cache", slots=16))
+        for _ in range(2)
+    ]
+    item = workers[0].create(ItemCreate(name="Shared", price=1.0))
+    assert workers[1].cached_json(item.id) is None
+    found = workers[0].get_json(item.id)
+    assert found == (store.item_version(item.id), workers[0].item_json(item))
+    assert workers[1].cached_json(item.id) == found
+    assert workers[1].get_json(404) is None
+    # A worker reading an item while another one writes it does not cache what it read.
+    cache, tag = workers[0].shared_cache, store_tag(store.epoch())
+    assert cache is not None
+    ticket = cache.ticket(tag, item.id + 1)
+    written = workers[1].create(ItemCreate(name="Written", price=1.0))
+    assert not cache.put(tag, written.id, 1, b"{}", ticket)
+
+
+def test_create_once_creates_one_item_per_key() -> None:
+    """A retried create returns the first item, and a key reused for another item is refused."""
+    service = make_service(0)
+    data = ItemCreate(name="Widget", price=1.0)
+    item, replayed = service.create_once(data, "key-1")
+    assert not replayed
+    assert service.create_once(ItemCreate(name="Widget", price=1.0), "key-1") == (item, True)
+    assert service.create_once(data, "key-2")[0].id == item.id + 1
+    with pytest.raises(IdempotencyKeyConflictError):
+        service.create_once(ItemCreate(name="Gadget", price=1.0), "key-1")
+    assert len(service.list_all()) == 2  # noqa: PLR2004
+
+
+def test_idempotency_cache_is_bounded_and_expires() -> None:
+    """The least recently used keys are evicted, and keys expire after the TTL."""
+    first, second = make_service(2).list_all()
+    cache = IdempotencyCache(maxsize=2, ttl=60)
+    for key in ("a", "b", "c"):
+        cache.run(key, None, lambda: first)
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.run("a", None, lambda: second) == (second, False)
+    expiring = IdempotencyCache(ttl=0)
+    expiring.run("a", None, lambda: first)
+    time.sleep(0.001)
+    assert expiring.run("a", None, lambda: second) == (second, False)
+
+
+def test_idempotency_cache_forgets_failures() -> None:
+    """A failed operation is not cached, so that a retry runs it again."""
+    cache = IdempotencyCache()
+    item = make_service(1).list_all()[0]
+
+    def failing() -> Item:
+        msg = "database is locked"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        cache.run("a", None, failing)
+    assert cache.run("a", None, lambda: item) == (item, False)
+
+
+def test_idempotency_cache_coalesces_concurrent_calls() -> None:
+    """Calls with a key whose operation is running wait for its result instead of running it."""
+    cache = IdempotencyCache()
+    item = make_service(1).list_all()[0]
+    started, release = threading.Event(), threading.Event()
+    calls = 0
+
+    def slow() -> Item:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(5)
+        return item
+
+    results: list[tuple[Item, bool]] = []
+    first = threading.Thread(target=lambda: results.append(cache.run("a", None, slow)))
+    first.start()
+    started.wait(5)
+    duplicates = [
+        threading.Thread(target=lambda: results.append(cache.run("a", None, slow)))
+        for _ in range(3)
+    ]
+    for thread in duplicates:
+        thread.start()
+    release.set()
+    for thread in [first, *duplicates]:
+        thread.join(5)
+    assert calls == 1
+    assert sorted(replayed for _, replayed in results) == [False, True, True, True]
+    assert all(result is item for result, _ in results)
+
+
+def test_idempotency_cache_coalesces_awaited_calls() -> None:
+    """Async calls with a running key await its result, which survives a cancelled first call."""
+    cache = IdempotencyCache()
+    item = make_service(1).list_all()[0]
+    calls = 0
+
+    async def slow() -> Item:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return item
+
+    async def scenario() -> None:
+        first = asyncio.create_task(cache.run_async("a", None, slow))
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(cache.run_async("a", None, slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await duplicate == (item, True)
+        assert await cache.run_async("a", None, slow) == (item, True)
+
+    asyncio.run(scenario())
+    assert calls == 1
+
+
+class ThreadRecordingStore(MemoryItemStore):
+    """An in-memory store posing as a blocking one, which records the threads writing to it."""
+
+    blocking = True
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        super().__init__()
+        self.threads: set[str] = set()
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, recording the current thread."""
+        self.threads.add(threading.current_thread().name)
+        return super().add(rows)
+
+
+def test_async_service_runs_blocking_calls_in_threads() -> None:
+    """Calls to a blocking store run in the thread pool, and calls to an in-memory one inline."""
+    blocking, in_memory = ThreadRecordingStore(), ThreadRecordingStore()
+    in_memory.blocking = False
+    services = [
+        AsyncItemService(ItemService(store), max_threads=2) for store in (blocking, in_memory)
+    ]
+
+    async def scenario(service: AsyncItemService) -> list[list[Item]]:
+        for i in range(10):
+            await service.create(ItemCreate(name=f"Item {i}", price=1.0))
+        await service.create_many([ItemCreate(name="Item 10", price=2.0)])
+        assert (await service.get(11), await service.item_version(11)) == (
+            service.service.get(11),
+            11,
+        )
+        assert [item.id for item in await service.list_page(after=8, min_price=1)] == [9, 10, 11]
+        return [chunk async for chunk in service.iter_chunks(after=1, limit=9, size=4)]
+
+    for service in services:
+        chunks = asyncio.run(scenario(service))
+        assert [[item.id for item in chunk] for chunk in chunks] == [
+            [2, 3, 4, 5],
+            [6, 7, 8, 9],
+            [10],
+        ]
+        service.close()
+    assert blocking.threads
+    assert all(name.startswith("item-storage") for name in blocking.threads)
+    assert in_memory.threads == {threading.main_thread().name}
+
+
+class BatchRecordingStore(MemoryItemStore):
+    """An in-memory store recording the number of items of each write."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        super().__init__()
+        self.batches: list[int] = []
+
+    def add(self, rows: Sequence[ItemCreate]) -> list[Item]:
+        """Store new items, recording their number."""
+        self.batches.append(len(rows))
+        return super().add(rows)
+
+
+def test_write_batcher_creates_concurrent_items_together() -> None:
+    """Creates within the window are written together in order, without the cancelled ones."""
+    store = BatchRecordingStore()
+    service = AsyncItemService(ItemService(store), batch_window=0.01, batch_size=4)
+
+    async def scenario() -> list[Item]:
+        creates = [
+            asyncio.create_task(service.create(ItemCreate(name=f"Item {i}", price=1.0)))
+            for i in range(6)
+        ]
+        await asyncio.sleep(0)
+        creates[5].cancel()
+        return await asyncio.gather(*creates[:5])
+
+    items = asyncio.run(scenario())
+    assert [(item.id, item.name) for item in items] == [(i + 1, f"Item {i}") for i in range(5)]
+    assert store.batches == [4, 1]
+    service.batcher.window = 0
+    asyncio.run(service.create(ItemCreate(name="Item 5", price=1.0)))
+    assert store.batches == [4, 1, 1]
+
+
+def test_write_batcher_fails_every_create_of_a_failed_batch() -> None:
+    """All the creates of a batch get the error of its write."""
+
+    async def write(data: Sequence[ItemCreate]) -> list[Item]:
+        await asyncio.sleep(0)
+        message = f"disk full, {len(data)} items lost"
+        raise OSError(message)
+
+    batcher = WriteBatcher(write, window=0.01, max_size=10)
+
+    async def scenario() -> list[Item | BaseException]:
+        creates = (batcher.create(ItemCreate(name="Item", price=1.0)) for _ in range(3))
+        return await asyncio.gather(*creates, return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert [str(error) for error in errors] == ["disk full, 3 items lost"] * 3
@@ -0,0 +1,53 @@
+"""Tests for the settings reload."""
+
+import pytest
+from pydantic import ValidationError
+
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings, SettingsChanges
+
+
+def test_reload_applies_changes_and_notifies_subscribers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A reload reads the environment again and reports the changed fields to subscribers."""
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    settings = Settings()
+    notified: list[SettingsChanges] = []
+    settings.subscribe(notified.append)
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    assert settings.reload() == {"log_level": ("INFO", "DEBUG")}
+    assert settings.log_level == "DEBUG"
+    assert notified == [{"log_level": ("INFO", "DEBUG")}]
+    assert settings.reload() == {}
+    settings.unsubscribe(notified.append)
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    settings.reload()
+    assert len(notified) == 1
+
+
+def test_invalid_settings_are_not_applied(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A reload with an invalid value raises and keeps every current value."""
+    monkeypatch.setenv("DEBUG", "false")
+    settings = Settings()
+    monkeypatch.setenv("DEBUG", "sometimes")
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    with pytest.raises(ValidationError):
+        settings.reload()
+    assert settings.debug is False
+    assert settings.log_level != "DEBUG"
+
+
+def test_failing_subscriber_does_not_stop_the_others(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every subscriber is notified, then the first error is raised."""
+    settings = Settings()
+    notified: list[SettingsChanges] = []
+
+    def failing(changes: SettingsChanges) -> None:  # noqa: ARG001
+        msg = "cannot apply"
+        raise RuntimeError(msg)
+
+    settings.subscribe(failing)
+    settings.subscribe(notified.append)
+    monkeypatch.setenv("APP_NAME", "renamed")
+    with pytest.raises(RuntimeError, match="cannot apply"):
+        settings.reload()
+    assert settings.app_name == "renamed"
+    assert len(notified) == 1
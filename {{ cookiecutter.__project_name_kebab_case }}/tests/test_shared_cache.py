@@ -0,0 +1,65 @@
+"""Tests for the cache of serialized items shared by the workers."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.shared_cache import SharedItemCache, store_tag
+
+
+TAG = store_tag("epoch")
+
+
+def put_in_child(path: Path, item_id: int, content: bytes) -> None:
+    """Cache an item from another process."""
+    cache = SharedItemCache(path, slots=16, slot_size=128)
+    cache.put(TAG, item_id, 1, content, cache.ticket(TAG, item_id))
+    cache.close()
+
+
+def test_items_are_shared_between_processes(tmp_path: Path) -> None:
+    """An item cached by a process is a hit in the others, until one of them invalidates it."""
+    path = tmp_path / "items.cache"
+    cache = SharedItemCache(path, slots=16, slot_size=128)
+    child = multiprocessing.get_context("fork").Process(
+        target=put_in_child, args=(path, 7, b'{"id":7}')
+    )
+    child.start()
+    child.join()
+    assert cache.get(TAG, 7) == (1, b'{"id":7}')
+    other = SharedItemCache(path, slots=16, slot_size=128)
+    other.invalidate(TAG, [7])
+    assert cache.get(TAG, 7) is None
+    other.close()
+    cache.close()
+
+
+def test_items_read_before_a_write_are_not_cached(tmp_path: Path) -> None:
+    """An item is not cached when its slot was invalidated since the ticket was taken."""
+    cache = SharedItemCache(tmp_path / "items.cache", slots=16, slot_size=128)
+    ticket = cache.ticket(TAG, 1)
+    cache.invalidate(TAG, [1])
+    assert not cache.put(TAG, 1, 1, b"stale", ticket)
+    assert cache.get(TAG, 1) is None
+    assert cache.put(TAG, 1, 2, b"fresh", cache.ticket(TAG, 1))
+    assert cache.get(TAG, 1) == (2, b"fresh")
+    cache.close()
+
+
+def test_slots_hold_one_item_of_bounded_size(tmp_path: Path) -> None:
+    """Other stores miss, colliding items replace each other, and large items are not cached."""
+    path = tmp_path / "items.cache"
+    cache = SharedItemCache(path, slots=16, slot_size=128)
+    cache.put(TAG, 1, 1, b"one", cache.ticket(TAG, 1))
+    assert cache.get(store_tag("other epoch"), 1) is None
+    cache.put(TAG, 17, 1, b"seventeen", cache.ticket(TAG, 17))
+    assert cache.get(TAG, 1) is None
+    assert cache.get(TAG, 17) == (1, b"seventeen")
+    assert not cache.put(TAG, 2, 1, b"x" * (cache.max_size + 1), cache.ticket(TAG, 2))
+    cache.close()
+    resized = SharedItemCache(path, slots=32, slot_size=128)
+    assert resized.get(TAG, 17) is None
+    resized.close()
+    with pytest.raises(ValueError, match="at least 1 slot"):
+        SharedItemCache(path, slots=16, slot_size=8)
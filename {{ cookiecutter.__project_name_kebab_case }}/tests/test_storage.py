@@ -0,0 +1,124 @@
+"""Tests for the storage backends."""
+
+import random
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.__project_name_snake_case }}.models import ItemCreate
+from {{ cookiecutter.__project_name_snake_case }}.settings import Settings
+from {{ cookiecutter.__project_name_snake_case }}.storage import (
+    ColumnarItemStore,
+    ItemStore,
+    MemoryItemStore,
+    SQLiteItemStore,
+    create_item_store,
+)
+
+
+@pytest.fixture(params=["memory", "columnar", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[ItemStore]:
+    """Provide an empty store of each backend.
+
+    Yields:
+        The store, closed after the test.
+    """
+    settings = Settings(storage_backend=request.param, sqlite_path=str(tmp_path / "items.db"))
+    store = create_item_store(settings)
+    yield store
+    store.close()
+
+
+def rows(*prices: float) -> list[ItemCreate]:
+    """Return one row per price, named after its position."""
+    return [ItemCreate(name=f"Item {i}", price=price) for i, price in enumerate(prices)]
+
+
+def test_add_and_get(store: ItemStore) -> None:
+    """Added items get contiguous ids and can be read back."""
+    first, second = store.add(rows(1.0, 2.0))
+    assert second.id == first.id + 1
+    assert store.get(first.id) == first
+    assert store.get(second.id + 1) is None
+
+
+def test_versions(store: ItemStore) -> None:
+    """Every write bumps the store version and stamps the written items with it."""
+    assert store.version() == 0
+    (first,) = store.add(rows(1.0))
+    second, third = store.add(rows(2.0, 3.0))
+    assert store.version() == 2  # noqa: PLR2004
+    assert store.item_version(first.id) == 1
+    assert store.item_version(second.id) == store.item_version(third.id) == 2  # noqa: PLR2004
+    assert store.item_version(third.id + 1) is None
+    assert store.add([]) == []
+    assert store.version() == 2  # noqa: PLR2004
+
+
+def test_epochs_tell_stores_apart(tmp_path: Path) -> None:
+    """Every in-memory store gets its own epoch, while SQLite stores share the database's."""
+    assert MemoryItemStore().epoch() != MemoryItemStore().epoch()
+    assert ColumnarItemStore().epoch() != ColumnarItemStore().epoch()
+    first, second = SQLiteItemStore(tmp_path / "items.db"), SQLiteItemStore(tmp_path / "items.db")
+    assert first.epoch() == second.epoch()
+    assert first.epoch() != SQLiteItemStore(tmp_path / "other.db").epoch()
+
+
+def test_scan_filters_and_cursor(store: ItemStore) -> None:
+    """Scans honor the cursor and the name and price filters."""
+    items = store.add(rows(5.0, 1.0, 3.0, 4.0))
+    ids = [item.id for item in items]
+    assert [item.id for item in store.scan()] == ids
+    assert [item.id for item in store.scan(ids[1])] == ids[2:]
+    assert [item.id for item in store.scan(min_price=3.0, max_price=4.0)] == ids[2:]
+    assert [item.id for item in store.scan(name="Item 1", max_price=1.0)] == [ids[1]]
+    assert list(store.scan(name="Item 1", min_price=2.0)) == []
+
+
+def test_scan_spans_several_chunks(tmp_path: Path) -> None:
+    """SQLite scans page through the table in chunks without skipping rows."""
+    store = SQLiteItemStore(tmp_path / "items.db")
+    store.add(rows(*[1.0] * (SQLiteItemStore.SCAN_CHUNK_SIZE * 2 + 1)))
+    assert len(list(store.scan())) == SQLiteItemStore.SCAN_CHUNK_SIZE * 2 + 1
+    store.close()
+
+
+def test_scan_price_ranges_in_random_order() -> None:
+    """Price filters stay exact when the price index spans many blocks filled in random order."""
+    store = MemoryItemStore()
+    prices = [float(random.randrange(1, 1_000)) for _ in range(5_000)]
+    store.add(rows(*prices))
+    for low, high in [(1.0, 1.0), (10.0, 20.0), (500.0, 999.0), (1.0, 999.0)]:
+        expected = [i + 1 for i, price in enumerate(prices) if low <= price <= high]
+        for after in (0, 2_500):
+            matches = store.scan(after, min_price=low, max_price=high)
+            assert [item.id for item in matches] == [i for i in expected if i > after]
+
+
+def test_sqlite_is_shared_and_durable(tmp_path: Path) -> None:
+    """Items written through one SQLite store are seen by another one and survive a reopen."""
+    path = tmp_path / "items.db"
+    writer, reader = SQLiteItemStore(path), SQLiteItemStore(path)
+    (item,) = writer.add(rows(1.0))
+    assert reader.get(item.id) == item
+    (other,) = reader.add(rows(2.0))
+    assert other.id == item.id + 1
+    writer.close()
+    reader.close()
+    assert SQLiteItemStore(path).get(other.id) == other
+
+
+def test_columnar_interns_strings() -> None:
+    """The columnar store keeps a single copy of repeated names and descriptions."""
+    store = ColumnarItemStore()
+    names = [f"Shared {suffix}" for suffix in ("name", "name")]
+    assert names[0] is not names[1]
+    first, second = store.add([ItemCreate(name=name, price=1.0) for name in names])
+    assert first.name is second.name
+    assert store.get(0) is None
+
+
+def test_default_backend_is_memory() -> None:
+    """The in-memory backend is used unless another one is configured."""
+    assert isinstance(create_item_store(Settings()), MemoryItemStore)